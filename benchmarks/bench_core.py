@@ -0,0 +1,231 @@
+"""
+Microbenchmarks for blockchain/core
+
+Times the core RootChain and Block operations on chains holding 1e3 to
+1e6 transactions, writes the results as JSON and compares them with a
+stored baseline. A benchmark is flagged when its median per-operation
+time is slower than the baseline by more than --tolerance. Baselines are
+machine specific; refresh the stored one with --update-baseline when the
+benchmark machine changes or the core engine is optimized. Each report
+records the commit it was measured at.
+
+Usage:
+    python benchmarks/bench_core.py [--sizes 1000,10000,100000,1000000]
+        [--output benchmarks/results/core.json] [--fail-on-regression]
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT_DIR)
+
+from blockchain.core.block import Block
+from blockchain.core.blockchain import RootChain
+from blockchain.synthetic import generate_chain, synthetic_addresses
+
+BENCH_DIR = os.path.join(ROOT_DIR, "benchmarks")
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, "baselines", "core.json")
+DEFAULT_OUTPUT = os.path.join(BENCH_DIR, "results", "core.json")
+TXS_PER_BLOCK = 1000
+
+def git_commit() -> Optional[str]:
+    """Commit the tree was at, or None outside a git checkout."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=ROOT_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def measure(
+    op: Callable[[], Any],
+    number: int = 1,
+    setup: Optional[Callable[[], Any]] = None,
+    min_time: float = 0.2,
+    min_samples: int = 3,
+    max_samples: int = 50
+) -> Dict[str, float]:
+    """Time op (which performs number operations) until min_time has passed."""
+    samples: List[float] = []
+    total = 0.0
+    while len(samples) < min_samples or (total < min_time and len(samples) < max_samples):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        op()
+        elapsed = time.perf_counter() - start
+        samples.append(elapsed / number)
+        total += elapsed
+    return {
+        "samples": len(samples),
+        "median_s": statistics.median(samples),
+        "mean_s": statistics.fmean(samples),
+        "min_s": min(samples)
+    }
+
+def build_chain(transactions: int, addresses: int, seed: int) -> RootChain:
+    """Testnet chain of transactions spread over full blocks."""
+    chain = generate_chain(
+        "testnet",
+        blocks=-(-transactions // TXS_PER_BLOCK),
+        transactions=transactions,
+        addresses=addresses,
+        seed=seed
+    )
+    chain.difficulty = 1  # mine_block is timed separately per difficulty
+    return chain
+
+def bench_mining(difficulties: List[int], min_time: float) -> List[Dict[str, Any]]:
+    results = []
+    transactions = [{"sender": "trtc_a", "recipient": "trtc_b", "amount": 1.0, "network": "testnet"}] * 10
+    for difficulty in difficulties:
+        blocks = iter(range(1_000_000))
+
+        def mine():
+            Block(next(blocks), transactions, time.time(), "0" * 64).mine_block(difficulty)
+
+        results.append({
+            "benchmark": "mine_block",
+            "params": {"difficulty": difficulty},
+            # Mining time is geometric in the nonce, so take more samples
+            **measure(mine, min_time=min_time, min_samples=10)
+        })
+    return results
+
+def bench_chain(size: int, seed: int, min_time: float) -> List[Dict[str, Any]]:
+    addresses = max(size // 10, 10)
+    chain = build_chain(size, addresses, seed)
+    rng = random.Random(seed + 1)
+    population = synthetic_addresses(chain.prefix, addresses)
+    names = [rng.choice(population) for _ in range(1000)]
+    hashes = [rng.choice(chain.chain).hash for _ in range(100)]
+    latest = chain.get_latest_block()
+
+    def pending_block():
+        chain.pending_transactions = [
+            {"sender": "trtc_treasury", "recipient": name, "amount": 1.0,
+             "timestamp": time.time(), "type": "transfer", "network": "testnet"}
+            for name in names[:TXS_PER_BLOCK - 1]
+        ]
+
+    def add_transactions():
+        for name in names:
+            chain.add_transaction("trtc_treasury", name, 1.0)
+
+    # Read-only benchmarks first; the last two grow the chain slightly
+    cases = [
+        ("calculate_hash", lambda: [latest.calculate_hash() for _ in range(10)], 10, None),
+        ("get_balance", lambda: [chain.get_balance(name) for name in names], len(names), None),
+        ("get_transactions_by_address", lambda: chain.get_transactions_by_address(names[0]), 1, None),
+        ("get_block_by_hash", lambda: [chain.get_block_by_hash(h) for h in hashes], len(hashes), None),
+        ("is_chain_valid", chain.is_chain_valid, 1, None),
+        ("add_transaction", add_transactions, len(names), lambda: chain.pending_transactions.clear()),
+        ("mine_pending_transactions", lambda: chain.mine_pending_transactions(names[0]), 1, pending_block)
+    ]
+    results = []
+    for name, op, number, setup in cases:
+        results.append({
+            "benchmark": name,
+            "params": {"transactions": size},
+            **measure(op, number, setup, min_time=min_time)
+        })
+    chain.pending_transactions = []
+    return results
+
+def result_key(result: Dict[str, Any]) -> str:
+    params = ",".join(f"{k}={v}" for k, v in sorted(result["params"].items()))
+    return f"{result['benchmark']}[{params}]"
+
+def compare(
+    results: List[Dict[str, Any]],
+    baseline: List[Dict[str, Any]],
+    tolerance: float
+) -> List[str]:
+    """Print each result against the baseline and return the regressed keys."""
+    previous = {result_key(result): result for result in baseline}
+    regressions = []
+    print(f"{'benchmark':<56}{'median':>12}{'baseline':>12}{'change':>9}")
+    for result in results:
+        key = result_key(result)
+        median = result["median_s"]
+        line = f"{key:<56}{format_time(median):>12}"
+        if key in previous:
+            base = previous[key]["median_s"]
+            change = median / base - 1
+            flag = "  REGRESSED" if change > tolerance else ""
+            line += f"{format_time(base):>12}{change:>+9.1%}{flag}"
+            if flag:
+                regressions.append(key)
+        print(line)
+    return regressions
+
+def format_time(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f}{unit}"
+    return f"{seconds / 1e-9:.0f}ns"
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="1000,10000,100000,1000000",
+                        help="Comma-separated chain sizes in transactions")
+    parser.add_argument("--difficulties", default="1,2,3,4")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--min-time", type=float, default=0.2,
+                        help="Minimum seconds spent timing each benchmark")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed slowdown against the baseline, as a fraction")
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    args = parser.parse_args()
+
+    results = bench_mining([int(d) for d in args.difficulties.split(",")], args.min_time)
+    for size in (int(s) for s in args.sizes.split(",")):
+        results.extend(bench_chain(size, args.seed, args.min_time))
+
+    report = {
+        "meta": {
+            "created": time.time(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "commit": git_commit(),
+            "seed": args.seed
+        },
+        "results": results
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    baseline = []
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+    regressions = compare(results, baseline, args.tolerance)
+    print(f"\nResults written to {args.output}")
+
+    if args.update_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline updated: {args.baseline}")
+    elif regressions:
+        print(f"{len(regressions)} benchmark(s) slower than baseline by more than {args.tolerance:.0%}")
+        if args.fail_on_regression:
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+"""
+Measure caller-side logging overhead in the wallet backend
+
+Compares the previous synchronous FileHandler + StreamHandler setup with
+the queue pipeline from wallet-backend/logger.py. Only time spent in the
+calling thread is counted, since that is what adds to request latency.
+--stall simulates a slow disk by sleeping in every file write.
+
+Usage:
+    python benchmarks/bench_logging.py [--calls 20000] [--stall 0.0005]
+"""
+
+import argparse
+import logging
+import logging.handlers
+import os
+import sys
+import tempfile
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(ROOT_DIR, "wallet-backend"))
+
+import logger as wallet_logger
+
+class StallingFileHandler(logging.handlers.RotatingFileHandler):
+    stall = 0.0
+
+    def emit(self, record):
+        if self.stall:
+            time.sleep(self.stall)
+        super().emit(record)
+
+def run(log, calls: int) -> float:
+    start = time.perf_counter()
+    for i in range(calls):
+        # Roughly what one wallet request logs
+        log.info("Transfer successful: %s tokens from %s to %s", i, "rtc_sender", "rtc_recipient")
+    return (time.perf_counter() - start) / calls * 1e6
+
+def reset_root() -> logging.Logger:
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+        handler.close()
+    return root
+
+def main(calls: int, stall: float) -> None:
+    sys.stderr = open(os.devnull, "w")
+    StallingFileHandler.stall = stall
+    wallet_logger.RotatingFileHandler = StallingFileHandler
+    log = logging.getLogger("bench")
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        root = reset_root()
+        root.setLevel(logging.INFO)
+        sync_file = StallingFileHandler(os.path.join(tmp, "sync.log"))
+        for handler in (sync_file, logging.StreamHandler()):
+            handler.setFormatter(logging.Formatter(wallet_logger.LOG_FORMAT))
+            root.addHandler(handler)
+        results.append(("sync FileHandler", run(log, calls)))
+
+        for rate in (1.0, 0.1):
+            reset_root()
+            wallet_logger.setup_logging(
+                log_file=os.path.join(tmp, f"queue_{rate}.log"),
+                info_sample_rate=rate
+            )
+            results.append((f"queue (sample {rate})", run(log, calls)))
+            wallet_logger.stop_logging()
+
+    print(f"{'pipeline':<22}{'us/call (caller)':>18}")
+    for name, per_call in results:
+        print(f"{name:<22}{per_call:>18.2f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=20000)
+    parser.add_argument("--stall", type=float, default=0.0)
+    args = parser.parse_args()
+    main(args.calls, args.stall)
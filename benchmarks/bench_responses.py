@@ -0,0 +1,101 @@
+"""
+Compare FastAPI's default dict responses with common.responses
+
+Each payload is served by two routes on one app: one returns the dict
+(jsonable_encoder + json.dumps) and one returns FastJSONResponse or a
+pre-serialized RawJSONResponse. Requests go through the full ASGI stack in-process,
+so the numbers exclude network and server overhead.
+
+Usage:
+    python benchmarks/bench_responses.py [--requests 2000]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from fastapi import FastAPI
+
+from blockchain.core.blockchain import RootChain
+from blockchain.wallet.symbols import ROOT
+from common.responses import FastJSONResponse, RawJSONResponse, json_dumps
+
+def build_app() -> FastAPI:
+    chain = RootChain(network="testnet")
+    chain.difficulty = 1
+    for i in range(20):
+        for j in range(50):
+            chain.add_transaction("trtc_treasury", f"trtc_bench_{i}_{j}", 1.0)
+        chain.mine_pending_transactions("trtc_miner")
+    blocks = [block.to_dict() for block in chain.chain[-10:]]
+    block = chain.chain[-1]
+    symbol_payload = ROOT.to_dict()
+    # Serialized once up front, as the explorer does when a block is added
+    block_body = json_dumps(block.to_dict())
+
+    def wallet(symbol):
+        return {
+            "address": "rtc_1234567890abcdefghijklmnopqrstuv",
+            "private_key": "0x" + "ab" * 32,
+            "mnemonic": " ".join(["abandon"] * 24),
+            "network": "mainnet",
+            "symbol": symbol,
+            "balance": 0.0
+        }
+
+    app = FastAPI()
+
+    @app.get("/before/wallet")
+    async def before_wallet():
+        return wallet(ROOT)
+
+    @app.get("/after/wallet")
+    async def after_wallet():
+        return FastJSONResponse(wallet(symbol_payload))
+
+    @app.get("/before/blocks")
+    async def before_blocks():
+        return blocks
+
+    @app.get("/after/blocks")
+    async def after_blocks():
+        return FastJSONResponse(blocks)
+
+    @app.get("/before/block")
+    async def before_block():
+        return block.to_dict()
+
+    @app.get("/after/block")
+    async def after_block():
+        return RawJSONResponse(block_body)
+
+    return app
+
+async def measure(client: httpx.AsyncClient, path: str, requests: int) -> float:
+    for _ in range(50):  # warm up
+        await client.get(path)
+    start = time.perf_counter()
+    for _ in range(requests):
+        await client.get(path)
+    return requests / (time.perf_counter() - start)
+
+async def main(requests: int) -> None:
+    app = build_app()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        print(f"{'payload':<10}{'before req/s':>14}{'after req/s':>14}{'speedup':>10}")
+        for name in ("wallet", "blocks", "block"):
+            before = await measure(client, f"/before/{name}", requests)
+            after = await measure(client, f"/after/{name}", requests)
+            print(f"{name:<10}{before:>14.0f}{after:>14.0f}{after / before:>9.2f}x")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests))
@@ -0,0 +1,84 @@
+"""
+Import-time profile of a service
+
+Runs `python -X importtime -c "import app"` from the service directory
+and prints the slowest top-level packages by cumulative import time,
+followed by the wall time to import the app and to run its startup
+(lifespan) hooks up to the point where it would accept requests.
+
+Usage:
+    python benchmarks/profile_startup.py [--service wallet-backend] [--top 15]
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+import tempfile
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+TIMING = """
+import asyncio, time
+started = time.perf_counter()
+import app
+imported = time.perf_counter()
+
+async def run_lifespan():
+    async with app.app.router.lifespan_context(app.app):
+        return time.perf_counter()
+
+ready = asyncio.run(run_lifespan())
+print(f"{imported - started:.3f} {ready - imported:.3f}")
+"""
+
+def run(service_dir: str, args: List[str], env: Dict[str, str]) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *args], cwd=service_dir, env=env,
+        capture_output=True, text=True, check=True
+    )
+
+def top_level_imports(stderr: str) -> List[Tuple[str, int]]:
+    """Cumulative microseconds per top-level package imported directly or indirectly."""
+    totals: Dict[str, int] = defaultdict(int)
+    for line in stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        # Depth 1 entries are the modules `import app` pulled in; app itself has depth 0
+        if match and len(match.group(3)) == 3:
+            totals[match.group(4).split(".")[0]] += int(match.group(2))
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--service", default="wallet-backend")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    service_dir = os.path.join(ROOT_DIR, args.service)
+    with tempfile.TemporaryDirectory() as workdir:
+        env = dict(
+            os.environ,
+            LOG_FILE=os.path.join(workdir, "service.log"),
+            WEBHOOK_QUEUE_PATH=os.path.join(workdir, "webhook_queue.db")
+        )
+        profile = run(service_dir, ["-X", "importtime", "-c", "import app"], env)
+        print(f"{'package':<32}{'cumulative ms':>14}")
+        for package, micros in top_level_imports(profile.stderr)[:args.top]:
+            print(f"{package:<32}{micros / 1000:>14.1f}")
+
+        timings = []
+        for _ in range(args.runs):
+            imported, started = run(service_dir, ["-c", TIMING], env).stdout.split()[-2:]
+            timings.append((float(imported), float(started)))
+    timings.sort()
+    imported, started = timings[len(timings) // 2]
+    print(f"\nimport app: {imported * 1000:.0f}ms, lifespan startup: {started * 1000:.0f}ms "
+          f"(median of {args.runs})")
+
+if __name__ == "__main__":
+    main()
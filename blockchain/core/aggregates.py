@@ -0,0 +1,108 @@
+import hashlib
+import math
+import time
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+from typing import Dict, Optional, Sequence, Tuple
+
+from .block import Block
+
+class HyperLogLog:
+    """
+    Approximate distinct counter in a fixed 2**precision bytes
+
+    The standard error is about 1.04 / sqrt(2**precision), so 3% at the
+    default precision. Counters with the same precision merge losslessly.
+    """
+
+    def __init__(self, precision: int = 10):
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+
+    def add(self, item: str) -> None:
+        x = int.from_bytes(hashlib.blake2b(item.encode(), digest_size=8).digest(), "big")
+        bits = 64 - self.precision
+        index = x >> bits
+        rank = bits - (x & ((1 << bits) - 1)).bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other: "HyperLogLog") -> None:
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+    def count(self) -> int:
+        m = len(self.registers)
+        estimate = 0.7213 / (1 + 1.079 / m) * m * m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            # Linear counting is more accurate for small cardinalities
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+class ChainAggregates:
+    """
+    Running totals over a chain, updated as each block is appended
+
+    Cumulative transaction counts per block make windowed transaction
+    counts two binary searches. Distinct addresses per window come from
+    HyperLogLog counters kept per bucket_seconds of block time, for the
+    last retention_seconds, so memory does not grow with the chain.
+    """
+
+    def __init__(self, bucket_seconds: int = 900, retention_seconds: int = 86_400, precision: int = 10):
+        self.bucket_seconds = bucket_seconds
+        self.retention_buckets = retention_seconds // bucket_seconds + 1
+        self.precision = precision
+        # Transactions in blocks 0..i, parallel to the chain
+        self.cumulative_transactions = array("q")
+        self.address_buckets: "OrderedDict[int, HyperLogLog]" = OrderedDict()
+        self._distinct_cache: Dict[Tuple[int, int], int] = {}
+
+    @property
+    def total_transactions(self) -> int:
+        return self.cumulative_transactions[-1] if self.cumulative_transactions else 0
+
+    def record(self, block: Block, timestamp: float) -> None:
+        self.cumulative_transactions.append(self.total_transactions + len(block.transactions))
+        bucket = int(timestamp // self.bucket_seconds)
+        counter = self.address_buckets.get(bucket)
+        if counter is None:
+            counter = self.address_buckets[bucket] = HyperLogLog(self.precision)
+            while next(iter(self.address_buckets)) <= bucket - self.retention_buckets:
+                self.address_buckets.popitem(last=False)
+        for tx in block.transactions:
+            if tx["sender"] != "0x0":
+                counter.add(tx["sender"])
+            counter.add(tx["recipient"])
+        self._distinct_cache.clear()
+
+    def activity(self, timestamps: Sequence[float], seconds: int, now: Optional[float] = None) -> Dict[str, int]:
+        """
+        Transactions and approximate distinct addresses in blocks from the last seconds
+
+        Args:
+            timestamps (Sequence[float]): The chain's sorted block timestamps
+            seconds (int): Window length, at most the retention period
+            now (float): End of the window, defaults to the current time
+        """
+        start = (time.time() if now is None else now) - seconds
+        first = bisect_left(timestamps, start)
+        before = self.cumulative_transactions[first - 1] if first else 0
+        return {
+            "transactions": self.total_transactions - before,
+            "active_addresses": self.distinct_addresses_since(start)
+        }
+
+    def distinct_addresses_since(self, start: float) -> int:
+        """Distinct addresses in buckets overlapping [start, now), to bucket granularity."""
+        first_bucket = int(start // self.bucket_seconds)
+        key = (len(self.cumulative_transactions), first_bucket)
+        cached = self._distinct_cache.get(key)
+        if cached is None:
+            merged = HyperLogLog(self.precision)
+            for bucket, counter in self.address_buckets.items():
+                if bucket >= first_bucket:
+                    merged.merge(counter)
+            cached = self._distinct_cache[key] = merged.count()
+        return cached
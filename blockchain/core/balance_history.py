@@ -0,0 +1,67 @@
+from array import array
+from bisect import bisect_right
+from typing import Dict, Iterable, List, Tuple
+
+class BalanceHistory:
+    """
+    Running balance checkpoints per address
+
+    After each block, every address the block touched gets one checkpoint
+    of (height, balance), stored in two typed arrays per address (16 bytes
+    a checkpoint). The balance at any height is then a binary search over
+    that address's checkpoints instead of a replay of its transactions.
+    """
+
+    def __init__(self):
+        self.heights: Dict[str, array] = {}
+        self.balances: Dict[str, array] = {}
+
+    def record(self, height: int, balances: Dict[str, float], addresses: Iterable[str]) -> None:
+        for address in addresses:
+            heights = self.heights.get(address)
+            if heights is None:
+                heights = self.heights[address] = array("q")
+                self.balances[address] = array("d")
+            heights.append(height)
+            self.balances[address].append(balances.get(address, 0.0))
+
+    def balance_at(self, address: str, height: int) -> float:
+        """Balance once the block at height was applied; 0.0 before the address's first block."""
+        heights = self.heights.get(address)
+        if heights is None:
+            return 0.0
+        i = bisect_right(heights, height) - 1
+        return self.balances[address][i] if i >= 0 else 0.0
+
+    def checkpoints(self, address: str) -> List[Tuple[int, float]]:
+        heights = self.heights.get(address)
+        if heights is None:
+            return []
+        return list(zip(heights, self.balances[address]))
+
+    def timeline(self, address: str, points: int, end_height: int) -> List[Tuple[int, float]]:
+        """
+        Downsampled (height, balance) series for charts
+
+        Args:
+            address (str): Address to chart
+            points (int): Most points to return, at least 2 so both ends are
+                included; every checkpoint is returned if they fit
+            end_height (int): Height the series ends at, normally the chain tip
+        """
+        if points < 2:
+            raise ValueError("A timeline needs at least 2 points")
+        heights = self.heights.get(address)
+        if heights is None:
+            return []
+        if len(heights) <= points:
+            series = self.checkpoints(address)
+            if series[-1][0] < end_height:
+                series.append((end_height, series[-1][1]))
+            if len(series) <= points:
+                return series
+        # Sample the step function at evenly spaced heights from the first checkpoint to the end
+        first = heights[0]
+        span = max(end_height - first, 0)
+        samples = sorted({first + span * k // (points - 1) for k in range(points)})
+        return [(height, self.balance_at(address, height)) for height in samples]
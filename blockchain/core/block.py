@@ -2,6 +2,8 @@ import hashlib
 import time
 from typing import List, Dict, Any
 
+from .tracing import tracer
+
 class Block:
     def __init__(self, index: int, transactions: List[Dict[str, Any]], timestamp: float, previous_hash: str, nonce: int = 0):
         self.index = index
@@ -26,9 +28,12 @@ class Block:
 
     def mine_block(self, difficulty: int) -> None:
         target = "0" * difficulty
-        while self.hash[:difficulty] != target:
-            self.nonce += 1
-            self.hash = self.calculate_hash()
+        first_nonce = self.nonce
+        with tracer.span("block.mine"):
+            while self.hash[:difficulty] != target:
+                self.nonce += 1
+                self.hash = self.calculate_hash()
+        tracer.count("block.hashes", self.nonce - first_nonce + 1)
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -1,6 +1,11 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Callable, Optional, Iterable, Iterator, Tuple
+from array import array
+from bisect import bisect_left
 import time
 from .block import Block
+from .balance_history import BalanceHistory
+from .aggregates import ChainAggregates
+from .tracing import tracer
 
 class RootChain:
     def __init__(self, network: str = "mainnet"):
@@ -11,6 +16,8 @@ class RootChain:
             network (str): Either "mainnet" or "testnet"
         """
         self.chain: List[Block] = []
+        # Block timestamps, parallel to chain, for time range lookups
+        self.block_timestamps = array("d")
         self.pending_transactions: List[Dict[str, Any]] = []
         self.network = network.lower()
         
@@ -31,27 +38,82 @@ class RootChain:
             self.prefix = "trtc"
             
         self.balances: Dict[str, float] = {}
+        # Balance of each address after every block that touched it
+        self.balance_history = BalanceHistory()
+        # Running transaction totals and recent activity
+        self.aggregates = ChainAggregates()
+        # Hashes per second achieved while mining the latest block
+        self.mining_hashrate: float = 0.0
+        # Called with each block once it is appended and settled
+        self.block_listeners: List[Callable[[Block], None]] = []
         
         # Create genesis block
         self.create_genesis_block()
 
     def create_genesis_block(self) -> None:
-        treasury_address = f"{self.prefix}_treasury"
+        self.append_block(self.genesis_block())
+
+    def genesis_block(self, timestamp: Optional[float] = None) -> Block:
+        """Build this network's genesis block, minting the supply to the treasury."""
+        timestamp = time.time() if timestamp is None else timestamp
         genesis_transaction = {
             "sender": "0x0",
-            "recipient": treasury_address,
+            "recipient": f"{self.prefix}_treasury",
             "amount": self.total_supply,
-            "timestamp": time.time(),
+            "timestamp": timestamp,
             "type": "genesis",
             "network": self.network
         }
-        genesis_block = Block(0, [genesis_transaction], time.time(), "0")
-        self.chain.append(genesis_block)
-        self.balances[treasury_address] = self.total_supply
+        return Block(0, [genesis_transaction], timestamp, "0")
+
+    @tracer.traced("chain.append_block")
+    def append_block(self, block: Block) -> None:
+        """
+        Append a mined block and apply its transactions to balances
+        
+        Args:
+            block (Block): Block extending the current tip
+        """
+        self.chain.append(block)
+        # Clamped so the array stays sorted even if a miner's clock stepped back
+        latest = self.block_timestamps[-1] if self.block_timestamps else block.timestamp
+        self.block_timestamps.append(max(block.timestamp, latest))
+        self.aggregates.record(block, self.block_timestamps[-1])
+        with tracer.span("chain.settle_balances"):
+            touched = set()
+            for tx in block.transactions:
+                if tx["sender"] != "0x0":
+                    self.balances[tx["sender"]] = self.get_balance(tx["sender"]) - tx["amount"]
+                    touched.add(tx["sender"])
+                self.balances[tx["recipient"]] = self.get_balance(tx["recipient"]) + tx["amount"]
+                touched.add(tx["recipient"])
+            self.balance_history.record(block.index, self.balances, touched)
+        tracer.count("chain.blocks_appended")
+        tracer.count("chain.transactions_settled", len(block.transactions))
+        with tracer.span("chain.block_listeners"):
+            for listener in self.block_listeners:
+                listener(block)
+
+    def load_blocks(self, blocks: Iterable[Block]) -> None:
+        """
+        Replace the chain with blocks, starting from a genesis block
+        
+        Args:
+            blocks (Iterable[Block]): Blocks in order, e.g. from an export
+        """
+        self.chain = []
+        self.block_timestamps = array("d")
+        self.balances = {}
+        self.balance_history = BalanceHistory()
+        self.aggregates = ChainAggregates()
+        self.pending_transactions = []
+        for block in blocks:
+            self.append_block(block)
 
     def get_latest_block(self) -> Block:
         return self.chain[-1]
 
+    @tracer.traced("chain.add_transaction", outcomes=("chain.transactions_accepted", "chain.transactions_rejected"))
     def add_transaction(self, sender: str, recipient: str, amount: float) -> bool:
         # Verify addresses match the current network
         if not (sender.startswith(self.prefix) or sender == "0x0") or not recipient.startswith(self.prefix):
@@ -72,6 +134,7 @@ class RootChain:
         self.pending_transactions.append(transaction)
         return True
 
+    @tracer.traced("chain.mine_pending_transactions")
     def mine_pending_transactions(self, miner_address: str) -> Block:
         # Add mining reward transaction
         self.add_transaction("0x0", miner_address, self.mining_reward)
@@ -83,14 +146,12 @@ class RootChain:
             self.get_latest_block().hash
         )
         
+        mining_started = time.perf_counter()
         block.mine_block(self.difficulty)
-        self.chain.append(block)
-        
-        # Process transactions
-        for tx in self.pending_transactions:
-            if tx["sender"] != "0x0":
-                self.balances[tx["sender"]] = self.get_balance(tx["sender"]) - tx["amount"]
-            self.balances[tx["recipient"]] = self.get_balance(tx["recipient"]) + tx["amount"]
+        mining_time = time.perf_counter() - mining_started
+        # Nonces start at 0, so nonce + 1 hashes were computed
+        self.mining_hashrate = (block.nonce + 1) / mining_time if mining_time > 0 else 0.0
+        self.append_block(block)
         
         self.pending_transactions = []
         return block
@@ -100,6 +161,19 @@ class RootChain:
             return 0.0
         return self.balances.get(address, 0.0)
 
+    def balance_at(self, address: str, height: int) -> float:
+        """
+        Balance of an address once the block at height was applied
+        
+        Args:
+            address (str): Address on this network
+            height (int): Block index; heights past the tip give the current balance
+        """
+        if not address.startswith(self.prefix):
+            return 0.0
+        return self.balance_history.balance_at(address, height)
+
+    @tracer.traced("chain.validate")
     def is_chain_valid(self) -> bool:
         for i in range(1, len(self.chain)):
             current_block = self.chain[i]
@@ -113,19 +187,65 @@ class RootChain:
         
         return True
 
+    def block_range_between(self, start_time: float, end_time: float) -> Tuple[int, int]:
+        """
+        Index range [first, last) of blocks with start_time <= timestamp < end_time
+        
+        Args:
+            start_time (float): Inclusive lower bound
+            end_time (float): Exclusive upper bound
+        """
+        first = bisect_left(self.block_timestamps, start_time)
+        return first, max(first, bisect_left(self.block_timestamps, end_time, first))
+
+    def get_blocks_between(self, start_time: float, end_time: float) -> List[Block]:
+        """Blocks with start_time <= timestamp < end_time, oldest first, in O(log n + k)."""
+        first, last = self.block_range_between(start_time, end_time)
+        return self.chain[first:last]
+
+    @tracer.traced("chain.get_block_by_hash")
     def get_block_by_hash(self, block_hash: str) -> Optional[Block]:
         for block in self.chain:
             if block.hash == block_hash:
                 return block
         return None
 
+    @tracer.traced("chain.get_transactions_by_address")
     def get_transactions_by_address(self, address: str) -> List[Dict[str, Any]]:
-        transactions = []
-        for block in self.chain:
-            for tx in block.transactions:
+        return [tx for _, _, tx in self.iter_transactions_by_address(address)]
+
+    def iter_transactions_by_address(
+        self,
+        address: str,
+        start: Tuple[int, int] = (0, 0),
+        since: Optional[float] = None
+    ) -> Iterator[Tuple[int, int, Dict[str, Any]]]:
+        """
+        Lazily yield (block_index, tx_index, transaction) for an address
+        
+        Args:
+            address (str): Address to match as sender or recipient
+            start (tuple): (block_index, tx_index) position to resume from
+            since (float): Skip transactions older than this timestamp
+        """
+        start_block, start_tx = start
+        if since is not None:
+            # Every block before this one is older than since
+            first_recent = bisect_left(self.block_timestamps, since)
+            if first_recent > start_block:
+                start_block, start_tx = first_recent, 0
+        for block_index in range(start_block, len(self.chain)):
+            block = self.chain[block_index]
+            # Transactions are never newer than the block that holds them
+            if since is not None and block.timestamp < since:
+                continue
+            first = start_tx if block_index == start_block else 0
+            for tx_index in range(first, len(block.transactions)):
+                tx = block.transactions[tx_index]
+                if since is not None and tx["timestamp"] < since:
+                    continue
                 if tx["sender"] == address or tx["recipient"] == address:
-                    transactions.append(tx)
-        return transactions 
+                    yield block_index, tx_index, tx
 
     def get_network(self) -> str:
         return self.network
@@ -0,0 +1,148 @@
+import functools
+import os
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+class SpanStats:
+    """Calls, total and slowest duration of one span name."""
+
+    __slots__ = ("calls", "total", "max")
+
+    def __init__(self):
+        self.calls = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, elapsed: float) -> None:
+        self.calls += 1
+        self.total += elapsed
+        if elapsed > self.max:
+            self.max = elapsed
+
+class _Span:
+    __slots__ = ("stats", "start")
+
+    def __init__(self, stats: SpanStats):
+        self.stats = stats
+
+    def __enter__(self) -> "_Span":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stats.record(time.perf_counter() - self.start)
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        pass
+
+_NULL_SPAN = _NullSpan()
+
+class _TracedFunction:
+    """
+    What traced() returns
+
+    Defined in a class body, it replaces itself on the class with the bare
+    function while tracing is off and with the timing wrapper while it is
+    on. Elsewhere it stays in place and calls the wrapper.
+    """
+
+    def __init__(self, tracer: "Tracer", func: Callable[..., Any], wrapper: Callable[..., Any]):
+        functools.update_wrapper(self, func)
+        self.tracer = tracer
+        self.func = func
+        self.wrapper = wrapper
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.tracer._sites.append((owner, name, self.func, self.wrapper))
+        setattr(owner, name, self.wrapper if self.tracer.enabled else self.func)
+
+    def __call__(self, *args, **kwargs):
+        return self.wrapper(*args, **kwargs)
+
+class Tracer:
+    """
+    Span timings and event counters for the core engine
+
+    While disabled, span() hands back one shared no-op context manager and
+    traced methods are the undecorated functions themselves, so
+    instrumentation can stay on the hot paths. Setting enabled swaps the
+    timing wrappers in and out.
+    """
+
+    def __init__(self, enabled: bool = False):
+        # (class, attribute, function, wrapper) of every traced method
+        self._sites: List[Tuple[type, str, Callable[..., Any], Callable[..., Any]]] = []
+        self.enabled = enabled
+        self.spans: Dict[str, SpanStats] = {}
+        self.counters: Dict[str, int] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self._enabled
+
+    @enabled.setter
+    def enabled(self, enabled: bool) -> None:
+        self._enabled = enabled
+        for owner, name, func, wrapper in self._sites:
+            setattr(owner, name, wrapper if enabled else func)
+
+    def span(self, name: str):
+        """Context manager timing a block of code under name."""
+        if not self._enabled:
+            return _NULL_SPAN
+        stats = self.spans.get(name)
+        if stats is None:
+            stats = self.spans[name] = SpanStats()
+        return _Span(stats)
+
+    def count(self, name: str, n: int = 1) -> None:
+        if self._enabled:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def traced(self, name: str, outcomes: Optional[Tuple[str, str]] = None) -> Callable[[F], F]:
+        """
+        Decorator timing every call of a function or method as a span
+
+        Args:
+            name (str): Span name
+            outcomes (Tuple[str, str]): Counters bumped when a call returns a
+                truthy and a falsy result, so the function itself needs no
+                counting code
+        """
+        def decorator(func: F) -> F:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self._enabled:
+                    return func(*args, **kwargs)
+                with self.span(name):
+                    result = func(*args, **kwargs)
+                if outcomes is not None:
+                    self.count(outcomes[0] if result else outcomes[1])
+                return result
+            return _TracedFunction(self, func, wrapper)  # type: ignore[return-value]
+        return decorator
+
+    def snapshot(self) -> Dict[str, Dict]:
+        return {
+            "enabled": self.enabled,
+            "spans": {
+                name: {"calls": stats.calls, "total_seconds": stats.total, "max_seconds": stats.max}
+                for name, stats in list(self.spans.items())
+            },
+            "counters": dict(self.counters)
+        }
+
+    def reset(self) -> None:
+        self.spans = {}
+        self.counters = {}
+
+# Shared by the core modules; enable with ROOTCHAIN_TRACING=1 or tracer.enabled = True
+tracer = Tracer(enabled=os.getenv("ROOTCHAIN_TRACING") == "1")
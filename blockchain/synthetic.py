@@ -0,0 +1,188 @@
+"""
+Deterministic synthetic chains for benchmarks, load tests and fixtures
+
+The same seed and parameters always produce the same blocks, hashes
+included. Activity is Zipf-skewed: address k is picked as sender or
+recipient with weight 1 / (k + 1) ** zipf, so a few addresses are very
+busy and most are rarely touched. Blocks are not mined by default
+(difficulty 0): hashes are real, so is_chain_valid holds, but they do not
+meet a proof-of-work target. Senders never overspend.
+
+Chains are exported as NDJSON, one Block.to_dict() per line.
+
+Usage:
+    python -m blockchain.synthetic --blocks 1000 --transactions 1000000 \\
+        --addresses 100000 --output chain.ndjson
+"""
+
+import argparse
+import itertools
+import json
+import random
+import sys
+import time
+from typing import Iterable, Iterator, List
+
+from .core.block import Block
+from .core.blockchain import RootChain
+
+# 2024-01-01T00:00:00Z, so generated timestamps do not depend on the clock
+DEFAULT_START_TIME = 1_704_067_200.0
+
+def synthetic_addresses(prefix: str, count: int, tag: str = "synth") -> List[str]:
+    # Padded so they pass the wallet API's 30-50 character address checks
+    return [f"{prefix}_{tag}_{i:024d}" for i in range(count)]
+
+def generate_blocks(
+    network: str = "testnet",
+    blocks: int = 100,
+    transactions: int = 10_000,
+    addresses: int = 1_000,
+    zipf: float = 1.1,
+    seed: int = 42,
+    start_time: float = DEFAULT_START_TIME,
+    difficulty: int = 0,
+    tag: str = "synth"
+) -> Iterator[Block]:
+    """
+    Yield a genesis block followed by blocks of transfers
+
+    Args:
+        network (str): "mainnet" or "testnet"
+        blocks (int): Blocks after genesis
+        transactions (int): Transfers spread evenly over the blocks; each block
+            also carries its mining reward
+        addresses (int): Number of distinct synthetic addresses
+        zipf (float): Skew exponent; 0 picks addresses uniformly
+        seed (int): Random seed
+        start_time (float): Genesis timestamp; blocks follow at the network's
+            block time
+        difficulty (int): Proof-of-work difficulty to mine each block at
+        tag (str): Address tag, see synthetic_addresses
+    """
+    template = RootChain(network)
+    rng = random.Random(seed)
+    names = synthetic_addresses(template.prefix, addresses, tag)
+    cum_weights = list(itertools.accumulate(1 / (k + 1) ** zipf for k in range(addresses)))
+    treasury = f"{template.prefix}_treasury"
+    balances = {treasury: float(template.total_supply)}
+    interval = float(template.block_time)
+
+    genesis = template.genesis_block(start_time)
+    yield genesis
+    previous_hash = genesis.hash
+
+    for index in range(1, blocks + 1):
+        count = transactions * index // blocks - transactions * (index - 1) // blocks
+        senders = rng.choices(names, cum_weights=cum_weights, k=count)
+        recipients = rng.choices(names, cum_weights=cum_weights, k=count)
+        block_time = start_time + index * interval
+        # Spread transactions over the interval leading up to their block
+        step = interval / (count + 2)
+        tx_time = block_time - interval
+        block_txs = []
+        for sender, recipient in zip(senders, recipients):
+            amount = round(rng.uniform(0.01, 1.0), 4)
+            if balances.get(sender, 0.0) < amount:
+                sender = treasury
+            balances[sender] -= amount
+            balances[recipient] = balances.get(recipient, 0.0) + amount
+            tx_time += step
+            block_txs.append({
+                "sender": sender,
+                "recipient": recipient,
+                "amount": amount,
+                "timestamp": tx_time,
+                "type": "transfer",
+                "network": template.network
+            })
+        miner = names[rng.randrange(addresses)]
+        balances[miner] = balances.get(miner, 0.0) + template.mining_reward
+        block_txs.append({
+            "sender": "0x0",
+            "recipient": miner,
+            "amount": template.mining_reward,
+            "timestamp": tx_time + step,
+            "type": "transfer",
+            "network": template.network
+        })
+        block = Block(index, block_txs, block_time, previous_hash)
+        if difficulty:
+            block.mine_block(difficulty)
+        yield block
+        previous_hash = block.hash
+
+def generate_chain(network: str = "testnet", **kwargs) -> RootChain:
+    """Build a RootChain from generate_blocks(network, **kwargs)."""
+    chain = RootChain(network)
+    chain.load_blocks(generate_blocks(network, **kwargs))
+    return chain
+
+def write_blocks(blocks: Iterable[Block], path: str) -> int:
+    """Stream blocks to an NDJSON export. Returns the number written."""
+    written = 0
+    with open(path, "w") as f:
+        for block in blocks:
+            f.write(json.dumps(block.to_dict()))
+            f.write("\n")
+            written += 1
+    return written
+
+def read_blocks(path: str) -> Iterator[Block]:
+    """Yield blocks from an NDJSON export, checking each stored hash."""
+    with open(path) as f:
+        for line in f:
+            data = json.loads(line)
+            block = Block(
+                data["index"],
+                data["transactions"],
+                data["timestamp"],
+                data["previous_hash"],
+                data["nonce"]
+            )
+            if block.hash != data["hash"]:
+                raise ValueError(f"Hash mismatch for block {data['index']} in {path}")
+            yield block
+
+def load_chain(path: str) -> RootChain:
+    """Build a RootChain from an NDJSON export."""
+    blocks = read_blocks(path)
+    genesis = next(blocks)
+    chain = RootChain(genesis.network)
+    chain.load_blocks(itertools.chain([genesis], blocks))
+    return chain
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate a deterministic synthetic RootChain")
+    parser.add_argument("--network", choices=["mainnet", "testnet"], default="testnet")
+    parser.add_argument("--blocks", type=int, default=1000)
+    parser.add_argument("--transactions", type=int, default=1_000_000)
+    parser.add_argument("--addresses", type=int, default=100_000)
+    parser.add_argument("--zipf", type=float, default=1.1)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--start-time", type=float, default=DEFAULT_START_TIME)
+    parser.add_argument("--difficulty", type=int, default=0)
+    parser.add_argument("--tag", default="synth")
+    parser.add_argument("--output", required=True, help="NDJSON file to write")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    written = write_blocks(generate_blocks(
+        args.network,
+        blocks=args.blocks,
+        transactions=args.transactions,
+        addresses=args.addresses,
+        zipf=args.zipf,
+        seed=args.seed,
+        start_time=args.start_time,
+        difficulty=args.difficulty,
+        tag=args.tag
+    ), args.output)
+    print(
+        f"Wrote {written} blocks ({args.transactions} transfers) to {args.output} "
+        f"in {time.perf_counter() - started:.1f}s",
+        file=sys.stderr
+    )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+import os
+import random
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from blockchain.core.aggregates import ChainAggregates, HyperLogLog
+from blockchain.core.block import Block
+from blockchain.synthetic import DEFAULT_START_TIME as T0, generate_chain
+
+def test_hyperloglog_estimates_within_error():
+    for n in (10, 1000, 50_000):
+        counter = HyperLogLog()
+        for i in range(n):
+            counter.add(f"rtc_{i}")
+            counter.add(f"rtc_{i}")
+        assert abs(counter.count() - n) <= max(2, 0.1 * n)
+
+def test_hyperloglog_merge_counts_the_union():
+    a, b = HyperLogLog(), HyperLogLog()
+    for i in range(3000):
+        a.add(f"a{i}")
+        b.add(f"a{i + 1500}")
+    a.merge(b)
+    assert abs(a.count() - 4500) <= 450
+
+def test_chain_totals_match_a_scan():
+    chain = generate_chain("testnet", blocks=40, transactions=2000, addresses=300)
+    assert chain.aggregates.total_transactions == sum(len(block.transactions) for block in chain.chain)
+
+    # Testnet blocks are 300 seconds apart; look at the last 10 blocks
+    now = chain.chain[-1].timestamp + 1
+    window = [block for block in chain.chain if block.timestamp >= now - 3000]
+    activity = chain.aggregates.activity(chain.block_timestamps, 3000, now=now)
+    assert activity["transactions"] == sum(len(block.transactions) for block in window)
+    assert activity["active_addresses"] > 0
+
+def test_distinct_addresses_per_window():
+    aggregates = ChainAggregates(bucket_seconds=60, retention_seconds=600)
+    timestamps = []
+    rng = random.Random(1)
+    for minute in range(30):
+        txs = [{"sender": "0x0" if i == 0 else f"rtc_{minute}_{i}", "recipient": "rtc_shared", "amount": 1.0}
+               for i in range(20)]
+        block = Block(minute, txs, T0 + minute * 60 + rng.random(), "0")
+        aggregates.record(block, block.timestamp)
+        timestamps.append(block.timestamp)
+
+    # Old buckets are dropped once they fall out of the retention period
+    assert len(aggregates.address_buckets) == 11
+    now = T0 + 30 * 60
+    recent = aggregates.activity(timestamps, 300, now=now)
+    assert recent["transactions"] == 5 * 20
+    # Five one-minute buckets of 19 senders each plus the shared recipient
+    assert abs(recent["active_addresses"] - 96) <= 5
+    assert aggregates.activity(timestamps, 300, now=now) == recent
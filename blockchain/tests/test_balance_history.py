@@ -0,0 +1,67 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+import pytest
+
+from blockchain.core.balance_history import BalanceHistory
+from blockchain.synthetic import generate_blocks, generate_chain
+
+def replayed_balance(chain, address, height):
+    balance = 0.0
+    for block in chain.chain[:height + 1]:
+        for tx in block.transactions:
+            if tx["sender"] == address:
+                balance -= tx["amount"]
+            if tx["recipient"] == address:
+                balance += tx["amount"]
+    return balance
+
+def test_balance_at_matches_a_replay():
+    chain = generate_chain("testnet", blocks=30, transactions=600, addresses=20)
+    addresses = sorted(chain.balances)
+    for address in addresses[:5] + [f"{chain.prefix}_treasury"]:
+        for height in (0, 1, 7, 15, 29, 30, 1000):
+            assert abs(chain.balance_at(address, height) - replayed_balance(chain, address, height)) < 1e-6
+        assert chain.balance_at(address, len(chain.chain)) == chain.get_balance(address)
+    assert chain.balance_at(f"{chain.prefix}_nobody", 10) == 0.0
+    assert chain.balance_at("rtc_treasury", 10) == 0.0
+
+def test_one_checkpoint_per_touched_block():
+    chain = generate_chain("testnet", blocks=10, transactions=200, addresses=5)
+    for address in chain.balances:
+        heights = [height for height, _ in chain.balance_history.checkpoints(address)]
+        touched = [
+            block.index for block in chain.chain
+            if any(address in (tx["sender"], tx["recipient"]) for tx in block.transactions)
+        ]
+        assert heights == touched
+
+def test_history_resets_with_the_chain():
+    chain = generate_chain("testnet", blocks=5, transactions=50, addresses=5, seed=1)
+    chain.load_blocks(generate_blocks("testnet", blocks=5, transactions=50, addresses=5, seed=2))
+    for address in chain.balances:
+        assert chain.balance_at(address, 5) == chain.get_balance(address)
+
+def test_timeline_downsamples_the_step_function():
+    history = BalanceHistory()
+    for height in range(0, 1000, 2):
+        history.record(height, {"a": float(height)}, ["a"])
+
+    assert history.timeline("a", 1000, 1200)[-2:] == [(998, 998.0), (1200, 998.0)]
+    series = history.timeline("a", 11, 1000)
+    assert [height for height, _ in series] == list(range(0, 1001, 100))
+    assert all(balance == history.balance_at("a", height) for height, balance in series)
+    assert history.timeline("missing", 10, 100) == []
+
+def test_timeline_never_exceeds_points():
+    history = BalanceHistory()
+    for height in range(5):
+        history.record(height, {"a": float(height)}, ["a"])
+
+    # Five checkpoints plus the tip would be six
+    series = history.timeline("a", 5, 20)
+    assert len(series) == 5 and series[0] == (0, 0.0) and series[-1] == (20, 4.0)
+    assert history.timeline("a", 2, 4) == [(0, 0.0), (4, 4.0)]
+    with pytest.raises(ValueError):
+        history.timeline("a", 1, 4)
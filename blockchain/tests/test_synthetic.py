@@ -0,0 +1,74 @@
+import os
+import sys
+from collections import Counter
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+import pytest
+
+from blockchain.core.blockchain import RootChain
+from blockchain.synthetic import (
+    generate_blocks,
+    generate_chain,
+    load_chain,
+    read_blocks,
+    synthetic_addresses,
+    write_blocks
+)
+
+PARAMS = dict(blocks=20, transactions=1000, addresses=200, seed=3)
+
+def test_same_seed_gives_identical_chain():
+    first = generate_chain("testnet", **PARAMS)
+    second = generate_chain("testnet", **PARAMS)
+    assert [block.hash for block in first.chain] == [block.hash for block in second.chain]
+    assert generate_chain("testnet", **dict(PARAMS, seed=4)).chain[-1].hash != first.chain[-1].hash
+
+def test_chain_shape_and_validity():
+    chain = generate_chain("mainnet", **PARAMS)
+    assert len(chain.chain) == 21
+    # One mining reward per block on top of the requested transfers
+    assert sum(len(block.transactions) for block in chain.chain[1:]) == 1000 + 20
+    assert chain.is_chain_valid()
+    assert min(chain.balances.values()) >= 0
+    assert chain.get_balance("rtc_treasury") < chain.total_supply
+    timestamps = [tx["timestamp"] for block in chain.chain for tx in block.transactions]
+    assert timestamps == sorted(timestamps)
+    assert all(
+        tx["timestamp"] <= block.timestamp for block in chain.chain for tx in block.transactions
+    )
+
+def test_activity_is_zipf_skewed():
+    chain = generate_chain("testnet", blocks=10, transactions=5000, addresses=500, seed=1)
+    names = synthetic_addresses("trtc", 500)
+    received = Counter(
+        tx["recipient"] for block in chain.chain[1:] for tx in block.transactions[:-1]
+    )
+    assert received[names[0]] > 10 * max(received[names[-1]], 1)
+
+def test_difficulty_mines_blocks():
+    blocks = list(generate_blocks("testnet", blocks=2, transactions=10, addresses=5, difficulty=2))
+    assert all(block.hash.startswith("00") for block in blocks[1:])
+
+def test_export_round_trip(tmp_path):
+    path = str(tmp_path / "chain.ndjson")
+    assert write_blocks(generate_blocks("testnet", **PARAMS), path) == 21
+    loaded = load_chain(path)
+    expected = generate_chain("testnet", **PARAMS)
+    assert loaded.network == "testnet"
+    assert [block.hash for block in loaded.chain] == [block.hash for block in expected.chain]
+    assert loaded.balances == expected.balances
+
+def test_read_blocks_rejects_tampered_export(tmp_path):
+    path = tmp_path / "chain.ndjson"
+    write_blocks(generate_blocks("testnet", **PARAMS), str(path))
+    path.write_text(path.read_text().replace('"amount": 0.', '"amount": 9.', 1))
+    with pytest.raises(ValueError):
+        list(read_blocks(str(path)))
+
+def test_load_blocks_replaces_chain_state():
+    chain = RootChain("testnet")
+    chain.add_transaction("trtc_treasury", "trtc_someone", 5)
+    chain.load_blocks(generate_blocks("testnet", **PARAMS))
+    assert chain.pending_transactions == []
+    assert chain.get_balance("trtc_someone") == 0.0
+    assert len(chain.chain) == 21
@@ -0,0 +1,50 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from blockchain.core.block import Block
+from blockchain.core.blockchain import RootChain
+from blockchain.synthetic import DEFAULT_START_TIME as T0, generate_chain
+
+def scan_between(chain: RootChain, start: float, end: float):
+    return [block for block in chain.chain if start <= block.timestamp < end]
+
+def test_blocks_between_matches_a_scan():
+    # Testnet blocks are 300 seconds apart
+    chain = generate_chain("testnet", blocks=50, transactions=100, addresses=10)
+    for start, end in [(T0, T0 + 300), (T0 + 299, T0 + 3001), (T0 - 1e6, T0 + 1e6), (T0 + 1e6, T0 + 2e6), (T0 + 600, T0 + 600)]:
+        assert chain.get_blocks_between(start, end) == scan_between(chain, start, end)
+    assert chain.block_range_between(T0 + 300, T0 + 1200) == (1, 4)
+
+def test_timestamp_array_follows_the_chain():
+    chain = generate_chain("testnet", blocks=5, transactions=10, addresses=5)
+    assert list(chain.block_timestamps) == [block.timestamp for block in chain.chain]
+
+    chain.difficulty = 1
+    chain.mine_pending_transactions(f"{chain.prefix}_miner")
+    assert len(chain.block_timestamps) == len(chain.chain)
+    assert chain.get_blocks_between(chain.get_latest_block().timestamp, float("inf")) == [chain.get_latest_block()]
+
+    chain.load_blocks([chain.genesis_block(T0)])
+    assert list(chain.block_timestamps) == [T0]
+
+def test_clock_steps_back_keep_lookups_sorted():
+    chain = RootChain(network="testnet")
+    chain.load_blocks([chain.genesis_block(T0)])
+    late = Block(1, [], T0 + 100, chain.get_latest_block().hash)
+    chain.append_block(late)
+    skewed = Block(2, [], T0 + 50, late.hash)
+    chain.append_block(skewed)
+    assert list(chain.block_timestamps) == [T0, T0 + 100, T0 + 100]
+    assert chain.get_blocks_between(T0 + 100, T0 + 101) == [late, skewed]
+
+def test_address_history_since_skips_old_blocks():
+    chain = generate_chain("testnet", blocks=20, transactions=400, addresses=5)
+    address = chain.chain[1].transactions[0]["recipient"]
+    since = T0 + 10 * 300
+    expected = [
+        (b, t, tx) for b, block in enumerate(chain.chain) for t, tx in enumerate(block.transactions)
+        if tx["timestamp"] >= since and address in (tx["sender"], tx["recipient"])
+    ]
+    assert list(chain.iter_transactions_by_address(address, since=since)) == expected
@@ -0,0 +1,68 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+import pytest
+
+from blockchain.core.blockchain import RootChain
+from blockchain.core.tracing import Tracer, tracer
+
+@pytest.fixture
+def tracing():
+    tracer.reset()
+    tracer.enabled = True
+    yield tracer
+    tracer.enabled = False
+    tracer.reset()
+
+def test_disabled_tracer_records_nothing():
+    local = Tracer()
+
+    @local.traced("work")
+    def work(x):
+        return x * 2
+
+    with local.span("block"):
+        pass
+    local.count("events")
+    assert work(21) == 42
+    assert local.snapshot() == {"enabled": False, "spans": {}, "counters": {}}
+    # Disabled spans are one shared object, so nothing is allocated per call
+    assert local.span("a") is local.span("b")
+
+def test_disabled_methods_are_not_wrapped():
+    local = Tracer()
+
+    class Work:
+        @local.traced("work")
+        def run(self, x):
+            return x * 2
+
+    assert Work.run.__name__ == "run" and not hasattr(Work.run, "__wrapped__")
+    local.enabled = True
+    assert Work.run.__wrapped__ is not None and Work().run(21) == 42
+    assert local.snapshot()["spans"]["work"]["calls"] == 1
+    local.enabled = False
+    assert not hasattr(Work.run, "__wrapped__")
+
+def test_core_operations_are_traced(tracing):
+    chain = RootChain(network="testnet")
+    assert chain.add_transaction("trtc_treasury", "trtc_alice", 10)
+    assert not chain.add_transaction("trtc_alice", "trtc_bob", 1_000)
+    block = chain.mine_pending_transactions("trtc_miner")
+    assert chain.is_chain_valid()
+    assert chain.get_block_by_hash(block.hash) is block
+
+    snapshot = tracing.snapshot()
+    spans = snapshot["spans"]
+    for name in ("chain.add_transaction", "chain.mine_pending_transactions", "block.mine",
+                 "chain.append_block", "chain.settle_balances", "chain.validate", "chain.get_block_by_hash"):
+        assert spans[name]["calls"] >= 1
+        assert 0 <= spans[name]["max_seconds"] <= spans[name]["total_seconds"]
+    assert snapshot["counters"]["chain.transactions_rejected"] == 1
+    # The transfer plus the mining reward
+    assert snapshot["counters"]["chain.transactions_accepted"] == 2
+    # Genesis, then the mined block
+    assert snapshot["counters"]["chain.blocks_appended"] == 2
+    assert snapshot["counters"]["chain.transactions_settled"] == 3
+    assert snapshot["counters"]["block.hashes"] == block.nonce + 1
@@ -2,7 +2,13 @@
 RootChain wallet package
 """
 
-from .wallet import RootWallet
 from .symbols import ROOT, ROOT_TESTNET
 
-__all__ = ['RootWallet', 'ROOT', 'ROOT_TESTNET'] 
\ No newline at end of file
+__all__ = ['RootWallet', 'ROOT', 'ROOT_TESTNET']
+
+def __getattr__(name):
+    # RootWallet pulls in hdwallet and mnemonic; import it only when used
+    if name == 'RootWallet':
+        from .wallet import RootWallet
+        return RootWallet
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
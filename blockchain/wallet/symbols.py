@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Optional, Dict, Any
 
 class Symbol:
     def __init__(self, name: str, coin_type: int, symbol: str, network: str, segwit: bool = False):
@@ -8,6 +8,15 @@ class Symbol:
         self.network = network
         self.segwit = segwit
 
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "coin_type": self.coin_type,
+            "symbol": self.symbol,
+            "network": self.network,
+            "segwit": self.segwit
+        }
+
 # Define ROOT symbols for both mainnet and testnet
 ROOT = Symbol(
     name="RootChain",
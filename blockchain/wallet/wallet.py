@@ -1,5 +1,10 @@
 from mnemonic import Mnemonic
 from hdwallet import HDWallet
+from hdwallet.cryptocurrencies import Bitcoin
+from hdwallet.derivations import CustomDerivation
+from hdwallet.exceptions import Error as HDWalletError
+from hdwallet.hds import BIP32HD
+from hdwallet.seeds import BIP39Seed
 from .symbols import ROOT, ROOT_TESTNET, Symbol
 from typing import Dict, Any, Tuple
 import hashlib
@@ -22,15 +27,10 @@ class RootWallet:
         # Generate 24 word mnemonic
         words = self.mnemonic.generate(strength=256)  # 256 bits = 24 words
         
-        # Create HDWallet
-        hdwallet = HDWallet()
-        hdwallet.from_mnemonic(words)
-        # Use different derivation paths for mainnet and testnet
-        path = f"m/44'/{self.symbol.coin_type}'/0'/0/0"
-        hdwallet.from_path(path)
+        hdwallet = self._derive(words)
         
         return {
-            "address": f"{self.address_prefix}{hdwallet.p2pkh_address()}",
+            "address": self._address(hdwallet),
             "private_key": hdwallet.private_key(),
             "mnemonic": words,
             "balance": 0,
@@ -41,20 +41,50 @@ class RootWallet:
         if not self.mnemonic.check(mnemonic):
             raise ValueError("Invalid mnemonic phrase")
             
-        hdwallet = HDWallet()
-        hdwallet.from_mnemonic(mnemonic)
-        # Use different derivation paths for mainnet and testnet
-        path = f"m/44'/{self.symbol.coin_type}'/0'/0/0"
-        hdwallet.from_path(path)
+        hdwallet = self._derive(mnemonic)
         
         return {
-            "address": f"{self.address_prefix}{hdwallet.p2pkh_address()}",
+            "address": self._address(hdwallet),
             "private_key": hdwallet.private_key(),
             "mnemonic": mnemonic,
             "balance": 0,
             "network": self.network
         }
     
+    @classmethod
+    def from_private_key(cls, private_key: str, network_type: str = "mainnet") -> "RootWallet":
+        """
+        Load the wallet a private key belongs to
+        
+        Args:
+            private_key (str): Hex private key, as returned by create_wallet
+            network_type (str): Either "mainnet" or "testnet"
+        
+        Raises:
+            ValueError: If private_key is not a valid private key
+        """
+        wallet = cls(network=network_type)
+        try:
+            hdwallet = HDWallet(cryptocurrency=Bitcoin, hd=BIP32HD).from_private_key(private_key)
+        except HDWalletError as e:
+            raise ValueError("Invalid private key") from e
+        wallet.private_key = hdwallet.private_key()
+        wallet.address = wallet._address(hdwallet)
+        return wallet
+    
+    def _derive(self, words: str) -> HDWallet:
+        hdwallet = HDWallet(cryptocurrency=Bitcoin, hd=BIP32HD)
+        # Seeding from the words directly makes hdwallet detect their language
+        # against every wordlist, which costs ~20x the derivation itself
+        hdwallet.from_seed(BIP39Seed(Mnemonic.to_seed(words).hex()))
+        # Use different derivation paths for mainnet and testnet
+        path = f"m/44'/{self.symbol.coin_type}'/0'/0/0"
+        hdwallet.from_derivation(CustomDerivation(path=path))
+        return hdwallet
+    
+    def _address(self, hdwallet: HDWallet) -> str:
+        return f"{self.address_prefix}{hdwallet.address('P2PKH')}"
+    
     @staticmethod
     def verify_address(address: str) -> bool:
         """Verify if the address is valid for either mainnet or testnet"""
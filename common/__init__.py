@@ -0,0 +1,3 @@
+"""
+RootChain shared service utilities
+"""
@@ -0,0 +1,187 @@
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, Optional, Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    start_http_server
+)
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from starlette.requests import Request
+from starlette.responses import Response
+
+from blockchain.core.tracing import tracer
+from common.profiling import setup_profiling
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+_request_metrics: Dict[str, Tuple[Counter, Histogram, Gauge]] = {}
+
+def request_metrics(service: str) -> Tuple[Counter, Histogram, Gauge]:
+    """Return (count, latency, in-flight) metrics for a service, creating them once."""
+    if service not in _request_metrics:
+        _request_metrics[service] = (
+            Counter(
+                f'{service}_request_count',
+                'Number of requests received',
+                ['endpoint', 'method', 'status']
+            ),
+            Histogram(
+                f'{service}_request_latency_seconds',
+                'Request latency in seconds',
+                ['endpoint']
+            ),
+            Gauge(
+                f'{service}_requests_in_flight',
+                'Requests currently being handled'
+            )
+        )
+    return _request_metrics[service]
+
+class PrometheusMiddleware:
+    """Pure ASGI middleware recording per-route count, latency and in-flight requests.
+
+    Requests are labelled with the route template (e.g. /api/block/{block_hash})
+    rather than the raw path, so label cardinality stays bounded.
+    """
+
+    def __init__(self, app, service: str):
+        self.app = app
+        self.request_count, self.request_latency, self.in_flight = request_metrics(service)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        self.in_flight.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.in_flight.dec()
+            # The router stores the matched route in the shared scope
+            endpoint = getattr(scope.get("route"), "path", UNMATCHED_ROUTE)
+            self.request_count.labels(endpoint, scope["method"], str(status_code)).inc()
+            self.request_latency.labels(endpoint).observe(elapsed)
+
+async def metrics_endpoint(request: Request) -> Response:
+    return Response(generate_latest(REGISTRY), media_type=CONTENT_TYPE_LATEST)
+
+def setup_metrics(app, service: str, port: Optional[int] = None) -> None:
+    """
+    Instrument a FastAPI app and expose its metrics
+
+    Args:
+        app: FastAPI application
+        service (str): Metric name prefix, e.g. "wallet" or "explorer"
+        port (int): Serve metrics on a separate port, started with the app
+            rather than at import; when unset they are served from /metrics
+            on the app itself
+
+    Core engine spans and counters are exported too while ROOTCHAIN_TRACING
+    is on, and PROFILING_ENABLED=1 adds the /debug/profile route.
+    """
+    app.add_middleware(PrometheusMiddleware, service=service)
+    register_trace_metrics()
+    setup_profiling(app, enabled=os.getenv("PROFILING_ENABLED") == "1")
+    if not port:
+        app.add_route("/metrics", metrics_endpoint, include_in_schema=False)
+        return
+
+    app_lifespan = app.router.lifespan_context
+
+    @asynccontextmanager
+    async def lifespan(app):
+        server, _ = start_http_server(port)
+        try:
+            async with app_lifespan(app) as state:
+                yield state
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    app.router.lifespan_context = lifespan
+
+class ChainCollector:
+    """Reads chain gauges at scrape time, so they cost nothing per request."""
+
+    def __init__(self):
+        self.chains: Dict[Tuple[str, str], object] = {}
+
+    def add(self, service: str, chain) -> None:
+        self.chains[(service, chain.network)] = chain
+
+    def collect(self):
+        height = GaugeMetricFamily(
+            'rootchain_block_height', 'Index of the latest block', labels=['service', 'network'])
+        mempool = GaugeMetricFamily(
+            'rootchain_mempool_size', 'Pending transactions', labels=['service', 'network'])
+        hashrate = GaugeMetricFamily(
+            'rootchain_mining_hashrate', 'Hashes per second while mining the latest block',
+            labels=['service', 'network'])
+        for (service, network), chain in list(self.chains.items()):
+            labels = [service, network]
+            height.add_metric(labels, len(chain.chain) - 1)
+            mempool.add_metric(labels, len(chain.pending_transactions))
+            hashrate.add_metric(labels, chain.mining_hashrate)
+        yield height
+        yield mempool
+        yield hashrate
+
+_chain_collector: Optional[ChainCollector] = None
+
+def register_chain_metrics(service: str, *chains) -> None:
+    """Expose height, mempool size and hashrate gauges for the given chains."""
+    global _chain_collector
+    if _chain_collector is None:
+        _chain_collector = ChainCollector()
+        REGISTRY.register(_chain_collector)
+    for chain in chains:
+        _chain_collector.add(service, chain)
+
+class TraceCollector:
+    """Exports the core engine tracer's spans and counters at scrape time."""
+
+    def collect(self):
+        calls = CounterMetricFamily(
+            'rootchain_span_calls', 'Calls of a traced core operation', labels=['span'])
+        seconds = CounterMetricFamily(
+            'rootchain_span_seconds', 'Time spent in a traced core operation', labels=['span'])
+        slowest = GaugeMetricFamily(
+            'rootchain_span_max_seconds', 'Slowest call of a traced core operation', labels=['span'])
+        events = CounterMetricFamily(
+            'rootchain_core_events', 'Core engine event counts', labels=['event'])
+        for name, stats in list(tracer.spans.items()):
+            calls.add_metric([name], stats.calls)
+            seconds.add_metric([name], stats.total)
+            slowest.add_metric([name], stats.max)
+        for name, count in list(tracer.counters.items()):
+            events.add_metric([name], count)
+        yield calls
+        yield seconds
+        yield slowest
+        yield events
+
+_trace_collector: Optional[TraceCollector] = None
+
+def register_trace_metrics() -> None:
+    global _trace_collector
+    if _trace_collector is None:
+        _trace_collector = TraceCollector()
+        REGISTRY.register(_trace_collector)
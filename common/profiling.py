@@ -0,0 +1,89 @@
+import asyncio
+import cProfile
+import marshal
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict
+
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+
+# Longest capture a single request may ask for, in seconds
+MAX_PROFILE_SECONDS = 300
+# Seconds between stack samples in sampling mode
+SAMPLE_INTERVAL = 0.005
+
+_profile_lock = asyncio.Lock()
+
+def sample_stacks(seconds: float, interval: float = SAMPLE_INTERVAL) -> Dict[str, int]:
+    """
+    Sample every thread's stack until seconds have passed
+
+    Returns:
+        Dict[str, int]: Samples per stack in collapsed form, outermost frame
+        first and frames joined by ";", as read by flame graph tools
+    """
+    me = threading.get_ident()
+    stacks: Counter = Counter()
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == me:
+                continue
+            frames = []
+            while frame is not None:
+                code = frame.f_code
+                frames.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            stacks[";".join(reversed(frames))] += 1
+        time.sleep(interval)
+    return stacks
+
+async def profile_endpoint(request: Request) -> Response:
+    """
+    Capture a profile for ?seconds=N and return it as a download
+
+    mode=cprofile (default) profiles the event loop thread with cProfile
+    and returns a pstats file for pstats or snakeviz. mode=sample samples
+    every thread, including executor threads that mine or settle blocks,
+    and returns collapsed stacks for flame graph tools.
+    """
+    try:
+        seconds = float(request.query_params.get("seconds", "10"))
+    except ValueError:
+        return JSONResponse({"detail": "seconds must be a number"}, status_code=400)
+    if not 0 < seconds <= MAX_PROFILE_SECONDS:
+        return JSONResponse({"detail": f"seconds must be between 0 and {MAX_PROFILE_SECONDS}"}, status_code=400)
+    mode = request.query_params.get("mode", "cprofile")
+    if mode not in ("cprofile", "sample"):
+        return JSONResponse({"detail": "mode must be cprofile or sample"}, status_code=400)
+    if _profile_lock.locked():
+        return JSONResponse({"detail": "A profile is already being captured"}, status_code=409)
+
+    async with _profile_lock:
+        if mode == "cprofile":
+            profiler = cProfile.Profile()
+            profiler.enable()
+            try:
+                await asyncio.sleep(seconds)
+            finally:
+                profiler.disable()
+            profiler.create_stats()
+            # The format pstats.Stats reads, as written by Profile.dump_stats
+            body = marshal.dumps(profiler.stats)
+            extension, media_type = "pstats", "application/octet-stream"
+        else:
+            stacks = await asyncio.to_thread(sample_stacks, seconds)
+            body = "".join(f"{stack} {count}\n" for stack, count in stacks.items()).encode()
+            extension, media_type = "folded", "text/plain; charset=utf-8"
+
+    filename = f"profile-{int(time.time())}.{extension}"
+    return Response(body, media_type=media_type, headers={"Content-Disposition": f'attachment; filename="{filename}"'})
+
+def setup_profiling(app, enabled: bool) -> None:
+    """Serve /debug/profile when enabled; it is meant for operators, not the public API."""
+    if enabled:
+        app.add_route("/debug/profile", profile_endpoint, include_in_schema=False)
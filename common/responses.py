@@ -0,0 +1,66 @@
+import hashlib
+import json
+from decimal import Decimal
+from typing import Any, Optional
+
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if hasattr(obj, "to_dict"):
+        return obj.to_dict()
+    if hasattr(obj, "dict"):  # pydantic models
+        return obj.dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def json_dumps(content: Any) -> bytes:
+    """Serialize content to compact UTF-8 JSON, using orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        content,
+        default=_default,
+        ensure_ascii=False,
+        separators=(",", ":")
+    ).encode("utf-8")
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse that skips jsonable_encoder and serializes in one pass.
+
+    FastAPI only bypasses jsonable_encoder when a route returns a Response
+    instance, so hot routes should return this directly instead of a dict.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return json_dumps(content)
+
+class RawJSONResponse(Response):
+    """Response for bodies that were already serialized with json_dumps."""
+
+    media_type = "application/json"
+
+def strong_etag(body: bytes) -> str:
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison, as If-None-Match requires
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return etag in (tag[2:] if tag.startswith("W/") else tag for tag in candidates)
+
+def conditional_json(request: Request, body: bytes, etag: str, cache_control: str) -> Response:
+    """Serialized JSON body with caching headers, or 304 Not Modified if the client's copy is current."""
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return RawJSONResponse(body, headers=headers)
@@ -0,0 +1,102 @@
+import os
+import socket
+import sys
+import urllib.request
+from contextlib import asynccontextmanager
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from blockchain.core.blockchain import RootChain
+from blockchain.core.tracing import tracer
+from common.metrics import register_chain_metrics, request_metrics, setup_metrics
+
+app = FastAPI()
+setup_metrics(app, "metrics_test")
+
+@app.get("/items/{item_id}")
+async def get_item(item_id: int):
+    return {"id": item_id}
+
+client = TestClient(app)
+
+def sample(name, labels=None):
+    return REGISTRY.get_sample_value(name, labels or {})
+
+def test_requests_are_labelled_by_route_template():
+    labels = {"endpoint": "/items/{item_id}", "method": "GET", "status": "200"}
+    before = sample("metrics_test_request_count_total", labels) or 0
+    client.get("/items/1")
+    client.get("/items/2")
+    assert sample("metrics_test_request_count_total", labels) == before + 2
+    assert sample("metrics_test_request_latency_seconds_count", {"endpoint": "/items/{item_id}"}) >= 2
+    assert sample("metrics_test_requests_in_flight") == 0
+
+def test_unmatched_routes_share_one_label():
+    client.get("/missing/a")
+    client.get("/missing/b")
+    labels = {"endpoint": "<unmatched>", "method": "GET", "status": "404"}
+    assert sample("metrics_test_request_count_total", labels) >= 2
+
+def test_metrics_route_is_served():
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert "metrics_test_request_count" in response.text
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def test_metrics_port_is_served_for_the_app_lifetime():
+    events = []
+
+    @asynccontextmanager
+    async def lifespan(app):
+        events.append("startup")
+        yield
+        events.append("shutdown")
+
+    port = free_port()
+    port_app = FastAPI(lifespan=lifespan)
+    setup_metrics(port_app, "metrics_port_test", port=port)
+    url = f"http://127.0.0.1:{port}/metrics"
+    with TestClient(port_app) as port_client:
+        assert events == ["startup"]
+        assert port_client.get("/metrics").status_code == 404
+        with urllib.request.urlopen(url, timeout=5) as response:
+            assert b"metrics_port_test_request_count" in response.read()
+    assert events == ["startup", "shutdown"]
+    with pytest.raises(OSError):
+        urllib.request.urlopen(url, timeout=1)
+
+def test_request_metrics_are_created_once():
+    assert request_metrics("metrics_test") is request_metrics("metrics_test")
+
+def test_chain_gauges():
+    chain = RootChain(network="testnet")
+    chain.difficulty = 1
+    chain.add_transaction("trtc_treasury", "trtc_metrics", 1.0)
+    register_chain_metrics("metrics_test", chain)
+    labels = {"service": "metrics_test", "network": "testnet"}
+    assert sample("rootchain_block_height", labels) == 0
+    assert sample("rootchain_mempool_size", labels) == 1
+    chain.mine_pending_transactions("trtc_miner")
+    assert sample("rootchain_block_height", labels) == 1
+    assert sample("rootchain_mempool_size", labels) == 0
+    assert sample("rootchain_mining_hashrate", labels) > 0
+
+def test_core_spans_are_exported():
+    tracer.enabled = True
+    try:
+        with tracer.span("metrics_test.span"):
+            pass
+        tracer.count("metrics_test.event", 3)
+    finally:
+        tracer.enabled = False
+    assert sample("rootchain_span_calls_total", {"span": "metrics_test.span"}) == 1
+    assert sample("rootchain_span_seconds_total", {"span": "metrics_test.span"}) >= 0
+    assert sample("rootchain_core_events_total", {"event": "metrics_test.event"}) == 3
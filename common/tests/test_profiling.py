@@ -0,0 +1,50 @@
+import marshal
+import os
+import sys
+import threading
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from common.profiling import sample_stacks, setup_profiling
+
+app = FastAPI()
+setup_profiling(app, enabled=True)
+
+def test_cprofile_capture_is_a_pstats_download():
+    client = TestClient(app)
+    response = client.get("/debug/profile?seconds=0.05")
+    assert response.status_code == 200
+    assert response.headers["content-disposition"].startswith('attachment; filename="profile-')
+    assert response.headers["content-disposition"].endswith('.pstats"')
+    stats = marshal.loads(response.content)
+    assert any(name == "sleep" for _, _, name in stats)
+
+def test_sampling_sees_other_threads():
+    stop = threading.Event()
+
+    def busy_worker():
+        while not stop.is_set():
+            sum(range(1000))
+
+    worker = threading.Thread(target=busy_worker)
+    worker.start()
+    try:
+        stacks = sample_stacks(0.05, interval=0.001)
+    finally:
+        stop.set()
+        worker.join()
+    assert any("busy_worker (test_profiling.py" in stack for stack in stacks)
+
+    response = TestClient(app).get("/debug/profile?seconds=0.02&mode=sample")
+    assert response.headers["content-type"].startswith("text/plain")
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in response.text.splitlines())
+
+def test_profile_requests_are_validated():
+    client = TestClient(app)
+    assert client.get("/debug/profile?seconds=0").status_code == 400
+    assert client.get("/debug/profile?seconds=abc").status_code == 400
+    assert client.get("/debug/profile?mode=trace").status_code == 400
+    # Not served unless enabled
+    assert TestClient(FastAPI()).get("/debug/profile").status_code == 404
@@ -0,0 +1,44 @@
+import json
+import os
+import sys
+from decimal import Decimal
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from blockchain.wallet.symbols import ROOT
+from common.responses import FastJSONResponse, RawJSONResponse, json_dumps
+
+def test_json_dumps_handles_decimal_and_symbols():
+    body = json_dumps({"amount": Decimal("1.5"), "symbol": ROOT})
+    assert json.loads(body) == {"amount": 1.5, "symbol": ROOT.to_dict()}
+
+def test_symbol_to_dict_matches_attributes():
+    assert ROOT.to_dict() == vars(ROOT)
+
+def test_fast_json_response_body():
+    response = FastJSONResponse({"a": [1, 2]})
+    assert response.body == b'{"a":[1,2]}'
+    assert response.media_type == "application/json"
+
+def test_raw_json_response_passes_bytes_through():
+    response = RawJSONResponse(b'{"a":1}')
+    assert response.body == b'{"a":1}'
+    assert response.headers["content-type"] == "application/json"
+
+def test_conditional_json_returns_304_for_matching_etag():
+    from starlette.requests import Request
+    from common.responses import conditional_json, etag_matches, strong_etag
+
+    body = b'{"a":1}'
+    etag = strong_etag(body)
+    assert etag_matches(f'W/{etag}, "other"', etag)
+    assert not etag_matches(None, etag)
+
+    def request(headers):
+        return Request({"type": "http", "headers": [(k.encode(), v.encode()) for k, v in headers.items()]})
+
+    response = conditional_json(request({}), body, etag, "no-cache")
+    assert response.status_code == 200 and response.body == body
+    assert response.headers["etag"] == etag
+    response = conditional_json(request({"if-none-match": etag}), body, etag, "no-cache")
+    assert response.status_code == 304 and response.body == b""
+    assert response.headers["cache-control"] == "no-cache"
@@ -1,15 +1,20 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, Response
 from fastapi.requests import Request
 import sys
 sys.path.append('../')
 from blockchain.core.blockchain import RootChain
-from typing import List, Dict, Any
+from common.responses import FastJSONResponse, conditional_json, json_dumps, strong_etag
+from common.metrics import setup_metrics, register_chain_metrics
+from block_store import BlockPayloadStore
+from search_index import SearchIndex, SEARCH_TYPES, hash_of
+from rich_list import RichList
+from typing import List, Dict, Any, Optional
 import os
 
-app = FastAPI()
+app = FastAPI(default_response_class=FastJSONResponse)
 
 # Mount static files
 app.mount("/static", StaticFiles(directory="static"), name="static")
@@ -21,10 +26,50 @@ templates = Jinja2Templates(directory="templates")
 mainnet = RootChain(network="mainnet")
 testnet = RootChain(network="testnet")
 
+setup_metrics(app, "explorer", port=int(os.getenv("METRICS_PORT", "0")))
+register_chain_metrics("explorer", mainnet, testnet)
+
+# Block payloads are serialized once, as blocks are added
+block_stores = {
+    chain.network: BlockPayloadStore(chain, maxsize=int(os.getenv("BLOCK_CACHE_SIZE", "4096")))
+    for chain in (mainnet, testnet)
+}
+
 def get_chain(network: str = "mainnet") -> RootChain:
     """Get the appropriate blockchain instance"""
     return mainnet if network.lower() == "mainnet" else testnet
 
+# Prefix search over hashes and addresses, updated as blocks are added
+search_indexes = {chain.network: SearchIndex(chain) for chain in (mainnet, testnet)}
+
+# Holders ranked by balance, re-ranked only where a block changed balances
+rich_lists = {chain.network: RichList(chain) for chain in (mainnet, testnet)}
+
+def address_network(address: str) -> str:
+    return "mainnet" if address.startswith("rtc") else "testnet"
+
+def get_block_store(network: str = "mainnet") -> BlockPayloadStore:
+    return block_stores[get_chain(network).network]
+
+def get_search_index(network: str = "mainnet") -> SearchIndex:
+    return search_indexes[get_chain(network).network]
+
+def get_rich_list(network: str = "mainnet") -> RichList:
+    return rich_lists[get_chain(network).network]
+
+# Blocks this deep are final, so they and their transactions may be cached forever;
+# newer blocks and the "latest" views are only cached briefly
+CONFIRMATION_DEPTH = int(os.getenv("CONFIRMATION_DEPTH", "6"))
+IMMUTABLE = "public, max-age=31536000, immutable"
+SHORT_LIVED = f"public, max-age={int(os.getenv('LATEST_MAX_AGE', '5'))}"
+
+def block_cache_control(store: BlockPayloadStore, block) -> str:
+    return IMMUTABLE if store.confirmations(block) >= CONFIRMATION_DEPTH else SHORT_LIVED
+
+def short_lived_json(request: Request, content: Any) -> Response:
+    body = json_dumps(content)
+    return conditional_json(request, body, strong_etag(body), SHORT_LIVED)
+
 @app.get("/", response_class=HTMLResponse)
 async def index(request: Request):
     return templates.TemplateResponse("index.html", {
@@ -34,23 +79,47 @@ async def index(request: Request):
     })
 
 @app.get("/api/blocks/latest")
-async def get_latest_blocks(network: str = "mainnet") -> List[Dict[str, Any]]:
-    blockchain = get_chain(network)
-    blocks = []
-    for block in reversed(blockchain.chain[-10:]):  # Get last 10 blocks
-        block_data = block.to_dict()
-        block_data["size"] = len(str(block_data).encode())  # Rough size estimation
-        blocks.append(block_data)
-    return blocks
+async def get_latest_blocks(request: Request, network: str = "mainnet") -> Response:
+    body = get_block_store(network).latest(10)  # Get last 10 blocks
+    return conditional_json(request, body, strong_etag(body), SHORT_LIVED)
+
+@app.get("/api/blocks")
+async def get_blocks_between(
+    request: Request,
+    start: float = Query(..., description="Unix time, inclusive"),
+    end: float = Query(..., description="Unix time, exclusive"),
+    network: str = "mainnet",
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[int] = Query(None, ge=0, description="next_cursor from the previous page")
+) -> Response:
+    """Blocks with start <= timestamp < end, oldest first, a page at a time."""
+    if end < start:
+        raise HTTPException(status_code=400, detail="end must not be before start")
+    store = get_block_store(network)
+    blockchain = store.chain
+    first, last = blockchain.block_range_between(start, end)
+    first = max(first, cursor or 0)
+    page_end = min(last, first + limit)
+    page = blockchain.chain[first:page_end]
+    next_cursor = page_end if page_end < last else None
+    body = (
+        b'{"blocks":[' + b",".join(store.payload(block).body for block in page) +
+        b'],"next_cursor":' + json_dumps(next_cursor) + b"}"
+    )
+    # A page is final once later blocks exist past the range and its blocks are deep enough
+    closed = blockchain.block_timestamps[-1] >= end and (
+        not page or store.confirmations(page[-1]) >= CONFIRMATION_DEPTH
+    )
+    return conditional_json(request, body, strong_etag(body), IMMUTABLE if closed else SHORT_LIVED)
 
 @app.get("/api/transactions/latest")
-async def get_latest_transactions(network: str = "mainnet") -> List[Dict[str, Any]]:
+async def get_latest_transactions(request: Request, network: str = "mainnet") -> Response:
     blockchain = get_chain(network)
     transactions = []
     for block in reversed(blockchain.chain[-10:]):
         for tx in reversed(block.transactions):
             transactions.append({
-                "hash": tx.get("hash", ""),
+                "hash": hash_of(tx),
                 "from": tx["sender"],
                 "to": tx["recipient"],
                 "amount": tx["amount"],
@@ -58,46 +127,115 @@ async def get_latest_transactions(network: str = "mainnet") -> List[Dict[str, An
                 "network": tx["network"]
             })
             if len(transactions) >= 10:  # Get last 10 transactions
-                return transactions
-    return transactions
+                return short_lived_json(request, transactions)
+    return short_lived_json(request, transactions)
 
 @app.get("/api/stats")
-async def get_network_stats(network: str = "mainnet") -> Dict[str, Any]:
+async def get_network_stats(request: Request, network: str = "mainnet") -> Response:
     blockchain = get_chain(network)
-    return blockchain.get_network_info()
+    return short_lived_json(request, blockchain.get_network_info())
 
 @app.get("/api/block/{block_hash}")
-async def get_block(block_hash: str, network: str = "mainnet") -> Dict[str, Any]:
-    blockchain = get_chain(network)
-    block = blockchain.get_block_by_hash(block_hash)
-    if not block:
+async def get_block(request: Request, block_hash: str, network: str = "mainnet") -> Response:
+    store = get_block_store(network)
+    block = store.find(block_hash)
+    if block is None:
         raise HTTPException(status_code=404, detail="Block not found")
-    
-    block_data = block.to_dict()
-    block_data["size"] = len(str(block_data).encode())
-    return block_data
+    payload = store.payload(block)
+    return conditional_json(request, payload.body, payload.etag, block_cache_control(store, block))
 
 @app.get("/api/transaction/{tx_hash}")
-async def get_transaction(tx_hash: str, network: str = "mainnet") -> Dict[str, Any]:
-    blockchain = get_chain(network)
-    for block in blockchain.chain:
-        for tx in block.transactions:
-            if tx.get("hash") == tx_hash and tx.get("network") == network:
-                return {
-                    "hash": tx_hash,
-                    "block_hash": block.hash,
-                    "from": tx["sender"],
-                    "to": tx["recipient"],
-                    "amount": tx["amount"],
-                    "timestamp": tx["timestamp"],
-                    "network": tx["network"]
-                }
-    raise HTTPException(status_code=404, detail="Transaction not found")
+async def get_transaction(request: Request, tx_hash: str, network: str = "mainnet") -> Response:
+    found = get_search_index(network).find_transaction(tx_hash)
+    if found is None or found[1].get("network") != network:
+        raise HTTPException(status_code=404, detail="Transaction not found")
+    block, tx = found
+    body = json_dumps({
+        "hash": tx_hash,
+        "block_hash": block.hash,
+        "from": tx["sender"],
+        "to": tx["recipient"],
+        "amount": tx["amount"],
+        "timestamp": tx["timestamp"],
+        "network": tx["network"]
+    })
+    store = get_block_store(network)
+    return conditional_json(request, body, strong_etag(body), block_cache_control(store, block))
+
+@app.get("/api/search")
+async def search(
+    request: Request,
+    q: str = Query(..., min_length=1),
+    network: str = "mainnet",
+    limit: int = Query(10, ge=1, le=100),
+    types: List[str] = Query(list(SEARCH_TYPES), alias="type")
+) -> Response:
+    """Typeahead search by block hash, transaction hash or address prefix."""
+    unknown = set(types) - set(SEARCH_TYPES)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown search type: {', '.join(sorted(unknown))}")
+    results = get_search_index(network).search(q.strip(), limit=limit, types=types)
+    return short_lived_json(request, {"query": q, "network": get_chain(network).network, "results": results})
+
+@app.get("/api/richlist")
+async def get_top_holders(
+    request: Request,
+    network: str = "mainnet",
+    limit: int = Query(100, ge=1, le=1000),
+    offset: int = Query(0, ge=0)
+) -> Response:
+    rich_list = get_rich_list(network)
+    return short_lived_json(request, {
+        "holders": rich_list.top(limit, offset),
+        "total_holders": len(rich_list.ranking),
+        "network": rich_list.chain.network
+    })
+
+@app.get("/api/richlist/{address}")
+async def get_holder_rank(request: Request, address: str) -> Response:
+    network = address_network(address)
+    rich_list = get_rich_list(network)
+    holder = rich_list.holder(address)
+    if holder is None:
+        raise HTTPException(status_code=404, detail="Address holds no balance")
+    return short_lived_json(request, dict(holder, total_holders=len(rich_list.ranking), network=network))
+
+@app.get("/api/address/{address}/balance")
+async def get_balance_at(request: Request, address: str, height: Optional[int] = Query(None, ge=0)) -> Response:
+    """Balance at a block height, or at the tip if none is given."""
+    blockchain = get_chain(address_network(address))
+    tip = len(blockchain.chain) - 1
+    height = tip if height is None else min(height, tip)
+    return short_lived_json(request, {
+        "address": address,
+        "height": height,
+        "balance": blockchain.balance_at(address, height),
+        "network": blockchain.network
+    })
+
+@app.get("/api/address/{address}/history")
+async def get_balance_history(
+    request: Request,
+    address: str,
+    points: int = Query(200, ge=2, le=2000)
+) -> Response:
+    """Balance timeline for charts, downsampled to at most points entries."""
+    blockchain = get_chain(address_network(address))
+    timestamps = blockchain.block_timestamps
+    series = blockchain.balance_history.timeline(address, points, len(blockchain.chain) - 1)
+    return short_lived_json(request, {
+        "address": address,
+        "network": blockchain.network,
+        "history": [
+            {"height": height, "timestamp": timestamps[height], "balance": balance}
+            for height, balance in series
+        ]
+    })
 
 @app.get("/api/address/{address}")
-async def get_address_info(address: str) -> Dict[str, Any]:
+async def get_address_info(address: str) -> FastJSONResponse:
     # Determine network from address prefix
-    network = "mainnet" if address.startswith("rtc") else "testnet"
+    network = address_network(address)
     blockchain = get_chain(network)
     
     if not blockchain.prefix in address:
@@ -106,12 +244,12 @@ async def get_address_info(address: str) -> Dict[str, Any]:
     balance = blockchain.get_balance(address)
     transactions = blockchain.get_transactions_by_address(address)
     
-    return {
+    return FastJSONResponse({
         "address": address,
         "balance": balance,
         "transactions": transactions,
         "network": network
-    }
+    })
 
 if __name__ == "__main__":
     import uvicorn
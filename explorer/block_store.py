@@ -0,0 +1,78 @@
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from blockchain.core.block import Block
+from blockchain.core.blockchain import RootChain
+from common.responses import json_dumps, strong_etag
+
+def serialize_block(block: Block) -> bytes:
+    """JSON payload of a block, with its exact serialized size in bytes."""
+    body = json_dumps(block.to_dict())
+    # Splice the size in rather than serializing the block twice
+    return body[:-1] + b',"size":' + str(len(body)).encode() + b"}"
+
+class BlockPayload:
+    __slots__ = ("body", "etag")
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self.etag = strong_etag(body)
+
+class BlockPayloadStore:
+    """
+    Pre-serialized JSON payloads for a chain's blocks
+
+    Blocks never change once added, so each payload and its ETag are built
+    once, when the chain appends the block, and kept in a bounded LRU. Cold
+    blocks evicted from it are serialized again on their next request. A
+    hash index finds blocks without scanning the chain.
+    """
+
+    def __init__(self, chain: RootChain, maxsize: int = 4096):
+        self.chain = chain
+        self.maxsize = maxsize
+        self.payloads: "OrderedDict[str, BlockPayload]" = OrderedDict()
+        self.positions: Dict[str, int] = {}
+        for block in chain.chain:
+            self.add(block)
+        chain.block_listeners.append(self.add)
+
+    def add(self, block: Block) -> None:
+        self.positions[block.hash] = block.index
+        self._put(block.hash, BlockPayload(serialize_block(block)))
+
+    def _put(self, block_hash: str, payload: BlockPayload) -> BlockPayload:
+        self.payloads[block_hash] = payload
+        self.payloads.move_to_end(block_hash)
+        if len(self.payloads) > self.maxsize:
+            self.payloads.popitem(last=False)
+        return payload
+
+    def find(self, block_hash: str) -> Optional[Block]:
+        index = self.positions.get(block_hash)
+        # The chain may have been replaced since the block was indexed
+        if index is not None and index < len(self.chain.chain):
+            block = self.chain.chain[index]
+            if block.hash == block_hash:
+                return block
+        return None
+
+    def payload(self, block: Block) -> BlockPayload:
+        payload = self.payloads.get(block.hash)
+        if payload is None:
+            return self._put(block.hash, BlockPayload(serialize_block(block)))
+        self.payloads.move_to_end(block.hash)
+        return payload
+
+    def get(self, block_hash: str) -> Optional[BlockPayload]:
+        block = self.find(block_hash)
+        return self.payload(block) if block else None
+
+    def confirmations(self, block: Block) -> int:
+        """Blocks on top of this one, counting itself, as in Bitcoin."""
+        return len(self.chain.chain) - block.index
+
+    def latest(self, count: int) -> bytes:
+        """JSON array of the newest count blocks, newest first."""
+        blocks = self.chain.chain[-count:]
+        return b"[" + b",".join(self.payload(block).body for block in reversed(blocks)) + b"]"
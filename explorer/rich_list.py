@@ -0,0 +1,130 @@
+from bisect import bisect_left, insort
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from blockchain.core.block import Block
+from blockchain.core.blockchain import RootChain
+
+# Ordered largest balance first, ties broken by address
+RankKey = Tuple[float, str]
+
+class RankedBalances:
+    """
+    Addresses ordered by balance, with rank lookups
+
+    A bucketed sorted list: keys live in sorted buckets of roughly
+    bucket_size entries, with each bucket's last key in a separate list to
+    bisect. Updating an address costs O(log n + bucket_size) and finding
+    its rank O(log n + n / bucket_size), which stays well under a
+    millisecond with millions of addresses.
+    """
+
+    def __init__(self, bucket_size: int = 1000):
+        self.bucket_size = bucket_size
+        self.buckets: List[List[RankKey]] = []
+        self.maxes: List[RankKey] = []
+        self.balances: Dict[str, float] = {}
+
+    def __len__(self) -> int:
+        return len(self.balances)
+
+    def load(self, balances: Dict[str, float]) -> None:
+        """Replace every entry, sorting once instead of inserting one by one."""
+        self.balances = {address: balance for address, balance in balances.items() if balance > 0}
+        keys = sorted((-balance, address) for address, balance in self.balances.items())
+        self.buckets = [keys[i:i + self.bucket_size] for i in range(0, len(keys), self.bucket_size)]
+        self.maxes = [bucket[-1] for bucket in self.buckets]
+
+    def update(self, address: str, balance: float) -> None:
+        old = self.balances.pop(address, None)
+        if old is not None:
+            self._remove((-old, address))
+        if balance > 0:
+            self.balances[address] = balance
+            self._insert((-balance, address))
+
+    def _insert(self, key: RankKey) -> None:
+        if not self.buckets:
+            self.buckets.append([key])
+            self.maxes.append(key)
+            return
+        i = min(bisect_left(self.maxes, key), len(self.buckets) - 1)
+        bucket = self.buckets[i]
+        insort(bucket, key)
+        self.maxes[i] = bucket[-1]
+        if len(bucket) > 2 * self.bucket_size:
+            half = len(bucket) // 2
+            self.buckets.insert(i + 1, bucket[half:])
+            del bucket[half:]
+            self.maxes[i] = bucket[-1]
+            self.maxes.insert(i + 1, self.buckets[i + 1][-1])
+
+    def _remove(self, key: RankKey) -> None:
+        i = bisect_left(self.maxes, key)
+        bucket = self.buckets[i]
+        del bucket[bisect_left(bucket, key)]
+        if bucket:
+            self.maxes[i] = bucket[-1]
+        else:
+            del self.buckets[i]
+            del self.maxes[i]
+
+    def rank(self, address: str) -> Optional[int]:
+        """1-based position of an address, or None if it holds nothing."""
+        balance = self.balances.get(address)
+        if balance is None:
+            return None
+        key = (-balance, address)
+        i = bisect_left(self.maxes, key)
+        return sum(map(len, self.buckets[:i])) + bisect_left(self.buckets[i], key) + 1
+
+    def top(self, limit: int, offset: int = 0) -> Iterator[Tuple[int, str, float]]:
+        """(rank, address, balance) for up to limit holders after the first offset."""
+        rank = 0
+        for bucket in self.buckets:
+            if rank + len(bucket) <= offset:
+                rank += len(bucket)
+                continue
+            for negated, address in bucket[max(0, offset - rank):]:
+                rank = max(rank, offset) + 1
+                if rank > offset + limit:
+                    return
+                yield rank, address, -negated
+
+class RichList:
+    """
+    Largest holders of a chain, kept current from each block's balance changes
+
+    Only addresses touched by a block are re-ranked when it is added, so
+    serving the top holders or one address's rank never sorts all balances.
+    """
+
+    def __init__(self, chain: RootChain, bucket_size: int = 1000):
+        self.chain = chain
+        self.ranking = RankedBalances(bucket_size)
+        self.ranking.load(chain.balances)
+        chain.block_listeners.append(self.add_block)
+
+    def add_block(self, block: Block) -> None:
+        if block.index == 0:
+            # A new genesis block means the chain was replaced
+            self.ranking.load(self.chain.balances)
+            return
+        touched = set()
+        for tx in block.transactions:
+            if tx["sender"] != "0x0":
+                touched.add(tx["sender"])
+            touched.add(tx["recipient"])
+        for address in touched:
+            self.ranking.update(address, self.chain.get_balance(address))
+
+    def top(self, limit: int = 100, offset: int = 0) -> List[Dict]:
+        return [
+            {"rank": rank, "address": address, "balance": balance}
+            for rank, address, balance in self.ranking.top(limit, offset)
+        ]
+
+    def holder(self, address: str) -> Optional[Dict]:
+        rank = self.ranking.rank(address)
+        if rank is None:
+            return None
+        return {"rank": rank, "address": address, "balance": self.ranking.balances[address]}
@@ -0,0 +1,239 @@
+import hashlib
+import heapq
+import json
+from array import array
+from bisect import bisect_left, insort
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from blockchain.core.block import Block
+from blockchain.core.blockchain import RootChain
+
+# Transaction positions are packed below the block index in one integer
+TX_POSITION_BITS = 24
+SEARCH_TYPES = ("block", "transaction", "address")
+
+Entry = Tuple[bytes, int]
+
+class SortedSegment:
+    """
+    Immutable sorted run of index entries
+
+    Keys are packed back to back in one bytes buffer with their offsets and
+    values in typed arrays, so an entry costs its key length plus 16 bytes
+    instead of a tuple, a str and an int object each.
+    """
+
+    __slots__ = ("blob", "offsets", "values")
+
+    def __init__(self, entries: Iterable[Entry]):
+        blob = bytearray()
+        self.offsets = array("Q", [0])
+        self.values = array("q")
+        add_offset, add_value = self.offsets.append, self.values.append
+        for key, value in entries:
+            blob += key
+            add_offset(len(blob))
+            add_value(value)
+        self.blob = bytes(blob)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def key(self, i: int) -> bytes:
+        return self.blob[self.offsets[i]:self.offsets[i + 1]]
+
+    def lower_bound(self, prefix: bytes) -> int:
+        lo, hi = 0, len(self.values)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.key(mid) < prefix:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def scan(self, prefix: bytes) -> Iterator[Entry]:
+        i = self.lower_bound(prefix)
+        while i < len(self.values):
+            key = self.key(i)
+            if not key.startswith(prefix):
+                return
+            yield key, self.values[i]
+            i += 1
+
+    def __iter__(self) -> Iterator[Entry]:
+        # Slices the buffer in C; merges iterate whole segments
+        keys = map(self.blob.__getitem__, map(slice, self.offsets, self.offsets[1:]))
+        return zip(keys, self.values)
+
+def _unique(entries: Iterable[Entry]) -> Iterator[Entry]:
+    previous = None
+    for entry in entries:
+        if entry[0] != previous:
+            previous = entry[0]
+            yield entry
+
+class PrefixIndex:
+    """
+    Sorted, incrementally built index answering prefix queries
+
+    New entries go to a small sorted buffer. When it fills up it is frozen
+    into a SortedSegment, and segments of similar size are merged, so there
+    are O(log n) segments and each entry is rewritten O(log n) times. A query
+    binary-searches every segment and merges their matches lazily, which is
+    O(log^2 n + k) for k results.
+
+    With key_length set only that many leading bytes of each key are stored;
+    callers resolve the value to the full key and filter longer prefixes.
+    With unique set, repeated keys are stored once.
+    """
+
+    def __init__(self, key_length: Optional[int] = None, unique: bool = False, buffer_size: int = 4096):
+        self.key_length = key_length
+        self.unique = unique
+        self.buffer_size = buffer_size
+        self.segments: List[SortedSegment] = []
+        self.buffer: List[Entry] = []
+
+    def __len__(self) -> int:
+        return sum(len(segment) for segment in self.segments) + len(self.buffer)
+
+    def _encode(self, key: str) -> bytes:
+        return key.encode()[:self.key_length]
+
+    def add(self, key: str, value: int = 0) -> None:
+        entry = (self._encode(key), value)
+        if self.unique:
+            i = bisect_left(self.buffer, (entry[0],))
+            if i < len(self.buffer) and self.buffer[i][0] == entry[0]:
+                return
+        insort(self.buffer, entry)
+        if len(self.buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self.buffer:
+            return
+        self.segments.append(SortedSegment(self.buffer))
+        self.buffer = []
+        while len(self.segments) > 1 and len(self.segments[-2]) <= 2 * len(self.segments[-1]):
+            newer = self.segments.pop()
+            older = self.segments.pop()
+            merged = heapq.merge(older, newer)
+            self.segments.append(SortedSegment(_unique(merged) if self.unique else merged))
+
+    def search(self, prefix: str) -> Iterator[Entry]:
+        """Entries whose stored key starts with prefix (truncated to key_length), in key order."""
+        encoded = self._encode(prefix)
+        start = bisect_left(self.buffer, (encoded,))
+        buffered = (self.buffer[i] for i in range(start, len(self.buffer)))
+        runs = [segment.scan(encoded) for segment in self.segments]
+        merged = heapq.merge(*runs, _takewhile_prefix(buffered, encoded))
+        return _unique(merged) if self.unique else merged
+
+    def clear(self) -> None:
+        self.segments = []
+        self.buffer = []
+
+def _takewhile_prefix(entries: Iterator[Entry], prefix: bytes) -> Iterator[Entry]:
+    for entry in entries:
+        if not entry[0].startswith(prefix):
+            return
+        yield entry
+
+def transaction_hash(tx: Dict[str, Any]) -> str:
+    """SHA-256 of a transaction's canonical JSON, leaving out any hash it already carries."""
+    fields = {key: value for key, value in tx.items() if key != "hash"}
+    return hashlib.sha256(json.dumps(fields, sort_keys=True, separators=(",", ":")).encode()).hexdigest()
+
+def hash_of(tx: Dict[str, Any]) -> str:
+    """
+    A transaction's hash for lookups
+
+    Core transactions carry no id, so the explorer derives one as it
+    indexes each block; one supplied by the submitter is used as is.
+    """
+    return tx.get("hash") or transaction_hash(tx)
+
+class SearchIndex:
+    """
+    Prefix and typeahead search over a chain's block hashes, transaction
+    hashes and addresses
+
+    The index follows the chain through its block listeners. Hashes are
+    stored truncated to hash_key_length characters with a pointer back into
+    the chain, which keeps memory near 32 bytes per entry; results are
+    resolved and checked against the chain itself.
+    """
+
+    def __init__(self, chain: RootChain, hash_key_length: int = 16, buffer_size: int = 4096):
+        self.chain = chain
+        self.blocks = PrefixIndex(key_length=hash_key_length, buffer_size=buffer_size)
+        self.transactions = PrefixIndex(key_length=hash_key_length, buffer_size=buffer_size)
+        self.addresses = PrefixIndex(unique=True, buffer_size=buffer_size)
+        for block in chain.chain:
+            self.add_block(block)
+        chain.block_listeners.append(self.add_block)
+
+    def add_block(self, block: Block) -> None:
+        if block.index == 0:
+            # A new genesis block means the chain was replaced
+            self.blocks.clear()
+            self.transactions.clear()
+            self.addresses.clear()
+        self.blocks.add(block.hash, block.index)
+        for position, tx in enumerate(block.transactions):
+            self.transactions.add(hash_of(tx), block.index << TX_POSITION_BITS | position)
+            for address in (tx["sender"], tx["recipient"]):
+                if address != "0x0":
+                    self.addresses.add(address)
+
+    def _block_at(self, index: int) -> Optional[Block]:
+        return self.chain.chain[index] if index < len(self.chain.chain) else None
+
+    def _blocks(self, prefix: str) -> Iterator[Dict[str, Any]]:
+        for _, index in self.blocks.search(prefix):
+            block = self._block_at(index)
+            if block is not None and block.hash.startswith(prefix):
+                yield {"type": "block", "hash": block.hash, "index": block.index}
+
+    def _transactions(self, prefix: str) -> Iterator[Tuple[Block, Dict[str, Any]]]:
+        for _, value in self.transactions.search(prefix):
+            block = self._block_at(value >> TX_POSITION_BITS)
+            position = value & ((1 << TX_POSITION_BITS) - 1)
+            if block is not None and position < len(block.transactions):
+                tx = block.transactions[position]
+                if hash_of(tx).startswith(prefix):
+                    yield block, tx
+
+    def _addresses(self, prefix: str) -> Iterator[Dict[str, Any]]:
+        for key, _ in self.addresses.search(prefix):
+            yield {"type": "address", "address": key.decode()}
+
+    def find_transaction(self, tx_hash: str) -> Optional[Tuple[Block, Dict[str, Any]]]:
+        for block, tx in self._transactions(tx_hash):
+            if hash_of(tx) == tx_hash:
+                return block, tx
+        return None
+
+    def search(self, query: str, limit: int = 10, types: Iterable[str] = SEARCH_TYPES) -> List[Dict[str, Any]]:
+        """Up to limit typed matches for a prefix, blocks first, then transactions, then addresses."""
+        results: List[Dict[str, Any]] = []
+        if not query:
+            return results
+        runs = {
+            "block": lambda: self._blocks(query),
+            "transaction": lambda: (
+                {"type": "transaction", "hash": hash_of(tx), "block_hash": block.hash, "block_index": block.index}
+                for block, tx in self._transactions(query)
+            ),
+            "address": lambda: self._addresses(query)
+        }
+        for kind in SEARCH_TYPES:
+            if kind not in types:
+                continue
+            for result in runs[kind]():
+                if len(results) >= limit:
+                    return results
+                results.append(result)
+        return results
@@ -259,8 +259,10 @@ async function loadAddress() {
         elements.validatorStatus.textContent = data.is_validator ? 'Active Validator' : 'Not a Validator';
         elements.delegationCount.textContent = data.delegation_count.toLocaleString();
         
-        // Initialize charts
-        initializeCharts(data.balance_history, data.activity_history);
+        // Initialize charts from the downsampled balance timeline
+        const historyResponse = await fetchWithTimeout(`/api/address/${state.address}/history?points=200`);
+        const history = historyResponse.ok ? (await historyResponse.json()).history : [];
+        initializeCharts(history, data.activity_history || []);
         
         // Load initial transactions
         await loadTransactions(true);
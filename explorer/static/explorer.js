@@ -38,7 +38,8 @@ const elements = {
     latestBlocks: document.getElementById('latest-blocks'),
     latestTransactions: document.getElementById('latest-transactions'),
     searchForm: document.getElementById('search-form'),
-    searchInput: document.getElementById('search-input')
+    searchInput: document.getElementById('search-input'),
+    searchSuggestions: document.getElementById('search-suggestions')
 };
 
 // Network switching
@@ -54,6 +55,19 @@ Object.entries(elements.networkBadges).forEach(([network, button]) => {
 });
 
 // Search functionality
+const SEARCH_PAGES = {
+    block: result => `/block/${encodeURIComponent(result.hash)}`,
+    transaction: result => `/transaction/${encodeURIComponent(result.hash)}`,
+    address: result => `/address/${encodeURIComponent(result.address)}`
+};
+
+async function searchExplorer(query, limit) {
+    const params = new URLSearchParams({ q: query, network: state.network, limit });
+    const response = await fetchWithTimeout(`/api/search?${params}`);
+    if (!response.ok) throw new Error('Search failed');
+    return (await response.json()).results;
+}
+
 elements.searchForm?.addEventListener('submit', async (e) => {
     e.preventDefault();
     const query = elements.searchInput?.value.trim();
@@ -61,41 +75,9 @@ elements.searchForm?.addEventListener('submit', async (e) => {
 
     try {
         state.isLoading = true;
-        
-        // Try to determine query type
-        let endpoint;
-        if (query.startsWith('rtc_') || query.startsWith('trtc_')) {
-            endpoint = `/api/address/${query}`;
-        } else if (query.length === 64) {  // Assuming 32-byte hash
-            // Try both block and transaction endpoints
-            try {
-                const blockResponse = await fetchWithTimeout(`/api/block/${query}?network=${state.network}`);
-                if (blockResponse.ok) {
-                    window.location.href = `/block/${encodeURIComponent(query)}`;
-                    return;
-                }
-            } catch (error) {
-                console.error('Block search failed:', error);
-            }
-            
-            endpoint = `/api/transaction/${query}`;
-        } else {
-            throw new Error('Invalid search query');
-        }
-        
-        const response = await fetchWithTimeout(endpoint);
-        if (!response.ok) throw new Error('Not found');
-        
-        const data = await response.json();
-        
-        // Redirect based on result type
-        if ('balance' in data) {
-            window.location.href = `/address/${encodeURIComponent(query)}`;
-        } else if ('transactions' in data) {
-            window.location.href = `/block/${encodeURIComponent(query)}`;
-        } else {
-            window.location.href = `/transaction/${encodeURIComponent(query)}`;
-        }
+        const [result] = await searchExplorer(query, 1);
+        if (!result) throw new Error('Not found');
+        window.location.href = SEARCH_PAGES[result.type](result);
     } catch (error) {
         console.error('Search error:', error);
         showNotification('No results found', 'error');
@@ -104,6 +86,27 @@ elements.searchForm?.addEventListener('submit', async (e) => {
     }
 });
 
+// Typeahead suggestions while typing
+let suggestionTimer = null;
+elements.searchInput?.addEventListener('input', () => {
+    clearTimeout(suggestionTimer);
+    const query = elements.searchInput.value.trim();
+    if (query.length < 2 || !elements.searchSuggestions) return;
+    suggestionTimer = setTimeout(async () => {
+        try {
+            const results = await searchExplorer(query, 8);
+            elements.searchSuggestions.replaceChildren(...results.map(result => {
+                const option = document.createElement('option');
+                option.value = result.hash || result.address;
+                option.label = result.type;
+                return option;
+            }));
+        } catch (error) {
+            console.error('Suggestion error:', error);
+        }
+    }, 150);
+});
+
 // Chart state
 const charts = {
     hashrate: null,
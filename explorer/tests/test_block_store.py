@@ -0,0 +1,74 @@
+import importlib.util
+import json
+import os
+import sys
+
+EXPLORER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.dirname(EXPLORER_DIR))
+
+from blockchain.core.blockchain import RootChain
+from blockchain.synthetic import generate_blocks
+from common.responses import json_dumps
+
+def load_explorer_module(name: str, filename: str):
+    # Loaded by path: the explorer directory is kept off sys.path so that
+    # other services' "app" modules still resolve
+    if name not in sys.modules:
+        spec = importlib.util.spec_from_file_location(name, os.path.join(EXPLORER_DIR, filename))
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        spec.loader.exec_module(module)
+    return sys.modules[name]
+
+block_store = load_explorer_module("block_store", "block_store.py")
+BlockPayloadStore = block_store.BlockPayloadStore
+serialize_block = block_store.serialize_block
+
+def mined_chain(blocks: int = 3) -> RootChain:
+    chain = RootChain(network="testnet")
+    chain.difficulty = 1
+    for i in range(blocks):
+        chain.add_transaction("0x0", f"{chain.prefix}_miner", 1.0)
+        chain.mine_pending_transactions(f"{chain.prefix}_miner")
+    return chain
+
+def test_payload_carries_exact_size():
+    block = mined_chain(1).chain[-1]
+    payload = json.loads(serialize_block(block))
+    assert payload.pop("size") == len(json_dumps(block.to_dict()))
+    assert payload == json.loads(json_dumps(block.to_dict()))
+
+def test_blocks_are_serialized_when_added():
+    chain = mined_chain(2)
+    store = BlockPayloadStore(chain)
+    assert set(store.payloads) == {block.hash for block in chain.chain}
+
+    chain.add_transaction("0x0", f"{chain.prefix}_miner", 1.0)
+    chain.mine_pending_transactions(f"{chain.prefix}_miner")
+    latest = chain.get_latest_block()
+    assert latest.hash in store.payloads
+    assert store.get(latest.hash).body == serialize_block(latest)
+    assert store.get("missing") is None
+
+def test_cold_blocks_are_evicted_and_rebuilt():
+    chain = mined_chain(4)
+    store = BlockPayloadStore(chain, maxsize=2)
+    assert len(store.payloads) == 2
+    genesis = chain.chain[0]
+    assert genesis.hash not in store.payloads
+    assert store.get(genesis.hash).body == serialize_block(genesis)
+    assert len(store.payloads) == 2
+
+def test_latest_is_newest_first():
+    chain = mined_chain(4)
+    store = BlockPayloadStore(chain)
+    latest = json.loads(store.latest(3))
+    assert [block["index"] for block in latest] == [4, 3, 2]
+
+def test_replaced_chain_is_reindexed():
+    chain = mined_chain(2)
+    store = BlockPayloadStore(chain)
+    old_hashes = [block.hash for block in chain.chain]
+    chain.load_blocks(generate_blocks(chain.network, blocks=3, transactions=30, addresses=10, seed=1))
+    assert all(store.get(block_hash) is None for block_hash in old_hashes)
+    assert all(store.get(block.hash).body == serialize_block(block) for block in chain.chain)
@@ -0,0 +1,100 @@
+import importlib.util
+import os
+import sys
+
+EXPLORER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.dirname(EXPLORER_DIR))
+import pytest
+from fastapi.testclient import TestClient
+
+def load_explorer_module(name: str, filename: str):
+    # Loaded by path: the explorer directory is kept off sys.path so that
+    # other services' "app" modules still resolve
+    if name not in sys.modules:
+        spec = importlib.util.spec_from_file_location(name, os.path.join(EXPLORER_DIR, filename))
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        spec.loader.exec_module(module)
+    return sys.modules[name]
+
+@pytest.fixture
+def explorer(monkeypatch):
+    monkeypatch.chdir(EXPLORER_DIR)
+    # Only for the app's own imports; the path is restored after the test
+    monkeypatch.syspath_prepend(EXPLORER_DIR)
+    module = load_explorer_module("explorer_app", "app.py")
+    chain = module.testnet
+    chain.difficulty = 1
+    while len(chain.chain) < module.CONFIRMATION_DEPTH + 2:
+        chain.add_transaction("0x0", f"{chain.prefix}_miner", 1.0)
+        chain.mine_pending_transactions(f"{chain.prefix}_miner")
+    return module, TestClient(module.app)
+
+def test_deep_blocks_are_immutable(explorer):
+    module, client = explorer
+    block = module.testnet.chain[0]
+    response = client.get(f"/api/block/{block.hash}", params={"network": "testnet"})
+    assert response.status_code == 200
+    assert response.headers["cache-control"] == module.IMMUTABLE
+    assert response.headers["etag"] == module.block_stores["testnet"].get(block.hash).etag
+
+    revalidated = client.get(
+        f"/api/block/{block.hash}",
+        params={"network": "testnet"},
+        headers={"If-None-Match": response.headers["etag"]}
+    )
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+    assert revalidated.headers["etag"] == response.headers["etag"]
+
+def test_recent_blocks_are_short_lived(explorer):
+    module, client = explorer
+    block = module.testnet.get_latest_block()
+    response = client.get(f"/api/block/{block.hash}", params={"network": "testnet"})
+    assert response.headers["cache-control"] == module.SHORT_LIVED
+
+def test_confirmed_transactions_are_immutable(explorer):
+    module, client = explorer
+    tx_hash = module.hash_of(module.testnet.chain[1].transactions[0])
+    response = client.get(f"/api/transaction/{tx_hash}", params={"network": "testnet"})
+    assert response.status_code == 200
+    assert response.json()["block_hash"] == module.testnet.chain[1].hash
+    assert response.headers["cache-control"] == module.IMMUTABLE
+
+def test_latest_views_revalidate(explorer):
+    module, client = explorer
+    for path in ("/api/blocks/latest", "/api/transactions/latest", "/api/stats"):
+        response = client.get(path, params={"network": "testnet"})
+        assert response.headers["cache-control"] == module.SHORT_LIVED
+        etag = response.headers["etag"]
+        assert client.get(path, params={"network": "testnet"}, headers={"If-None-Match": etag}).status_code == 304
+
+    chain = module.testnet
+    chain.add_transaction("0x0", f"{chain.prefix}_miner", 1.0)
+    chain.mine_pending_transactions(f"{chain.prefix}_miner")
+    response = client.get("/api/blocks/latest", params={"network": "testnet"}, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+
+def test_missing_block_is_not_cached(explorer):
+    _, client = explorer
+    response = client.get("/api/block/missing")
+    assert response.status_code == 404
+    assert "cache-control" not in response.headers
+
+def test_block_time_range_pages(explorer):
+    module, client = explorer
+    chain = module.testnet
+    start, end = chain.chain[0].timestamp, chain.chain[3].timestamp
+    params = {"network": "testnet", "start": start, "end": end, "limit": 2}
+
+    first = client.get("/api/blocks", params=params).json()
+    assert [block["index"] for block in first["blocks"]] == [0, 1]
+    second = client.get("/api/blocks", params={**params, "cursor": first["next_cursor"]}).json()
+    assert [block["index"] for block in second["blocks"]] == [2]
+    assert second["next_cursor"] is None
+
+    response = client.get("/api/blocks", params={**params, "cursor": first["next_cursor"]})
+    assert response.headers["cache-control"] == module.IMMUTABLE
+    open_range = client.get("/api/blocks", params={**params, "end": end + 1e9})
+    assert open_range.headers["cache-control"] == module.SHORT_LIVED
+    assert client.get("/api/blocks", params={**params, "end": start - 1}).status_code == 400
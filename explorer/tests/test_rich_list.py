@@ -0,0 +1,98 @@
+import importlib.util
+import os
+import random
+import sys
+
+EXPLORER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.dirname(EXPLORER_DIR))
+
+from blockchain.synthetic import generate_blocks, generate_chain
+
+def load_explorer_module(name: str, filename: str):
+    # Loaded by path: the explorer directory is kept off sys.path so that
+    # other services' "app" modules still resolve
+    if name not in sys.modules:
+        spec = importlib.util.spec_from_file_location(name, os.path.join(EXPLORER_DIR, filename))
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        spec.loader.exec_module(module)
+    return sys.modules[name]
+
+rich_list = load_explorer_module("rich_list", "rich_list.py")
+RankedBalances = rich_list.RankedBalances
+RichList = rich_list.RichList
+
+def expected_order(balances):
+    return sorted(((address, balance) for address, balance in balances.items() if balance > 0),
+                  key=lambda item: (-item[1], item[0]))
+
+def test_ranking_matches_a_full_sort_under_random_updates():
+    rng = random.Random(5)
+    ranking = RankedBalances(bucket_size=8)
+    balances = {}
+    for _ in range(3000):
+        address = f"rtc_{rng.randrange(300):03d}"
+        balance = rng.choice([0.0, round(rng.uniform(0, 100), 2), float(rng.randrange(5))])
+        ranking.update(address, balance)
+        balances[address] = balance
+
+    order = expected_order(balances)
+    assert len(ranking) == len(order)
+    assert [(address, balance) for _, address, balance in ranking.top(len(order))] == order
+    assert [address for _, address, _ in ranking.top(5, offset=10)] == [address for address, _ in order[10:15]]
+    for position, (address, _) in enumerate(order, start=1):
+        assert ranking.rank(address) == position
+    assert all(len(bucket) <= 16 for bucket in ranking.buckets)
+
+def test_rich_list_follows_blocks_and_replaced_chains():
+    chain = generate_chain("testnet", blocks=10, transactions=500, addresses=50)
+    holders = RichList(chain, bucket_size=4)
+    chain.load_blocks(generate_blocks("testnet", blocks=20, transactions=800, addresses=60, seed=9))
+
+    order = expected_order(chain.balances)
+    assert [(h["address"], h["balance"]) for h in holders.top(len(order))] == order
+    assert holders.top(1)[0] == {"rank": 1, "address": order[0][0], "balance": order[0][1]}
+    address, balance = order[7]
+    assert holders.holder(address) == {"rank": 8, "address": address, "balance": balance}
+    assert holders.holder(f"{chain.prefix}_nobody") is None
+
+    chain.difficulty = 1
+    chain.add_transaction(order[0][0], f"{chain.prefix}_newcomer", order[0][1])
+    chain.mine_pending_transactions(f"{chain.prefix}_miner")
+    assert holders.holder(order[0][0]) is None
+    assert holders.top(1)[0]["address"] == f"{chain.prefix}_newcomer"
+    assert expected_order(chain.balances) == [(h["address"], h["balance"]) for h in holders.top(1000)]
+
+def test_rich_list_endpoints(monkeypatch):
+    from fastapi.testclient import TestClient
+
+    monkeypatch.chdir(EXPLORER_DIR)
+    # Only for the app's own imports; the path is restored after the test
+    monkeypatch.syspath_prepend(EXPLORER_DIR)
+    explorer = load_explorer_module("explorer_app", "app.py")
+    client = TestClient(explorer.app)
+
+    response = client.get("/api/richlist", params={"limit": 1})
+    assert response.status_code == 200
+    top = response.json()
+    assert top["holders"][0]["address"] == "rtc_treasury"
+    assert top["total_holders"] == len(explorer.rich_lists["mainnet"].ranking)
+
+    response = client.get("/api/richlist/rtc_treasury")
+    assert response.json()["rank"] == 1
+    assert client.get("/api/richlist/rtc_nobody").status_code == 404
+
+def test_balance_history_endpoints(monkeypatch):
+    from fastapi.testclient import TestClient
+
+    monkeypatch.chdir(EXPLORER_DIR)
+    monkeypatch.syspath_prepend(EXPLORER_DIR)
+    explorer = load_explorer_module("explorer_app", "app.py")
+    client = TestClient(explorer.app)
+    supply = explorer.mainnet.total_supply
+
+    response = client.get("/api/address/rtc_treasury/balance", params={"height": 0})
+    assert response.json()["balance"] == supply
+    history = client.get("/api/address/rtc_treasury/history").json()["history"]
+    assert history[0] == {"height": 0, "timestamp": explorer.mainnet.chain[0].timestamp, "balance": supply}
+    assert client.get("/api/address/rtc_nobody/history").json()["history"] == []
@@ -0,0 +1,136 @@
+import importlib.util
+import os
+import random
+import sys
+
+EXPLORER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.dirname(EXPLORER_DIR))
+
+from blockchain.core.blockchain import RootChain
+from blockchain.synthetic import generate_blocks
+
+def load_explorer_module(name: str, filename: str):
+    # Loaded by path: the explorer directory is kept off sys.path so that
+    # other services' "app" modules still resolve
+    if name not in sys.modules:
+        spec = importlib.util.spec_from_file_location(name, os.path.join(EXPLORER_DIR, filename))
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        spec.loader.exec_module(module)
+    return sys.modules[name]
+
+search_index = load_explorer_module("search_index", "search_index.py")
+PrefixIndex = search_index.PrefixIndex
+SearchIndex = search_index.SearchIndex
+hash_of = search_index.hash_of
+
+def transfer_chain(blocks: int = 5, txs_per_block: int = 4) -> RootChain:
+    chain = RootChain(network="testnet")
+    chain.difficulty = 1
+    for b in range(blocks):
+        for t in range(txs_per_block):
+            assert chain.add_transaction(f"{chain.prefix}_treasury", f"{chain.prefix}_user{t}", 1.0 + b)
+        chain.mine_pending_transactions(f"{chain.prefix}_miner")
+    return chain
+
+def test_prefix_index_matches_sorted_scan():
+    rng = random.Random(7)
+    keys = [f"{rng.getrandbits(32):08x}" for _ in range(5000)]
+    index = PrefixIndex(buffer_size=64)
+    for i, key in enumerate(keys):
+        index.add(key, i)
+    assert len(index) == len(keys)
+    # Size-tiered merging keeps the number of segments logarithmic
+    assert len(index.segments) <= 2 * (len(keys) // 64).bit_length()
+
+    for prefix in ("a", "3f", "00", "ffff", keys[123][:5]):
+        expected = sorted((key.encode(), i) for i, key in enumerate(keys) if key.startswith(prefix))
+        assert list(index.search(prefix)) == expected
+
+def test_unique_index_stores_keys_once():
+    index = PrefixIndex(unique=True, buffer_size=8)
+    for i in range(200):
+        index.add(f"rtc_{i % 20:03d}")
+    assert [key for key, _ in index.search("rtc_")] == [f"rtc_{i:03d}".encode() for i in range(20)]
+    assert len(index) < 200
+
+def test_truncated_keys_resolve_long_prefixes():
+    index = PrefixIndex(key_length=4)
+    index.add("abcd1111", 1)
+    index.add("abcd2222", 2)
+    # Callers filter candidates sharing the stored prefix against the full key
+    assert [value for _, value in index.search("abcd2")] == [1, 2]
+
+def test_typed_results_for_blocks_transactions_and_addresses():
+    chain = transfer_chain()
+    index = SearchIndex(chain, buffer_size=8)
+
+    block = chain.chain[3]
+    assert index.search(block.hash[:10])[0] == {"type": "block", "hash": block.hash, "index": 3}
+
+    tx_hash = hash_of(block.transactions[2])
+    assert "hash" not in block.transactions[2]
+    results = index.search(tx_hash[:8], types=["transaction"])
+    assert {"type": "transaction", "hash": tx_hash, "block_hash": block.hash, "block_index": 3} in results
+    assert all(result["hash"].startswith(tx_hash[:8]) for result in results)
+
+    results = index.search(f"{chain.prefix}_user", limit=3)
+    assert results == [{"type": "address", "address": f"{chain.prefix}_user{t}"} for t in range(3)]
+    assert index.search("zzz") == []
+
+def test_index_follows_new_blocks_and_replaced_chains():
+    chain = transfer_chain(blocks=2)
+    index = SearchIndex(chain)
+
+    assert chain.add_transaction(f"{chain.prefix}_treasury", f"{chain.prefix}_late", 1.0)
+    tx_hash = hash_of(chain.pending_transactions[-1])
+    assert index.find_transaction(tx_hash) is None
+    chain.mine_pending_transactions(f"{chain.prefix}_miner")
+    block, tx = index.find_transaction(tx_hash)
+    assert block is chain.get_latest_block() and hash_of(tx) == tx_hash
+    assert index.search(f"{chain.prefix}_la") == [{"type": "address", "address": f"{chain.prefix}_late"}]
+
+    chain.load_blocks(generate_blocks(chain.network, blocks=3, transactions=30, addresses=10, seed=1))
+    assert index.find_transaction(tx_hash) is None
+    assert index.search(f"{chain.prefix}_la") == []
+    assert index.search(chain.chain[2].hash)[0]["index"] == 2
+    synthetic = chain.chain[2].transactions[0]
+    assert index.find_transaction(hash_of(synthetic)) == (chain.chain[2], synthetic)
+
+def test_submitted_hashes_are_kept():
+    chain = RootChain(network="testnet")
+    chain.difficulty = 1
+    submitted = {
+        "sender": "0x0", "recipient": f"{chain.prefix}_old", "amount": 1.0,
+        "timestamp": 0.0, "type": "transfer", "network": chain.network, "hash": "0xsubmitted"
+    }
+    chain.pending_transactions.append(submitted)
+    chain.mine_pending_transactions(f"{chain.prefix}_miner")
+    index = SearchIndex(chain)
+    assert index.find_transaction("0xsubmitted")[1] is submitted
+    assert hash_of(submitted) == "0xsubmitted"
+
+def test_search_endpoint(monkeypatch):
+    from fastapi.testclient import TestClient
+
+    monkeypatch.chdir(EXPLORER_DIR)
+    # Only for the app's own imports; the path is restored after the test
+    monkeypatch.syspath_prepend(EXPLORER_DIR)
+    explorer = load_explorer_module("explorer_app", "app.py")
+    client = TestClient(explorer.app)
+    genesis = explorer.mainnet.chain[0]
+
+    response = client.get("/api/search", params={"q": genesis.hash[:6]})
+    assert response.status_code == 200
+    assert response.json()["results"][0] == {"type": "block", "hash": genesis.hash, "index": 0}
+    response = client.get("/api/search", params={"q": "rtc_tr", "type": "address"})
+    assert response.json()["results"] == [{"type": "address", "address": "rtc_treasury"}]
+    assert client.get("/api/search", params={"q": "a", "type": "contract"}).status_code == 400
+    assert client.get("/api/search", params={"q": ""}).status_code == 422
+
+    # The explorer derives hashes for chain transactions, which carry none
+    genesis_hash = hash_of(genesis.transactions[0])
+    latest = client.get("/api/transactions/latest").json()
+    assert genesis_hash in {tx["hash"] for tx in latest}
+    response = client.get(f"/api/transaction/{genesis_hash}")
+    assert response.status_code == 200 and response.json()["to"] == "rtc_treasury"
@@ -0,0 +1,252 @@
+"""
+RootChain load suite
+
+Covers every service with a traffic mix weighted toward reads. Requests
+target addresses from the seeded synthetic chain (see seed.py), so hosts
+should be started with loadtest/serve.py using the same seed and address
+count; wallet users recover the load wallets serve.py funds, so transfers
+go through. At the end of a run the SLOs in slo.py are checked and any
+violation makes locust exit non-zero.
+
+To run everything (services, stand-ins, headless locust) in one go:
+    python loadtest/run.py
+
+Or against already running services:
+    locust -f loadtest/locustfile.py --headless -u 50 -r 10 -t 2m
+"""
+
+import hashlib
+import itertools
+import os
+import random
+import sys
+import uuid
+
+from locust import HttpUser, between, events, task
+from locust.runners import WorkerRunner
+from mnemonic import Mnemonic
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from slo import check_slos
+from standins import payment_succeeded_event
+
+API_KEY = os.getenv("LOADTEST_API_KEY", "loadtest_api_key")
+SEEDED_ADDRESSES = int(os.getenv("LOADTEST_ADDRESSES", "1000"))
+LOAD_WALLETS = int(os.getenv("LOADTEST_WALLETS", "50"))
+_event_ids = itertools.count()
+_wallet_ids = itertools.count()
+
+def seeded_address(prefix: str = "trtc") -> str:
+    # Matches seed.seeded_addresses without importing the chain
+    return f"{prefix}_load_{random.randrange(SEEDED_ADDRESSES):024d}"
+
+def load_wallet_mnemonic(index: int) -> str:
+    # Matches seed.load_wallet_mnemonic without importing the chain
+    entropy = hashlib.sha256(f"loadtest-wallet-{index}".encode()).digest()
+    return Mnemonic("english").to_mnemonic(entropy)
+
+class WalletUser(HttpUser):
+    host = os.getenv("LOADTEST_WALLET_URL", "http://127.0.0.1:8000")
+    wait_time = between(1, 3)  # Wait 1-3 seconds between tasks
+    weight = 5
+    api_key = API_KEY
+
+    def on_start(self):
+        """Recover one of the funded load wallets when user starts"""
+        self.headers = {"X-API-Key": self.api_key}
+        response = self.client.post(
+            "/api/wallet/recover",
+            headers=self.headers,
+            json={
+                "network": "testnet",
+                "mnemonic": load_wallet_mnemonic(next(_wallet_ids) % LOAD_WALLETS)
+            },
+            name="[wallet] POST /api/wallet/recover"
+        )
+        if response.status_code == 200:
+            self.wallet = response.json()
+        else:
+            self.wallet = None
+
+    @task(8)
+    def get_wallet_details(self):
+        """Get wallet details - most common operation, sometimes paging on"""
+        address = seeded_address(random.choice(["rtc", "trtc"]))
+        network = "mainnet" if address.startswith("rtc") else "testnet"
+        name = "[wallet] GET /api/wallet/[address]"
+        response = self.client.get(
+            f"/api/wallet/{address}",
+            headers=self.headers,
+            params={"network": network, "limit": 20},
+            name=name
+        )
+        if response.status_code == 200 and random.random() < 0.3:
+            cursor = response.json().get("next_cursor")
+            if cursor:
+                self.client.get(
+                    f"/api/wallet/{address}",
+                    headers=self.headers,
+                    params={"network": network, "limit": 20, "cursor": cursor},
+                    name=name
+                )
+
+    @task(1)
+    def stream_history(self):
+        """Full history export"""
+        self.client.get(
+            f"/api/wallet/{seeded_address()}",
+            headers=self.headers,
+            params={"network": "testnet", "format": "ndjson"},
+            name="[wallet] GET /api/wallet/[address]?format=ndjson"
+        )
+
+    @task(1)
+    def create_wallet(self):
+        """Create new wallet"""
+        self.client.post(
+            "/api/wallet/create",
+            headers=self.headers,
+            json={"network": "testnet"},
+            name="[wallet] POST /api/wallet/create"
+        )
+
+    @task(1)
+    def transfer_tokens(self):
+        """Transfer tokens - least common operation"""
+        if self.wallet:
+            self.client.post(
+                "/api/transfer",
+                headers=self.headers,
+                json={
+                    "from_address": self.wallet["address"],
+                    "to_address": seeded_address(),
+                    "amount": "0.1",
+                    "private_key": self.wallet["private_key"],
+                    "network": "testnet"
+                },
+                name="[wallet] POST /api/transfer"
+            )
+
+    @task(1)
+    def buy_tokens(self):
+        """Payment intent followed by Stripe's webhook, occasionally redelivered"""
+        address = seeded_address()
+        self.client.post(
+            "/api/payment/create-intent",
+            json={"amount": "90.0", "network": "testnet", "wallet_address": address},
+            name="[wallet] POST /api/payment/create-intent"
+        )
+        event_id = f"evt_load_{uuid.uuid4().hex[:8]}_{next(_event_ids)}"
+        payload, headers = payment_succeeded_event(event_id, address, "1.0")
+        deliveries = 2 if random.random() < 0.1 else 1
+        for _ in range(deliveries):
+            self.client.post(
+                "/api/payment/webhook",
+                data=payload,
+                headers=headers,
+                name="[wallet] POST /api/payment/webhook"
+            )
+
+class ExplorerUser(HttpUser):
+    host = os.getenv("LOADTEST_EXPLORER_URL", "http://127.0.0.1:8001")
+    wait_time = between(1, 3)
+    weight = 4
+
+    def on_start(self):
+        self.block_hashes = []
+
+    @task(4)
+    def latest_blocks(self):
+        network = random.choice(["mainnet", "testnet"])
+        response = self.client.get(
+            "/api/blocks/latest",
+            params={"network": network},
+            name="[explorer] GET /api/blocks/latest"
+        )
+        if response.status_code == 200:
+            self.block_hashes = [(network, block["hash"]) for block in response.json()]
+
+    @task(3)
+    def latest_transactions(self):
+        self.client.get(
+            "/api/transactions/latest",
+            params={"network": random.choice(["mainnet", "testnet"])},
+            name="[explorer] GET /api/transactions/latest"
+        )
+
+    @task(2)
+    def stats(self):
+        self.client.get("/api/stats", name="[explorer] GET /api/stats")
+
+    @task(3)
+    def block_detail(self):
+        if self.block_hashes:
+            network, block_hash = random.choice(self.block_hashes)
+            self.client.get(
+                f"/api/block/{block_hash}",
+                params={"network": network},
+                name="[explorer] GET /api/block/[hash]"
+            )
+
+    @task(2)
+    def address_detail(self):
+        self.client.get(
+            f"/api/address/{seeded_address(random.choice(['rtc', 'trtc']))}",
+            name="[explorer] GET /api/address/[address]"
+        )
+
+class MonitoringUser(HttpUser):
+    """Dashboards and alert pollers"""
+    host = os.getenv("LOADTEST_MONITORING_URL", "http://127.0.0.1:8004")
+    wait_time = between(2, 5)
+    weight = 1
+
+    @task(2)
+    def current(self):
+        self.client.get("/api/metrics/current", name="[monitoring] GET /api/metrics/current")
+
+    @task(1)
+    def history(self):
+        self.client.get(
+            "/api/metrics/history",
+            params={"network": random.choice(["mainnet", "testnet"])},
+            name="[monitoring] GET /api/metrics/history"
+        )
+
+    @task(3)
+    def network_health(self):
+        self.client.get(
+            "/api/metrics/network-health",
+            name="[monitoring] GET /api/metrics/network-health"
+        )
+
+class FaucetUser(HttpUser):
+    host = os.getenv("LOADTEST_FAUCET_URL", "http://127.0.0.1:8003")
+    wait_time = between(2, 5)
+    weight = 1
+
+    @task(5)
+    def faucet_info(self):
+        self.client.get("/api/faucet-info", name="[faucet] GET /api/faucet-info")
+
+    @task(1)
+    def request_tokens(self):
+        # Fresh address each time; every address has a 24h cooldown
+        self.client.post(
+            "/api/request-tokens",
+            json={"address": f"trtc_faucet_{uuid.uuid4().hex}", "amount": 10},
+            name="[faucet] POST /api/request-tokens"
+        )
+
+@events.quitting.add_listener
+def enforce_slos(environment, **kwargs):
+    if isinstance(environment.runner, WorkerRunner):
+        return
+    violations = check_slos(environment.stats)
+    for violation in violations:
+        print(f"SLO violation: {violation}")
+    if violations:
+        environment.process_exit_code = 1
+
+# To run:
+# python loadtest/run.py
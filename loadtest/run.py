@@ -0,0 +1,110 @@
+"""
+Run the full load suite locally
+
+Starts the Stripe stand-in and all four services on seeded synthetic
+chains, runs locust headless against them and exits with locust's exit
+code, which is non-zero when an SLO is violated.
+
+Usage:
+    python loadtest/run.py --users 50 --spawn-rate 10 --run-time 2m
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from typing import Dict, List
+
+LOADTEST_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(LOADTEST_DIR)
+
+from standins import StripeMockServer, WEBHOOK_SECRET
+
+API_KEY = "loadtest_api_key"
+
+# service -> (port, locustfile host variable)
+PORTS = {
+    "wallet": (8000, "LOADTEST_WALLET_URL"),
+    "explorer": (8001, "LOADTEST_EXPLORER_URL"),
+    "faucet": (8003, "LOADTEST_FAUCET_URL"),
+    "monitoring": (8004, "LOADTEST_MONITORING_URL")
+}
+
+def wait_until_ready(url: str, process: subprocess.Popen, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"{url} exited with code {process.returncode}")
+        try:
+            with urllib.request.urlopen(url, timeout=1):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"{url} not ready after {timeout:.0f}s")
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--spawn-rate", type=float, default=10)
+    parser.add_argument("--run-time", default="2m")
+    parser.add_argument("--blocks", type=int, default=200)
+    parser.add_argument("--txs-per-block", type=int, default=50)
+    parser.add_argument("--addresses", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--csv", help="Prefix for locust's CSV stats output")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="rootchain-loadtest-")
+    processes: List[subprocess.Popen] = []
+    with StripeMockServer() as stripe_server:
+        env: Dict[str, str] = dict(
+            os.environ,
+            API_KEY=API_KEY,
+            RATE_LIMIT_API_KEYS=f"{API_KEY}:1000000",
+            STRIPE_SECRET_KEY="sk_test_loadtest",
+            STRIPE_WEBHOOK_SECRET=WEBHOOK_SECRET,
+            STRIPE_API_BASE=stripe_server.url,
+            LOG_FILE=os.path.join(workdir, "wallet.log"),
+            WEBHOOK_QUEUE_PATH=os.path.join(workdir, "webhook_queue.db"),
+            LOADTEST_API_KEY=API_KEY,
+            LOADTEST_ADDRESSES=str(args.addresses),
+            LOADTEST_WALLETS=str(args.users)
+        )
+        try:
+            for service, (port, host_var) in PORTS.items():
+                processes.append(subprocess.Popen([
+                    sys.executable, os.path.join(LOADTEST_DIR, "serve.py"), service,
+                    "--port", str(port),
+                    "--blocks", str(args.blocks),
+                    "--txs-per-block", str(args.txs_per_block),
+                    "--addresses", str(args.addresses),
+                    "--seed", str(args.seed),
+                    "--wallets", str(args.users)
+                ], env=env))
+                env[host_var] = f"http://127.0.0.1:{port}"
+            for process, (port, _) in zip(processes, PORTS.values()):
+                wait_until_ready(f"http://127.0.0.1:{port}/metrics", process, timeout=120)
+
+            command = [
+                sys.executable, "-m", "locust",
+                "-f", os.path.join(LOADTEST_DIR, "locustfile.py"),
+                "--headless",
+                "--users", str(args.users),
+                "--spawn-rate", str(args.spawn_rate),
+                "--run-time", args.run_time,
+                "--only-summary"
+            ]
+            if args.csv:
+                command += ["--csv", args.csv]
+            return subprocess.call(command, env=env)
+        finally:
+            for process in processes:
+                process.terminate()
+            for process in processes:
+                process.wait()
+
+if __name__ == "__main__":
+    sys.exit(main())
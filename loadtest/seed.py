@@ -0,0 +1,69 @@
+"""
+Seeded synthetic chain used by the load suite
+
+Both the service launcher and the locust users derive addresses from the
+same seed and count, so requests hit addresses that actually have history.
+Likewise they derive the same load wallets, which the launcher funds so
+locust users can recover them and send transfers.
+"""
+
+import hashlib
+import time
+from typing import List
+
+from mnemonic import Mnemonic
+
+from blockchain.core.block import Block
+from blockchain.core.blockchain import RootChain
+from blockchain.synthetic import generate_blocks, synthetic_addresses
+
+def seeded_addresses(chain: RootChain, count: int) -> List[str]:
+    return synthetic_addresses(chain.prefix, count, tag="load")
+
+def seed_chain(
+    chain: RootChain,
+    blocks: int = 200,
+    txs_per_block: int = 50,
+    addresses: int = 1000,
+    seed: int = 42
+) -> RootChain:
+    """Replace the chain's blocks with a reproducible history ending now."""
+    chain.load_blocks(generate_blocks(
+        chain.network,
+        blocks=blocks,
+        transactions=blocks * txs_per_block,
+        addresses=addresses,
+        seed=seed,
+        start_time=time.time() - blocks * chain.block_time,
+        tag="load"
+    ))
+    return chain
+
+def load_wallet_mnemonic(index: int) -> str:
+    entropy = hashlib.sha256(f"loadtest-wallet-{index}".encode()).digest()
+    return Mnemonic("english").to_mnemonic(entropy)
+
+def fund_load_wallets(chain: RootChain, count: int, amount: float = 10_000.0) -> List[str]:
+    """Credit the first count load wallets from the treasury in a new block."""
+    from blockchain.wallet.wallet import RootWallet
+
+    wallet = RootWallet(network=chain.network)
+    addresses = [wallet.recover_wallet(load_wallet_mnemonic(i))["address"] for i in range(count)]
+    timestamp = time.time()
+    chain.append_block(Block(
+        len(chain.chain),
+        [
+            {
+                "sender": f"{chain.prefix}_treasury",
+                "recipient": address,
+                "amount": amount,
+                "timestamp": timestamp,
+                "type": "transfer",
+                "network": chain.network
+            }
+            for address in addresses
+        ],
+        timestamp,
+        chain.get_latest_block().hash
+    ))
+    return addresses
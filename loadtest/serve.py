@@ -0,0 +1,62 @@
+"""
+Run one RootChain service on a seeded synthetic chain
+
+Each service runs in its own process from its own directory, as in
+production, so relative template/static paths and module names resolve.
+
+Usage:
+    python loadtest/serve.py explorer --port 8001 --seed 42
+"""
+
+import argparse
+import os
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SERVICES = {
+    "wallet": "wallet-backend",
+    "explorer": "explorer",
+    "monitoring": "monitoring",
+    "faucet": "testnet-faucet"
+}
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("service", choices=sorted(SERVICES))
+    parser.add_argument("--port", type=int, required=True)
+    parser.add_argument("--blocks", type=int, default=200)
+    parser.add_argument("--txs-per-block", type=int, default=50)
+    parser.add_argument("--addresses", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--wallets", type=int, default=50, help="Load wallets to fund")
+    args = parser.parse_args()
+
+    service_dir = os.path.join(ROOT_DIR, SERVICES[args.service])
+    os.chdir(service_dir)
+    sys.path.insert(0, service_dir)
+    sys.path.append(ROOT_DIR)
+    sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+    import uvicorn
+    from blockchain.core.blockchain import RootChain
+    from seed import fund_load_wallets, seed_chain
+
+    import app as service
+
+    for offset, name in enumerate(("mainnet", "testnet")):
+        chain = getattr(service, name, None)
+        if isinstance(chain, RootChain):
+            seed_chain(chain, args.blocks, args.txs_per_block, args.addresses, args.seed + offset)
+            if args.service == "wallet":
+                fund_load_wallets(chain, args.wallets)
+
+    if args.service == "wallet":
+        from rate_limit import RedisRateLimiter
+        from standins import LocalRedis
+        service.rate_limiter = RedisRateLimiter(LocalRedis())
+
+    uvicorn.run(service.app, host="127.0.0.1", port=args.port, log_level="warning")
+
+if __name__ == "__main__":
+    main()
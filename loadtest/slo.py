@@ -0,0 +1,55 @@
+"""
+Latency and error-rate objectives checked at the end of a load run
+"""
+
+from typing import Dict, List, NamedTuple
+
+class SLO(NamedTuple):
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_failure_ratio: float = 0.01
+
+DEFAULT_SLO = SLO(50, 250, 500)
+
+# Keyed by the request names used in locustfile.py
+SLOS: Dict[str, SLO] = {
+    "[wallet] GET /api/wallet/[address]": SLO(25, 100, 250),
+    "[wallet] GET /api/wallet/[address]?format=ndjson": SLO(50, 250, 500),
+    "[wallet] POST /api/wallet/create": SLO(50, 250, 500),
+    # Sent once per user as it spawns, so it runs in bursts of key derivations
+    "[wallet] POST /api/wallet/recover": SLO(100, 400, 800),
+    "[wallet] POST /api/transfer": SLO(50, 250, 500),
+    "[wallet] POST /api/payment/create-intent": SLO(100, 400, 800),
+    "[wallet] POST /api/payment/webhook": SLO(25, 100, 250),
+    "[explorer] GET /api/blocks/latest": SLO(25, 100, 250),
+    "[explorer] GET /api/transactions/latest": SLO(25, 100, 250),
+    "[explorer] GET /api/stats": SLO(10, 50, 100),
+    "[explorer] GET /api/block/[hash]": SLO(25, 100, 250),
+    "[explorer] GET /api/address/[address]": SLO(50, 250, 500),
+    "[monitoring] GET /api/metrics/current": SLO(100, 400, 800),
+    "[monitoring] GET /api/metrics/history": SLO(10, 50, 100),
+    "[monitoring] GET /api/metrics/network-health": SLO(10, 50, 100),
+    "[faucet] GET /api/faucet-info": SLO(10, 50, 100),
+    # Only queues the drip; blocks are mined by the background worker
+    "[faucet] POST /api/request-tokens": SLO(25, 100, 250)
+}
+
+def check_slos(stats, slos: Dict[str, SLO] = SLOS) -> List[str]:
+    """Return a description of every SLO the run's stats violate."""
+    violations = []
+    for entry in stats.entries.values():
+        if entry.num_requests == 0:
+            continue
+        slo = slos.get(entry.name, DEFAULT_SLO)
+        for percentile, limit in ((0.5, slo.p50_ms), (0.95, slo.p95_ms), (0.99, slo.p99_ms)):
+            value = entry.get_response_time_percentile(percentile)
+            if value > limit:
+                violations.append(
+                    f"{entry.name}: p{int(percentile * 100)} {value:.0f}ms > {limit:.0f}ms"
+                )
+        if entry.fail_ratio > slo.max_failure_ratio:
+            violations.append(
+                f"{entry.name}: failure ratio {entry.fail_ratio:.2%} > {slo.max_failure_ratio:.2%}"
+            )
+    return violations
@@ -0,0 +1,59 @@
+"""
+Local stand-ins for external services used during load tests
+"""
+
+import os
+import sys
+import time
+from typing import Any, Dict, List
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(ROOT_DIR, "wallet-backend"))
+sys.path.append(os.path.join(ROOT_DIR, "wallet-backend", "tests"))
+
+from rate_limit import _REDIS_SLIDING_WINDOW
+from stripe_stub import StripeMockServer, WEBHOOK_SECRET, payment_succeeded_event
+
+__all__ = ["LocalRedis", "StripeMockServer", "WEBHOOK_SECRET", "payment_succeeded_event"]
+
+class LocalRedis:
+    """
+    In-process stand-in for the subset of redis.asyncio the services use
+
+    Lua scripts cannot run here, so each script the services register is
+    mapped to a Python port with the same semantics.
+    """
+
+    def __init__(self):
+        self.values: Dict[str, int] = {}
+        self.expires: Dict[str, float] = {}
+        self.scripts = {_REDIS_SLIDING_WINDOW: self._sliding_window}
+
+    def register_script(self, script: str):
+        handler = self.scripts[script]
+
+        async def run(keys: List[str], args: List[Any]):
+            return handler(keys, args)
+
+        return run
+
+    def _get(self, key: str, now: float) -> int:
+        if key in self.expires and self.expires[key] <= now:
+            self.values.pop(key, None)
+            self.expires.pop(key, None)
+        return self.values.get(key, 0)
+
+    def _sliding_window(self, keys: List[str], args: List[Any]) -> int:
+        limit, window = int(args[0]), int(args[1])
+        now = time.time()
+        index = int(now // window)
+        current_key = f"{keys[0]}:{index}"
+        previous_key = f"{keys[0]}:{index - 1}"
+        current = self._get(current_key, now)
+        previous = self._get(previous_key, now)
+        weight = (window - (now - index * window)) / window
+        if previous * weight + current >= limit:
+            return 0
+        self.values[current_key] = current + 1
+        self.expires[current_key] = now + window * 2
+        return 1
@@ -0,0 +1,68 @@
+import os
+import sys
+from types import SimpleNamespace
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(ROOT_DIR)
+sys.path.append(os.path.join(ROOT_DIR, "loadtest"))
+
+from blockchain.core.blockchain import RootChain
+from blockchain.wallet.wallet import RootWallet
+from seed import fund_load_wallets, load_wallet_mnemonic, seed_chain, seeded_addresses
+from slo import SLO, check_slos
+
+class FakeEntry:
+    def __init__(self, name, times_ms, failures=0):
+        self.name = name
+        self.times = sorted(times_ms)
+        self.num_requests = len(times_ms)
+        self.fail_ratio = failures / len(times_ms) if times_ms else 0
+
+    def get_response_time_percentile(self, percentile):
+        return self.times[min(int(percentile * len(self.times)), len(self.times) - 1)]
+
+def stats(*entries):
+    return SimpleNamespace(entries={entry.name: entry for entry in entries})
+
+def transfers(chain):
+    return [
+        (tx["sender"], tx["recipient"], tx["amount"])
+        for block in chain.chain[1:]
+        for tx in block.transactions
+    ]
+
+def test_seeded_chain_is_reproducible():
+    first = seed_chain(RootChain("testnet"), blocks=3, txs_per_block=10, addresses=20, seed=7)
+    second = seed_chain(RootChain("testnet"), blocks=3, txs_per_block=10, addresses=20, seed=7)
+    assert len(first.chain) == 4
+    assert first.difficulty == 3
+    assert transfers(first) == transfers(second)
+    addresses = seeded_addresses(first, 20)
+    assert all(30 <= len(address) <= 50 for address in addresses)
+    assert any(first.get_transactions_by_address(address) for address in addresses)
+
+def test_load_wallets_are_funded_and_can_transfer():
+    chain = seed_chain(RootChain("testnet"), blocks=3, txs_per_block=10, addresses=20, seed=7)
+    addresses = fund_load_wallets(chain, 3, amount=50.0)
+    assert len(chain.chain) == 5
+    recovered = RootWallet(network="testnet").recover_wallet(load_wallet_mnemonic(1))
+    assert recovered["address"] == addresses[1]
+    assert chain.get_balance(addresses[1]) == 50.0
+    wallet = RootWallet.from_private_key(recovered["private_key"], network_type="testnet")
+    assert wallet.address == addresses[1]
+    assert chain.add_transaction(wallet.address, seeded_addresses(chain, 20)[0], 0.1)
+
+def test_check_slos_passes_within_objectives():
+    slos = {"fast": SLO(10, 20, 30)}
+    assert check_slos(stats(FakeEntry("fast", [5] * 100)), slos) == []
+
+def test_check_slos_reports_latency_and_failures():
+    slos = {"fast": SLO(10, 20, 30, max_failure_ratio=0.01)}
+    violations = check_slos(stats(FakeEntry("fast", [5] * 90 + [50] * 10, failures=5)), slos)
+    assert "fast: p95 50ms > 20ms" in violations
+    assert "fast: p99 50ms > 30ms" in violations
+    assert any("failure ratio" in violation for violation in violations)
+    assert not any("p50" in violation for violation in violations)
+
+def test_check_slos_skips_empty_entries():
+    assert check_slos(stats(FakeEntry("idle", []))) == []
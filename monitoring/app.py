@@ -1,21 +1,101 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, StreamingResponse
 from fastapi.requests import Request
 from pydantic import BaseModel
+from contextlib import asynccontextmanager, suppress
+import asyncio
+import logging
+import os
 import sys
 import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 sys.path.append('../')
 from blockchain.core.blockchain import RootChain
 from blockchain.wallet.symbols import ROOT, ROOT_TESTNET
+from common.responses import FastJSONResponse, json_dumps
+from common.metrics import setup_metrics, register_chain_metrics
+from health import HealthMonitor
+from timeseries import TimeSeriesStore
 
-app = FastAPI()
+logger = logging.getLogger(__name__)
+
+# Figures from chain_stats kept as history, sampled every SAMPLE_INTERVAL seconds
+SAMPLED_METRICS = (
+    "blocks",
+    "transactions",
+    "pending_transactions",
+    "active_addresses",
+    "treasury_balance",
+    "avg_block_time",
+    "avg_transactions_per_block"
+)
+SAMPLE_INTERVAL = float(os.getenv("SAMPLE_INTERVAL", "10"))
+# Directory to keep sampled history in across restarts; unset keeps it in memory only
+METRICS_HISTORY_PATH = os.getenv("METRICS_HISTORY_PATH")
+# Seconds between writing buffered rows to disk, and between retention passes
+HISTORY_FLUSH_INTERVAL = float(os.getenv("HISTORY_FLUSH_INTERVAL", "60"))
+HISTORY_COMPACT_INTERVAL = 3600
+# Seconds between scheduled health evaluations; blocks also trigger one
+HEALTH_INTERVAL = float(os.getenv("HEALTH_INTERVAL", "15"))
+# Fraction a figure must clear a threshold by before its status recovers
+HEALTH_HYSTERESIS = float(os.getenv("HEALTH_HYSTERESIS", "0.1"))
+# Seconds between keepalive comments on idle health streams
+HEALTH_KEEPALIVE = 15
+
+metrics_store = TimeSeriesStore(SAMPLED_METRICS, interval=SAMPLE_INTERVAL, path=METRICS_HISTORY_PATH or None)
+
+def sample_metrics(timestamp: Optional[float] = None) -> None:
+    timestamp = time.time() if timestamp is None else timestamp
+    for chain in (mainnet, testnet):
+        metrics_store.record(chain.network, chain_stats(chain), timestamp)
+
+async def run_sampler(stop: asyncio.Event) -> None:
+    """Sample until stop is set; samples and disk writes run in a worker thread."""
+    flushed = compacted = time.time()
+    while not stop.is_set():
+        try:
+            await asyncio.to_thread(sample_metrics)
+            now = time.time()
+            if now - flushed >= HISTORY_FLUSH_INTERVAL:
+                await asyncio.to_thread(metrics_store.flush)
+                flushed = now
+            if now - compacted >= HISTORY_COMPACT_INTERVAL:
+                await asyncio.to_thread(metrics_store.compact, now)
+                compacted = now
+        except Exception as e:
+            logger.error(f"Sampling metrics failed: {str(e)}")
+        with suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(stop.wait(), SAMPLE_INTERVAL)
+
+async def run_health_checks() -> None:
+    while True:
+        try:
+            health_monitor.evaluate_all()
+        except Exception as e:
+            logger.error(f"Evaluating network health failed: {str(e)}")
+        await asyncio.sleep(HEALTH_INTERVAL)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    sampler_stop = asyncio.Event()
+    sampler = asyncio.create_task(run_sampler(sampler_stop))
+    health_checks = asyncio.create_task(run_health_checks())
+    yield
+    health_checks.cancel()
+    with suppress(asyncio.CancelledError):
+        await health_checks
+    # Let a sample being written finish, so nothing reopens the store once it is closed
+    sampler_stop.set()
+    await sampler
+    await asyncio.to_thread(metrics_store.close)
+
+app = FastAPI(default_response_class=FastJSONResponse, lifespan=lifespan)
 
 # Mount static files
-app.mount("/static", StaticFiles(directory="static"), name="static")
+app.mount("/static", StaticFiles(directory="static", check_dir=False), name="static")
 
 # Templates
 templates = Jinja2Templates(directory="templates")
@@ -24,27 +104,8 @@ templates = Jinja2Templates(directory="templates")
 mainnet = RootChain(network="mainnet")
 testnet = RootChain(network="testnet")
 
-# Store historical metrics
-class MetricsStore:
-    def __init__(self, max_history: int = 24):  # 24 hours of history
-        self.max_history = max_history
-        self.metrics: Dict[str, List[Dict]] = {
-            "mainnet": [],
-            "testnet": []
-        }
-    
-    def add_metric(self, network: str, metric: Dict):
-        metrics = self.metrics[network]
-        metrics.append({**metric, "timestamp": time.time()})
-        
-        # Keep only last max_history entries
-        if len(metrics) > self.max_history:
-            metrics.pop(0)
-    
-    def get_metrics(self, network: str) -> List[Dict]:
-        return self.metrics[network]
-
-metrics_store = MetricsStore()
+setup_metrics(app, "monitoring", port=int(os.getenv("METRICS_PORT", "0")))
+register_chain_metrics("monitoring", mainnet, testnet)
 
 def calculate_avg_block_time(chain: RootChain) -> float:
     if len(chain.chain) < 2:
@@ -65,44 +126,43 @@ def calculate_avg_tx_per_block(chain: RootChain) -> float:
     tx_counts = [len(b.transactions) for b in blocks]
     return sum(tx_counts) / len(tx_counts)
 
-def check_network_health(chain: RootChain, network: str) -> Dict:
-    issues = []
-    score = 100
-
-    # Check block production
-    avg_block_time = calculate_avg_block_time(chain)
-    if avg_block_time > 120:  # More than 2 minutes
-        issues.append(f"High block time: {avg_block_time:.1f}s")
-        score -= 20
-    elif avg_block_time > 60:  # More than 1 minute
-        issues.append(f"Elevated block time: {avg_block_time:.1f}s")
-        score -= 10
-
-    # Check pending transactions
-    pending_count = len(chain.pending_transactions)
-    if pending_count > 1000:
-        issues.append(f"High pending transactions: {pending_count}")
-        score -= 20
-    elif pending_count > 500:
-        issues.append(f"Elevated pending transactions: {pending_count}")
-        score -= 10
-
-    # Check treasury balance
-    treasury_balance = chain.get_balance(f"{'trtc' if network == 'testnet' else 'rtc'}_treasury")
-    min_balance = 1000000  # 1M tokens
-    if treasury_balance < min_balance:
-        issues.append(f"Low treasury balance: {treasury_balance:,} {'tROOT' if network == 'testnet' else 'ROOT'}")
-        score -= 20
-
-    # Determine status
-    status = "healthy" if score >= 90 else "warning" if score >= 70 else "critical"
+# Activity windows reported alongside the all-time totals
+ACTIVITY_WINDOWS = {"1h": 3600, "24h": 86_400}
+
+def chain_stats(chain: RootChain) -> Dict:
+    """Current figures for one network, all from running aggregates kept by the chain."""
+    aggregates = chain.aggregates
+    return {
+        "network": chain.network,
+        "blocks": len(chain.chain),
+        "transactions": aggregates.total_transactions,
+        "pending_transactions": len(chain.pending_transactions),
+        "total_supply": chain.total_supply,
+        "treasury_balance": chain.get_balance(f"{chain.prefix}_treasury"),
+        # Every sender and recipient has a balance entry, except the "0x0" address
+        # that mints the genesis and rewards; it was always counted, so it still is
+        "active_addresses": len(chain.balances) + 1,
+        "activity": {
+            window: aggregates.activity(chain.block_timestamps, seconds)
+            for window, seconds in ACTIVITY_WINDOWS.items()
+        },
+        "avg_block_time": calculate_avg_block_time(chain),
+        "avg_transactions_per_block": calculate_avg_tx_per_block(chain),
+        "mining_difficulty": chain.difficulty,
+        "mining_reward": chain.mining_reward,
+        "last_block_timestamp": chain.chain[-1].timestamp if chain.chain else 0
+    }
 
+def health_figures(chain: RootChain) -> Dict:
+    """Figures the health checks read; cheap enough to compute on every block."""
     return {
-        "status": status,
-        "score": max(0, score),
-        "issues": issues
+        "avg_block_time": calculate_avg_block_time(chain),
+        "pending_transactions": len(chain.pending_transactions),
+        "treasury_balance": chain.get_balance(f"{chain.prefix}_treasury")
     }
 
+health_monitor = HealthMonitor({"mainnet": mainnet, "testnet": testnet}, health_figures, hysteresis=HEALTH_HYSTERESIS)
+
 @app.get("/", response_class=HTMLResponse)
 async def index(request: Request):
     return templates.TemplateResponse("index.html", {
@@ -111,47 +171,8 @@ async def index(request: Request):
 
 @app.get("/api/metrics/current")
 async def get_current_metrics():
-    mainnet_stats = {
-        "network": "mainnet",
-        "blocks": len(mainnet.chain),
-        "transactions": sum(len(block.transactions) for block in mainnet.chain),
-        "pending_transactions": len(mainnet.pending_transactions),
-        "total_supply": mainnet.total_supply,
-        "treasury_balance": mainnet.get_balance("rtc_treasury"),
-        "active_addresses": len(set(
-            tx["sender"] for block in mainnet.chain 
-            for tx in block.transactions
-        ) | set(
-            tx["recipient"] for block in mainnet.chain 
-            for tx in block.transactions
-        )),
-        "avg_block_time": calculate_avg_block_time(mainnet),
-        "avg_transactions_per_block": calculate_avg_tx_per_block(mainnet),
-        "mining_difficulty": mainnet.difficulty,
-        "mining_reward": mainnet.mining_reward,
-        "last_block_timestamp": mainnet.chain[-1].timestamp if mainnet.chain else 0
-    }
-    
-    testnet_stats = {
-        "network": "testnet",
-        "blocks": len(testnet.chain),
-        "transactions": sum(len(block.transactions) for block in testnet.chain),
-        "pending_transactions": len(testnet.pending_transactions),
-        "total_supply": testnet.total_supply,
-        "treasury_balance": testnet.get_balance("trtc_treasury"),
-        "active_addresses": len(set(
-            tx["sender"] for block in testnet.chain 
-            for tx in block.transactions
-        ) | set(
-            tx["recipient"] for block in testnet.chain 
-            for tx in block.transactions
-        )),
-        "avg_block_time": calculate_avg_block_time(testnet),
-        "avg_transactions_per_block": calculate_avg_tx_per_block(testnet),
-        "mining_difficulty": testnet.difficulty,
-        "mining_reward": testnet.mining_reward,
-        "last_block_timestamp": testnet.chain[-1].timestamp if testnet.chain else 0
-    }
+    mainnet_stats = chain_stats(mainnet)
+    testnet_stats = chain_stats(testnet)
 
     # Calculate comparison metrics
     comparison = {
@@ -161,28 +182,93 @@ async def get_current_metrics():
         "block_time_ratio": testnet_stats["avg_block_time"] / mainnet_stats["avg_block_time"] if mainnet_stats["avg_block_time"] > 0 else 0
     }
 
-    # Store metrics for history
-    metrics_store.add_metric("mainnet", mainnet_stats)
-    metrics_store.add_metric("testnet", testnet_stats)
-
-    return {
+    return FastJSONResponse({
         "mainnet": mainnet_stats,
         "testnet": testnet_stats,
         "comparison": comparison
-    }
+    })
+
+def history_range(start: Optional[float], end: Optional[float]) -> Tuple[float, float]:
+    """Defaults to the last hour; the range is [start, end)."""
+    end = time.time() + 1 if end is None else end
+    start = end - 3600 if start is None else start
+    if end < start:
+        raise HTTPException(status_code=400, detail="end must not be before start")
+    return start, end
+
+def history_rows(network: str, start: float, end: float, points: int) -> List[Dict]:
+    """Average of every sampled metric per point, merged into one row per timestamp."""
+    rows: Dict[float, Dict] = {}
+    for metric in SAMPLED_METRICS:
+        _, series = metrics_store.query(network, metric, start, end, points)
+        for point in series:
+            rows.setdefault(point["timestamp"], {"timestamp": point["timestamp"]})[metric] = point["avg"]
+    return list(rows.values())
 
 @app.get("/api/metrics/history")
-async def get_metrics_history(network: str):
+async def get_metrics_history(
+    network: str,
+    start: Optional[float] = None,
+    end: Optional[float] = None,
+    points: int = Query(120, ge=1, le=2000)
+):
+    """Average of every sampled metric per point, for the dashboard charts."""
     if network not in ["mainnet", "testnet"]:
         raise HTTPException(status_code=400, detail="Invalid network")
-    return metrics_store.get_metrics(network)
+    start, end = history_range(start, end)
+    # Persistent history is read from disk, so queries run off the event loop
+    return FastJSONResponse(await asyncio.to_thread(history_rows, network, start, end, points))
+
+@app.get("/api/metrics/series")
+async def get_metric_series(
+    network: str,
+    metric: str,
+    start: Optional[float] = None,
+    end: Optional[float] = None,
+    points: int = Query(300, ge=1, le=2000)
+):
+    """Min, max and average of one metric per point, read from the coarsest rollup needed."""
+    if network not in ["mainnet", "testnet"]:
+        raise HTTPException(status_code=400, detail="Invalid network")
+    if metric not in SAMPLED_METRICS:
+        raise HTTPException(status_code=400, detail="Unknown metric")
+    start, end = history_range(start, end)
+    resolution, series = await asyncio.to_thread(metrics_store.query, network, metric, start, end, points)
+    return FastJSONResponse({
+        "network": network,
+        "metric": metric,
+        "resolution": resolution,
+        "points": series
+    })
 
 @app.get("/api/metrics/network-health")
 async def get_network_health():
-    return {
-        "mainnet": check_network_health(mainnet, "mainnet"),
-        "testnet": check_network_health(testnet, "testnet")
-    }
+    """Latest verdicts, kept current in the background rather than computed per request."""
+    return FastJSONResponse(health_monitor.current())
+
+async def health_events(request: Request):
+    queue = health_monitor.subscribe()
+    try:
+        # Every network's verdict first, then each change as it happens
+        yield b"event: health\ndata: " + json_dumps(health_monitor.current()) + b"\n\n"
+        while not await request.is_disconnected():
+            try:
+                message = await asyncio.wait_for(queue.get(), HEALTH_KEEPALIVE)
+            except asyncio.TimeoutError:
+                yield b": keepalive\n\n"
+                continue
+            yield b"event: health\ndata: " + json_dumps(message) + b"\n\n"
+    finally:
+        health_monitor.unsubscribe(queue)
+
+@app.get("/api/metrics/network-health/stream")
+async def stream_network_health(request: Request):
+    """Server-sent events with health verdicts whenever a network's status or score changes."""
+    return StreamingResponse(
+        health_events(request),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 if __name__ == "__main__":
     import uvicorn
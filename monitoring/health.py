@@ -0,0 +1,183 @@
+import asyncio
+import os
+import time
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from blockchain.core.blockchain import RootChain
+from blockchain.wallet.symbols import ROOT, ROOT_TESTNET
+
+# Severity levels a check can be at
+OK, WARNING, CRITICAL = 0, 1, 2
+
+class Check:
+    """
+    One health figure compared against warning and critical thresholds
+
+    A check that has reached a level stays there until the value clears
+    that level's threshold by the hysteresis margin, so a figure hovering
+    around a threshold does not flip the status on every evaluation.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        thresholds: Tuple[Optional[float], float],
+        messages: Tuple[str, str],
+        penalties: Tuple[int, int] = (10, 20),
+        higher_is_worse: bool = True
+    ):
+        """
+        Args:
+            name (str): Key of the figure in the measurements
+            thresholds (Tuple): Warning and critical thresholds; warning may be None
+            messages (Tuple): Issue texts per level, formatted with the value
+            penalties (Tuple): Score deducted at warning and critical level
+            higher_is_worse (bool): False for figures that are bad when low
+        """
+        self.name = name
+        self.thresholds = thresholds
+        self.messages = messages
+        self.penalties = penalties
+        self.higher_is_worse = higher_is_worse
+
+    def _beyond(self, value: float, threshold: float, margin: float) -> bool:
+        if self.higher_is_worse:
+            return value > threshold * (1 - margin)
+        return value < threshold * (1 + margin)
+
+    def level(self, value: float, current: int, hysteresis: float) -> int:
+        level = OK
+        for severity, threshold in enumerate(self.thresholds, 1):
+            if threshold is None:
+                continue
+            # Levels already reached are only left once the value clears the margin
+            if self._beyond(value, threshold, hysteresis if current >= severity else 0.0):
+                level = severity
+        return level
+
+def default_checks() -> List[Check]:
+    """Checks with thresholds from the environment, defaulting to the original fixed limits."""
+    return [
+        Check(
+            "avg_block_time",
+            (float(os.getenv("HEALTH_BLOCK_TIME_WARNING", "60")), float(os.getenv("HEALTH_BLOCK_TIME_CRITICAL", "120"))),
+            ("Elevated block time: {:.1f}s", "High block time: {:.1f}s")
+        ),
+        Check(
+            "pending_transactions",
+            (float(os.getenv("HEALTH_PENDING_WARNING", "500")), float(os.getenv("HEALTH_PENDING_CRITICAL", "1000"))),
+            ("Elevated pending transactions: {:.0f}", "High pending transactions: {:.0f}")
+        ),
+        Check(
+            "treasury_balance",
+            (None, float(os.getenv("HEALTH_TREASURY_MINIMUM", "1000000"))),
+            ("", "Low treasury balance: {:,} {symbol}"),
+            higher_is_worse=False
+        )
+    ]
+
+def status_for(score: int) -> str:
+    return "healthy" if score >= 90 else "warning" if score >= 70 else "critical"
+
+class HealthMonitor:
+    """
+    Latest health verdict per network, re-evaluated in the background
+
+    Verdicts are recomputed on a schedule and whenever a block is appended,
+    so requests read the cached verdict. Subscribers get a message each
+    time a network's status or score changes.
+    """
+
+    def __init__(
+        self,
+        chains: Dict[str, RootChain],
+        measure: Callable[[RootChain], Dict],
+        checks: Optional[List[Check]] = None,
+        hysteresis: float = 0.1
+    ):
+        """
+        Args:
+            chains (Dict[str, RootChain]): Chains by network name
+            measure (Callable): Returns the figures the checks read for a chain
+            checks (List[Check]): Defaults to default_checks()
+            hysteresis (float): Fraction a figure must clear a threshold by to recover
+        """
+        self.chains = chains
+        self.measure = measure
+        self.checks = default_checks() if checks is None else checks
+        self.hysteresis = hysteresis
+        self.levels: Dict[str, Dict[str, int]] = {network: {} for network in chains}
+        self.verdicts: Dict[str, Dict] = {}
+        self.subscribers: Set[asyncio.Queue] = set()
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        for network, chain in chains.items():
+            chain.block_listeners.append(lambda block, network=network: self.evaluate(network))
+
+    def evaluate(self, network: str) -> Dict:
+        """Recompute one network's verdict, publishing it if the status or score changed."""
+        chain = self.chains[network]
+        figures = self.measure(chain)
+        symbol = (ROOT_TESTNET if network == "testnet" else ROOT).symbol
+        levels = self.levels[network]
+        score = 100
+        issues = []
+        for check in self.checks:
+            value = figures[check.name]
+            level = levels[check.name] = check.level(value, levels.get(check.name, OK), self.hysteresis)
+            if level:
+                score -= check.penalties[level - 1]
+                issues.append(check.messages[level - 1].format(value, symbol=symbol))
+
+        previous = self.verdicts.get(network)
+        status = status_for(score)
+        changed = previous is None or (previous["status"], previous["score"]) != (status, max(0, score))
+        verdict = self.verdicts[network] = {
+            "status": status,
+            "score": max(0, score),
+            "issues": issues,
+            "since": time.time() if changed else previous["since"]
+        }
+        if changed:
+            self.publish({network: verdict})
+        return verdict
+
+    def evaluate_all(self) -> Dict[str, Dict]:
+        for network in self.chains:
+            self.evaluate(network)
+        return self.verdicts
+
+    def current(self) -> Dict[str, Dict]:
+        """Cached verdicts, evaluating any network not seen yet."""
+        for network in self.chains:
+            if network not in self.verdicts:
+                self.evaluate(network)
+        return dict(self.verdicts)
+
+    def subscribe(self, maxsize: int = 100) -> asyncio.Queue:
+        self.loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue(maxsize)
+        self.subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        self.subscribers.discard(queue)
+
+    def publish(self, message: Dict) -> None:
+        if not self.subscribers:
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self.loop:
+            self._deliver(message)
+        elif self.loop is not None and not self.loop.is_closed():
+            # Blocks may be appended from another thread
+            self.loop.call_soon_threadsafe(self._deliver, message)
+
+    def _deliver(self, message: Dict) -> None:
+        for queue in list(self.subscribers):
+            if queue.full():
+                # A slow subscriber loses its oldest message rather than holding up the rest
+                queue.get_nowait()
+            queue.put_nowait(message)
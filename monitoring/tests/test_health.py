@@ -0,0 +1,60 @@
+import asyncio
+import importlib.util
+import os
+import sys
+
+MONITORING_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.dirname(MONITORING_DIR))
+from blockchain.core.blockchain import RootChain
+
+spec = importlib.util.spec_from_file_location("health", os.path.join(MONITORING_DIR, "health.py"))
+health = sys.modules.setdefault("health", importlib.util.module_from_spec(spec))
+if not hasattr(health, "HealthMonitor"):
+    spec.loader.exec_module(health)
+
+def make_monitor(figures):
+    chain = RootChain(network="testnet")
+    return chain, health.HealthMonitor({"testnet": chain}, lambda chain: dict(figures), hysteresis=0.1)
+
+def test_status_does_not_flap_around_a_threshold():
+    figures = {"avg_block_time": 10.0, "pending_transactions": 0, "treasury_balance": 2e6}
+    _, monitor = make_monitor(figures)
+    assert monitor.evaluate("testnet")["status"] == "healthy"
+
+    figures["avg_block_time"] = 125.0
+    verdict = monitor.evaluate("testnet")
+    assert (verdict["status"], verdict["score"]) == ("warning", 80)
+    assert verdict["issues"] == ["High block time: 125.0s"]
+
+    # Dipping just under the threshold keeps the level until it clears the margin
+    for value in (119.0, 121.0, 110.0):
+        figures["avg_block_time"] = value
+        assert monitor.evaluate("testnet")["score"] == 80
+    figures["avg_block_time"] = 100.0
+    assert monitor.evaluate("testnet")["score"] == 90
+
+    figures["treasury_balance"] = 5e5
+    verdict = monitor.evaluate("testnet")
+    assert verdict["issues"][-1] == "Low treasury balance: 500,000.0 tROOT"
+    figures["treasury_balance"] = 1.05e6
+    assert monitor.evaluate("testnet")["score"] == 70
+
+def test_changes_are_pushed_to_subscribers():
+    figures = {"avg_block_time": 10.0, "pending_transactions": 0, "treasury_balance": 2e6}
+    chain, monitor = make_monitor(figures)
+
+    async def scenario():
+        queue = monitor.subscribe()
+        monitor.evaluate("testnet")
+        monitor.evaluate("testnet")  # Unchanged, so nothing is pushed
+        figures["pending_transactions"] = 600
+        # Appending a block re-evaluates the network
+        chain.mine_pending_transactions("trtc_miner")
+        messages = [queue.get_nowait() for _ in range(queue.qsize())]
+        monitor.unsubscribe(queue)
+        return messages
+
+    messages = asyncio.run(scenario())
+    assert [message["testnet"]["score"] for message in messages] == [100, 90]
+    assert messages[1]["testnet"]["issues"] == ["Elevated pending transactions: 600"]
+    assert not monitor.subscribers
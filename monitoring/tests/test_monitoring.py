@@ -0,0 +1,86 @@
+import asyncio
+import importlib.util
+import os
+import sys
+import time
+
+MONITORING_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.dirname(MONITORING_DIR))
+import pytest
+from fastapi.testclient import TestClient
+
+from blockchain.synthetic import generate_blocks
+
+@pytest.fixture
+def monitoring(monkeypatch, tmp_path):
+    monkeypatch.chdir(MONITORING_DIR)
+    monkeypatch.setenv("METRICS_HISTORY_PATH", str(tmp_path / "history"))
+    monkeypatch.syspath_prepend(MONITORING_DIR)
+    # Loaded by path: other services also have an "app" module
+    if "monitoring_app" not in sys.modules:
+        spec = importlib.util.spec_from_file_location("monitoring_app", os.path.join(MONITORING_DIR, "app.py"))
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        sys.modules["monitoring_app"] = module
+    return sys.modules["monitoring_app"]
+
+def test_current_metrics_match_a_chain_scan(monitoring):
+    monitoring.testnet.load_blocks(generate_blocks("testnet", blocks=20, transactions=500, addresses=40))
+    client = TestClient(monitoring.app)
+    stats = client.get("/api/metrics/current").json()["testnet"]
+
+    chain = monitoring.testnet
+    assert stats["transactions"] == sum(len(block.transactions) for block in chain.chain)
+    addresses = {tx[key] for block in chain.chain for tx in block.transactions for key in ("sender", "recipient")}
+    assert stats["active_addresses"] == len(addresses)
+    # The synthetic chain is dated 2024, so nothing falls in the recent windows
+    assert stats["activity"]["24h"] == {"transactions": 0, "active_addresses": 0}
+
+def test_history_comes_from_the_sampler(monitoring):
+    client = TestClient(monitoring.app)
+    now = time.time()
+    for i in range(30):
+        monitoring.sample_metrics(now - 300 + i * 10)
+
+    params = {"network": "mainnet", "start": now - 300, "end": now, "points": 10}
+    history = client.get("/api/metrics/history", params=params).json()
+    assert len(history) == 10
+    assert history[-1]["blocks"] == len(monitoring.mainnet.chain)
+
+    series = client.get("/api/metrics/series", params={"network": "testnet", "metric": "transactions"}).json()
+    assert series["resolution"] == monitoring.SAMPLE_INTERVAL
+    assert series["points"][-1]["max"] == monitoring.testnet.aggregates.total_transactions
+    assert client.get("/api/metrics/series", params={"network": "testnet", "metric": "nope"}).status_code == 400
+
+def test_health_is_served_from_the_cache_and_streamed(monitoring):
+    client = TestClient(monitoring.app)
+    verdicts = client.get("/api/metrics/network-health").json()
+    assert set(verdicts) == {"mainnet", "testnet"}
+    assert verdicts["testnet"] == monitoring.health_monitor.verdicts["testnet"]
+
+    class Connected:
+        async def is_disconnected(self):
+            return False
+
+    async def read_stream():
+        events = monitoring.health_events(Connected())
+        first = await events.__anext__()
+        monitoring.health_monitor.publish({"testnet": {"status": "critical", "score": 60, "issues": []}})
+        second = await events.__anext__()
+        await events.aclose()
+        return first, second
+
+    first, second = asyncio.run(read_stream())
+    assert first.startswith(b"event: health\ndata: ") and b'"mainnet"' in first
+    assert second == b'event: health\ndata: {"testnet":{"status":"critical","score":60,"issues":[]}}\n\n'
+    assert not monitoring.health_monitor.subscribers
+
+def test_sampler_stops_before_the_store_closes(monitoring):
+    with TestClient(monitoring.app) as client:
+        # The first sample is taken in a worker thread as soon as the app starts
+        for _ in range(100):
+            if monitoring.metrics_store.series:
+                break
+            time.sleep(0.01)
+        assert client.get("/api/metrics/series", params={"network": "mainnet", "metric": "blocks"}).json()["points"]
+    assert monitoring.metrics_store.series == {}
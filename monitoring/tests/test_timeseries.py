@@ -0,0 +1,73 @@
+import importlib.util
+import os
+import sys
+
+MONITORING_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def load_monitoring_module(name):
+    # Registered under its flat name, as the service imports it
+    module = sys.modules.get(name)
+    if module is None:
+        spec = importlib.util.spec_from_file_location(name, os.path.join(MONITORING_DIR, f"{name}.py"))
+        module = sys.modules[name] = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    return module
+
+load_monitoring_module("tsdb")
+timeseries = load_monitoring_module("timeseries")
+
+T0 = 1_704_067_200.0
+
+def test_ring_overwrites_oldest_rows():
+    ring = timeseries.Ring(4)
+    for i in range(10):
+        ring.append((T0 + i, i, i, i, 1))
+    assert len(ring) == 4
+    assert [row[0] - T0 for row in ring.range(T0, T0 + 100)] == [6, 7, 8, 9]
+    assert [row[0] - T0 for row in ring.range(T0 + 7, T0 + 9)] == [7, 8]
+    assert ring.retains(T0 + 6) and not ring.retains(T0 + 5)
+
+def test_rollups_keep_min_max_and_average():
+    rollup = timeseries.Rollup(60, timeseries.Ring(10))
+    for second in range(0, 180, 10):
+        rollup.add(T0 + second, float(second))
+    rows = list(rollup.range(T0, T0 + 180))
+    # Two closed minutes plus the one still being filled
+    assert rows == [
+        (T0, 0.0, 50.0, 150.0, 6),
+        (T0 + 60, 60.0, 110.0, 510.0, 6),
+        (T0 + 120, 120.0, 170.0, 870.0, 6)
+    ]
+
+def test_queries_read_the_coarsest_level_needed():
+    series = timeseries.TimeSeries(interval=10, raw_capacity=360, rollups={60: 1440, 3600: 48})
+    for i in range(8640):  # One day of 10 second samples
+        series.add(T0 + i * 10, float(i % 100))
+
+    resolution, points = series.query(T0 + 86_400 - 600, T0 + 86_400, points=60)
+    assert resolution == 10 and len(points) == 60
+
+    # The raw ring only holds the last hour, so a day comes from the minute rollup
+    resolution, points = series.query(T0, T0 + 86_400, points=100)
+    assert resolution == 60 and len(points) == 100
+    assert min(point["min"] for point in points) == 0.0
+    assert max(point["max"] for point in points) == 99.0
+    assert all(point["min"] <= point["avg"] <= point["max"] for point in points)
+
+    # A week of range would need too many minutes, so hours are read
+    resolution, points = series.query(T0, T0 + 7 * 86_400, points=50)
+    assert resolution == 3600 and len(points) <= 50
+
+def test_stored_history_survives_a_restart(tmp_path):
+    store = timeseries.TimeSeriesStore(["blocks"], interval=1, path=str(tmp_path))
+    for i in range(7200):
+        store.record("testnet", {"blocks": i // 5}, T0 + i)
+    store.close()
+
+    reopened = timeseries.TimeSeriesStore(["blocks"], interval=1, path=str(tmp_path))
+    resolution, points = reopened.query("testnet", "blocks", T0 + 7140, T0 + 7200, points=60)
+    assert resolution == 1 and [point["avg"] for point in points] == [i // 5 for i in range(7140, 7200)]
+    # The last minute was still open at shutdown and reads back merged
+    resolution, points = reopened.query("testnet", "blocks", T0, T0 + 7200, points=120)
+    assert resolution == 60 and len(points) == 120
+    assert points[-1] == {"timestamp": T0 + 7140, "min": 1428, "max": 1439, "avg": sum(i // 5 for i in range(7140, 7200)) / 60}
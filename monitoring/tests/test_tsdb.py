@@ -0,0 +1,58 @@
+import importlib.util
+import os
+import sys
+
+MONITORING_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+spec = importlib.util.spec_from_file_location("tsdb", os.path.join(MONITORING_DIR, "tsdb.py"))
+tsdb = sys.modules.setdefault("tsdb", importlib.util.module_from_spec(spec))
+if not hasattr(tsdb, "PersistentSeries"):
+    spec.loader.exec_module(tsdb)
+
+T0 = 1_704_067_200.0
+
+def test_chunks_round_trip_and_stay_compact():
+    encoder = tsdb.ChunkEncoder(rollup=False)
+    rows = [(T0 + i, float(100 + i // 10), float(100 + i // 10), float(100 + i // 10), 1) for i in range(1000)]
+    rows += [(T0 + 1000 + i, 0.1 * i, 0.1 * i, 0.1 * i, 1) for i in range(5)]
+    for row in rows:
+        assert encoder.try_append(row)
+    # A steady one second sampler of whole values costs two bytes a row
+    assert len(encoder.payload) < 2 * 1000 + 100
+    assert tsdb.decode_chunk(encoder.to_bytes(sealed=True), 0) == rows
+
+    rollup = tsdb.ChunkEncoder(rollup=True)
+    row = (T0, -1.5, 2.25, 10.0, 7)
+    rollup.try_append(row)
+    assert tsdb.decode_chunk(rollup.to_bytes(sealed=False), 0) == [row]
+
+def test_series_persist_across_reopen(tmp_path):
+    series = tsdb.PersistentSeries(str(tmp_path), rollup=False, segment_seconds=3600, retention_seconds=None)
+    for i in range(10_000):
+        series.append((T0 + i, float(i), float(i), float(i), 1))
+    # Reads see rows still buffered in the open chunk
+    assert [row[0] - T0 for row in series.range(T0 + 9_998, T0 + 20_000)] == [9_998, 9_999]
+    series.flush()
+
+    # A crash before close leaves an unsealed chunk, which the next writer carries on
+    reopened = tsdb.PersistentSeries(str(tmp_path), rollup=False, segment_seconds=3600, retention_seconds=None)
+    assert reopened.last_timestamp == T0 + 9_999
+    reopened.append((T0 + 10_000, 1e4, 1e4, 1e4, 1))
+    reopened.close()
+
+    assert len(reopened.segments()) == 3
+    assert all(os.path.getsize(path) % tsdb.CHUNK_SIZE == 0 for _, path in reopened.segments())
+    rows = list(reopened.range(T0 + 3_590, T0 + 3_610))
+    assert [row[1] for row in rows] == [float(i) for i in range(3_590, 3_610)]
+    assert len(list(reopened.range(T0, T0 + 20_000))) == 10_001
+
+def test_compaction_drops_segments_past_retention(tmp_path):
+    series = tsdb.level_series(str(tmp_path), None)
+    day = 86_400
+    for i in range(10 * 24):
+        series.append((T0 + i * 3600, float(i), float(i), float(i), 1))
+    assert len(series.segments()) == 10
+    assert not series.retains(T0) and series.retains(T0 + 3 * day)
+
+    assert series.compact(T0 + 10 * day) == 3
+    assert series.segments()[0][0] == T0 + 3 * day
+    assert next(iter(series.range(T0, T0 + 10 * day)))[0] == T0 + 3 * day
@@ -0,0 +1,275 @@
+import os
+import threading
+from array import array
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from tsdb import level_series
+
+# (timestamp, min, max, sum, count) of one sample or one rolled-up bucket
+Row = Tuple[float, float, float, float, int]
+
+# Rollup resolution in seconds -> buckets kept
+DEFAULT_ROLLUPS = {
+    60: 7 * 1440,      # 1m for a week
+    3600: 90 * 24,     # 1h for 90 days
+    86_400: 5 * 365    # 1d for five years
+}
+
+class Ring:
+    """
+    Fixed-capacity ring of rows in typed arrays
+
+    Appends overwrite the oldest row once full, in O(1). Rows are appended
+    in time order, so range queries binary-search the logical order.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.timestamps = array("d", bytes(8 * capacity))
+        self.mins = array("d", bytes(8 * capacity))
+        self.maxes = array("d", bytes(8 * capacity))
+        self.sums = array("d", bytes(8 * capacity))
+        self.counts = array("q", bytes(8 * capacity))
+        self.start = 0
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def append(self, row: Row) -> None:
+        if self.size < self.capacity:
+            i = (self.start + self.size) % self.capacity
+            self.size += 1
+        else:
+            i = self.start
+            self.start = (self.start + 1) % self.capacity
+        self.timestamps[i], self.mins[i], self.maxes[i], self.sums[i], self.counts[i] = row
+
+    def _physical(self, i: int) -> int:
+        return (self.start + i) % self.capacity
+
+    def retains(self, timestamp: float) -> bool:
+        """Whether every row since timestamp is still held."""
+        return self.size < self.capacity or self.timestamps[self.start] <= timestamp
+
+    def _lower_bound(self, timestamp: float) -> int:
+        lo, hi = 0, self.size
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.timestamps[self._physical(mid)] < timestamp:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def range(self, start: float, end: float) -> Iterator[Row]:
+        """Rows with start <= timestamp < end, oldest first."""
+        for logical in range(self._lower_bound(start), self.size):
+            i = self._physical(logical)
+            if self.timestamps[i] >= end:
+                return
+            yield self.timestamps[i], self.mins[i], self.maxes[i], self.sums[i], self.counts[i]
+
+    def flush(self) -> None:
+        """Rings only live in memory, so there is nothing to write."""
+
+    def close(self) -> None:
+        pass
+
+class Rollup:
+    """Samples folded into fixed-width buckets with min, max, sum and count."""
+
+    def __init__(self, resolution: int, storage):
+        self.resolution = resolution
+        self.storage = storage
+        self.open: Optional[List] = None
+
+    def add(self, timestamp: float, value: float) -> None:
+        bucket = timestamp - timestamp % self.resolution
+        if self.open is not None and self.open[0] != bucket:
+            self.storage.append(tuple(self.open))
+            self.open = None
+        if self.open is None:
+            self.open = [bucket, value, value, value, 1]
+        else:
+            self.open[1] = min(self.open[1], value)
+            self.open[2] = max(self.open[2], value)
+            self.open[3] += value
+            self.open[4] += 1
+
+    def retains(self, timestamp: float) -> bool:
+        return self.storage.retains(timestamp)
+
+    def range(self, start: float, end: float) -> Iterator[Row]:
+        yield from self.storage.range(start, end)
+        # The bucket still being filled is served as it stands
+        if self.open is not None and start <= self.open[0] < end:
+            yield tuple(self.open)
+
+    def close(self) -> None:
+        """
+        Store the partly filled bucket
+
+        Should the bucket be reopened after a restart, both rows land in
+        the same bin when downsampled and merge back into one.
+        """
+        if self.open is not None:
+            self.storage.append(tuple(self.open))
+            self.open = None
+        self.storage.close()
+
+class TimeSeries:
+    """
+    One metric at raw sampling resolution plus coarser rollups
+
+    Range queries read the coarsest level that still has a row per point
+    and covers the start of the range, then merge rows into at most the
+    requested number of points, so long ranges never scan raw samples.
+    """
+
+    def __init__(
+        self,
+        interval: float,
+        raw_capacity: int = 8640,
+        rollups: Optional[Dict[int, int]] = None,
+        storage: Optional[Callable[[Optional[int]], object]] = None
+    ):
+        """
+        Args:
+            interval (float): Seconds between raw samples
+            raw_capacity (int): Raw samples kept in memory
+            rollups (Dict[int, int]): Rollup resolution in seconds -> buckets kept in memory
+            storage (Callable): Builds the storage for raw samples (None) or a
+                rollup resolution instead of in-memory rings, e.g. on disk
+        """
+        self.interval = interval
+        levels = sorted((rollups or DEFAULT_ROLLUPS).items())
+        if storage is None:
+            self.raw = Ring(raw_capacity)
+            self.rollups = [Rollup(resolution, Ring(capacity)) for resolution, capacity in levels]
+        else:
+            self.raw = storage(None)
+            self.rollups = [Rollup(resolution, storage(resolution)) for resolution, _ in levels]
+
+    def add(self, timestamp: float, value: float) -> None:
+        self.raw.append((timestamp, value, value, value, 1))
+        for rollup in self.rollups:
+            rollup.add(timestamp, value)
+
+    def flush(self) -> None:
+        self.raw.flush()
+        for rollup in self.rollups:
+            rollup.storage.flush()
+
+    def close(self) -> None:
+        self.raw.close()
+        for rollup in self.rollups:
+            rollup.close()
+
+    def compact(self, now: float) -> None:
+        for level in [self.raw] + [rollup.storage for rollup in self.rollups]:
+            if hasattr(level, "compact"):
+                level.compact(now)
+
+    def _levels(self) -> Iterator[Tuple[float, Union[Ring, Rollup]]]:
+        yield self.interval, self.raw
+        for rollup in self.rollups:
+            yield rollup.resolution, rollup
+
+    def query(self, start: float, end: float, points: int = 300) -> Tuple[float, List[Dict[str, float]]]:
+        """
+        Rows for [start, end), downsampled to at most points
+
+        Returns:
+            Tuple[float, List[Dict]]: Resolution read in seconds, and
+            {timestamp, min, max, avg} rows oldest first
+        """
+        span = max(end - start, 0.0)
+        levels = list(self._levels())
+        # The coarsest level that is still at least as fine as one point
+        chosen = 0
+        for i, (resolution, _) in enumerate(levels):
+            if resolution <= span / points:
+                chosen = i
+        # Finer levels may have already dropped the start of the range
+        while chosen < len(levels) - 1 and not levels[chosen][1].retains(start):
+            chosen += 1
+        resolution, level = levels[chosen]
+        return resolution, downsample(level.range(start, end), start, span, points)
+
+def downsample(rows: Iterable[Row], start: float, span: float, points: int) -> List[Dict[str, float]]:
+    """Merge rows into at most points equal-width bins."""
+    width = span / points if span > 0 else 1.0
+    bins: List[List] = []
+    for timestamp, low, high, total, count in rows:
+        index = int((timestamp - start) // width)
+        if bins and bins[-1][0] == index:
+            current = bins[-1]
+            current[2] = min(current[2], low)
+            current[3] = max(current[3], high)
+            current[4] += total
+            current[5] += count
+        else:
+            bins.append([index, timestamp, low, high, total, count])
+    return [
+        {"timestamp": timestamp, "min": low, "max": high, "avg": total / count}
+        for _, timestamp, low, high, total, count in bins
+    ]
+
+class TimeSeriesStore:
+    """
+    Time series for each (network, metric) pair, fed by a periodic sampler
+
+    With a path, every level is kept on disk under path/network/metric and
+    survives restarts; otherwise series live in memory rings. Calls are
+    serialized by a lock, so disk work can be moved off the event loop.
+    """
+
+    def __init__(self, metrics: Iterable[str], interval: float = 10.0, path: Optional[str] = None, **series_options):
+        self.metrics = tuple(metrics)
+        self.interval = interval
+        self.path = path
+        self.series_options = series_options
+        self.series: Dict[Tuple[str, str], TimeSeries] = {}
+        self.lock = threading.Lock()
+
+    def _series(self, network: str, metric: str) -> TimeSeries:
+        series = self.series.get((network, metric))
+        if series is None:
+            if self.path is None:
+                series = TimeSeries(self.interval, **self.series_options)
+            else:
+                directory = os.path.join(self.path, network, metric)
+                storage = lambda resolution: level_series(directory, resolution)
+                series = TimeSeries(self.interval, storage=storage, **self.series_options)
+            self.series[(network, metric)] = series
+        return series
+
+    def record(self, network: str, sample: Dict, timestamp: float) -> None:
+        with self.lock:
+            for metric in self.metrics:
+                self._series(network, metric).add(timestamp, float(sample[metric]))
+
+    def query(self, network: str, metric: str, start: float, end: float, points: int = 300) -> Tuple[float, List[Dict[str, float]]]:
+        with self.lock:
+            if self.path is None and (network, metric) not in self.series:
+                return self.interval, []
+            return self._series(network, metric).query(start, end, points)
+
+    def flush(self) -> None:
+        """Write rows still buffered in open chunks."""
+        with self.lock:
+            for series in self.series.values():
+                series.flush()
+
+    def compact(self, now: float) -> None:
+        """Drop stored rows past each level's retention."""
+        with self.lock:
+            for series in self.series.values():
+                series.compact(now)
+
+    def close(self) -> None:
+        with self.lock:
+            for series in self.series.values():
+                series.close()
+            self.series.clear()
@@ -0,0 +1,281 @@
+import mmap
+import os
+import struct
+from typing import Iterator, List, Optional, Tuple
+
+CHUNK_SIZE = 4096
+MAGIC = b"RTSC"
+# magic, rollup flag, sealed flag, reserved, rows, payload bytes, first and last timestamp
+HEADER = struct.Struct("<4sBBHIIdd")
+CAPACITY = CHUNK_SIZE - HEADER.size
+_DOUBLE = struct.Struct("<d")
+_BITS = struct.Struct("<Q")
+
+# Level (None for raw samples, else rollup resolution) -> (segment seconds, retention seconds)
+LEVEL_LAYOUT = {
+    None: (86_400, 7 * 86_400),
+    60: (30 * 86_400, 365 * 86_400),
+    3600: (365 * 86_400, 5 * 365 * 86_400),
+    86_400: (10 * 365 * 86_400, None)
+}
+
+Row = Tuple[float, float, float, float, int]
+
+def _zigzag(n: int) -> int:
+    return n * 2 if n >= 0 else -n * 2 - 1
+
+def _unzigzag(n: int) -> int:
+    return n >> 1 if not n & 1 else -(n >> 1) - 1
+
+def _put_varint(out: bytearray, n: int) -> None:
+    while n >= 0x80:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+
+def _get_varint(buf, pos: int) -> Tuple[int, int]:
+    result = shift = 0
+    while True:
+        byte = buf[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+def _bits(value: float) -> int:
+    return _BITS.unpack(_DOUBLE.pack(value))[0]
+
+def _whole(value: float) -> bool:
+    return value.is_integer() and abs(value) < 2 ** 53
+
+def _put_value(out: bytearray, value: float, previous: float) -> None:
+    if _whole(value) and _whole(previous):
+        _put_varint(out, _zigzag(int(value) - int(previous)) << 1)
+    else:
+        _put_varint(out, (_bits(value) ^ _bits(previous)) << 1 | 1)
+
+def _get_value(buf, pos: int, previous: float) -> Tuple[float, int]:
+    n, pos = _get_varint(buf, pos)
+    if n & 1:
+        return _DOUBLE.unpack(_BITS.pack((n >> 1) ^ _bits(previous)))[0], pos
+    return float(int(previous) + _unzigzag(n >> 1)), pos
+
+class ChunkEncoder:
+    """
+    Rows of one fixed-size chunk, each encoded against the previous row
+
+    Timestamps are milliseconds stored as zigzag varints of the delta of
+    deltas, one byte for a steady sampler. Values are zigzag varint deltas
+    while both are whole numbers, otherwise the XOR of their float64 bits,
+    tagged in the lowest bit. Rollup counts are zigzag varint deltas.
+    """
+
+    def __init__(self, rollup: bool):
+        self.rollup = rollup
+        self.payload = bytearray()
+        self.rows = 0
+        self.first = self.last = 0.0
+        self.previous_ms = 0
+        self.previous_delta = 0
+        self.previous_values = [0.0, 0.0, 0.0] if rollup else [0.0]
+        self.previous_count = 0
+
+    def try_append(self, row: Row) -> bool:
+        """Encode a row, or return False if it does not fit in the chunk."""
+        timestamp, low, high, total, count = row
+        values = [low, high, total] if self.rollup else [low]
+        encoded = bytearray()
+        ms = round(timestamp * 1000)
+        delta = ms - self.previous_ms
+        _put_varint(encoded, _zigzag(delta - self.previous_delta))
+        for value, previous in zip(values, self.previous_values):
+            _put_value(encoded, value, previous)
+        if self.rollup:
+            _put_varint(encoded, _zigzag(count - self.previous_count))
+        if len(self.payload) + len(encoded) > CAPACITY:
+            return False
+
+        self.payload += encoded
+        if not self.rows:
+            self.first = timestamp
+        self.rows += 1
+        self.last = timestamp
+        self.previous_ms, self.previous_delta = ms, delta
+        self.previous_values = values
+        self.previous_count = count
+        return True
+
+    def to_bytes(self, sealed: bool) -> bytes:
+        header = HEADER.pack(MAGIC, self.rollup, sealed, 0, self.rows, len(self.payload), self.first, self.last)
+        return header + bytes(self.payload) + bytes(CAPACITY - len(self.payload))
+
+def decode_chunk(buf, offset: int) -> List[Row]:
+    magic, rollup, _, _, rows, _, _, _ = HEADER.unpack_from(buf, offset)
+    if magic != MAGIC:
+        raise ValueError(f"Not a time series chunk at offset {offset}")
+    pos = offset + HEADER.size
+    previous_ms = previous_delta = previous_count = 0
+    previous_values = [0.0, 0.0, 0.0] if rollup else [0.0]
+    decoded: List[Row] = []
+    for _ in range(rows):
+        dod, pos = _get_varint(buf, pos)
+        previous_delta += _unzigzag(dod)
+        previous_ms += previous_delta
+        values = []
+        for previous in previous_values:
+            value, pos = _get_value(buf, pos, previous)
+            values.append(value)
+        previous_values = values
+        if rollup:
+            n, pos = _get_varint(buf, pos)
+            previous_count += _unzigzag(n)
+            decoded.append((previous_ms / 1000, values[0], values[1], values[2], previous_count))
+        else:
+            decoded.append((previous_ms / 1000, values[0], values[0], values[0], 1))
+    return decoded
+
+def read_segment(path: str, start: float, end: float) -> List[Row]:
+    """Rows with start <= timestamp < end from one segment file, via mmap."""
+    with open(path, "rb") as f:
+        chunks = os.fstat(f.fileno()).st_size // CHUNK_SIZE
+        if not chunks:
+            return []
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            # First chunk that ends at or after start
+            lo, hi = 0, chunks
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if HEADER.unpack_from(buf, mid * CHUNK_SIZE)[7] < start:
+                    lo = mid + 1
+                else:
+                    hi = mid
+            rows: List[Row] = []
+            for chunk in range(lo, chunks):
+                header = HEADER.unpack_from(buf, chunk * CHUNK_SIZE)
+                if header[4] == 0 or header[6] >= end:
+                    break
+                rows.extend(row for row in decode_chunk(buf, chunk * CHUNK_SIZE) if start <= row[0] < end)
+            return rows
+
+class SegmentWriter:
+    """Appends rows to one segment file, resuming an unsealed last chunk."""
+
+    def __init__(self, path: str, rollup: bool):
+        self.rollup = rollup
+        self.file = open(path, "r+b" if os.path.exists(path) else "w+b")
+        chunks = os.fstat(self.file.fileno()).st_size // CHUNK_SIZE
+        self.slot = chunks
+        self.encoder = ChunkEncoder(rollup)
+        self.dirty = False
+        if chunks:
+            self.file.seek((chunks - 1) * CHUNK_SIZE)
+            last = self.file.read(CHUNK_SIZE)
+            if not HEADER.unpack_from(last)[2]:
+                # Carry on filling the chunk a previous run left open
+                self.slot = chunks - 1
+                for row in decode_chunk(last, 0):
+                    self.encoder.try_append(row)
+
+    def append(self, row: Row) -> None:
+        if not self.encoder.try_append(row):
+            self._write(sealed=True)
+            self.slot += 1
+            self.encoder = ChunkEncoder(self.rollup)
+            self.encoder.try_append(row)
+        self.dirty = True
+
+    def _write(self, sealed: bool) -> None:
+        self.file.seek(self.slot * CHUNK_SIZE)
+        self.file.write(self.encoder.to_bytes(sealed))
+
+    def flush(self) -> None:
+        if self.dirty:
+            self._write(sealed=False)
+            self.file.flush()
+            self.dirty = False
+
+    def close(self) -> None:
+        if self.encoder.rows:
+            self._write(sealed=True)
+        self.file.close()
+
+class PersistentSeries:
+    """
+    One level of a time series on disk
+
+    Rows go to append-only segment files, one per segment_seconds of time
+    and named after its start, made of CHUNK_SIZE-byte chunks. The chunk
+    being filled is rewritten in its slot on flush and sealed once full.
+    Reads memory-map a segment and binary-search its chunk headers, and
+    compaction deletes whole segments past retention_seconds. Offers the
+    same append, retains and range calls as the in-memory Ring.
+    """
+
+    def __init__(self, directory: str, rollup: bool, segment_seconds: int, retention_seconds: Optional[int]):
+        self.directory = directory
+        self.rollup = rollup
+        self.segment_seconds = segment_seconds
+        self.retention_seconds = retention_seconds
+        os.makedirs(directory, exist_ok=True)
+        self.writer: Optional[SegmentWriter] = None
+        self.writer_start: Optional[int] = None
+        self.last_timestamp: Optional[float] = None
+        segments = self.segments()
+        if segments:
+            rows = read_segment(segments[-1][1], float("-inf"), float("inf"))
+            self.last_timestamp = rows[-1][0] if rows else None
+
+    def segments(self) -> List[Tuple[int, str]]:
+        names = (name for name in os.listdir(self.directory) if name.endswith(".tsc"))
+        return sorted((int(name[:-4]), os.path.join(self.directory, name)) for name in names)
+
+    def append(self, row: Row) -> None:
+        segment = int(row[0] // self.segment_seconds * self.segment_seconds)
+        if segment != self.writer_start:
+            if self.writer is not None:
+                self.writer.close()
+            self.writer = SegmentWriter(os.path.join(self.directory, f"{segment}.tsc"), self.rollup)
+            self.writer_start = segment
+        self.writer.append(row)
+        self.last_timestamp = row[0]
+
+    def retains(self, timestamp: float) -> bool:
+        if self.retention_seconds is None or self.last_timestamp is None:
+            return True
+        return timestamp >= self.last_timestamp - self.retention_seconds
+
+    def range(self, start: float, end: float) -> Iterator[Row]:
+        self.flush()
+        for segment, path in self.segments():
+            if segment >= end:
+                break
+            if segment + self.segment_seconds > start:
+                yield from read_segment(path, start, end)
+
+    def flush(self) -> None:
+        if self.writer is not None:
+            self.writer.flush()
+
+    def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = self.writer_start = None
+
+    def compact(self, now: float) -> int:
+        """Delete segments entirely past retention; returns how many were removed."""
+        if self.retention_seconds is None:
+            return 0
+        removed = 0
+        for segment, path in self.segments():
+            if segment + self.segment_seconds > now - self.retention_seconds or segment == self.writer_start:
+                break
+            os.remove(path)
+            removed += 1
+        return removed
+
+def level_series(directory: str, resolution: Optional[int]) -> PersistentSeries:
+    """Storage for raw samples (resolution None) or one rollup under a series directory."""
+    segment_seconds, retention_seconds = LEVEL_LAYOUT.get(resolution, (1000 * (resolution or 1), None))
+    name = "raw" if resolution is None else f"{resolution}s"
+    return PersistentSeries(os.path.join(directory, name), resolution is not None, segment_seconds, retention_seconds)
@@ -4,16 +4,49 @@ from fastapi.templating import Jinja2Templates
 from fastapi.responses import HTMLResponse
 from fastapi.requests import Request
 from pydantic import BaseModel
+from contextlib import asynccontextmanager, suppress
+import asyncio
+import logging
+import os
 import sys
 import time
 from datetime import datetime, timedelta
 sys.path.append('../')
 from blockchain.core.blockchain import RootChain
+from common.responses import FastJSONResponse
+from common.metrics import setup_metrics, register_chain_metrics
+from drip_queue import DripQueue
 
-app = FastAPI()
+logger = logging.getLogger(__name__)
+
+# Seconds between settlement blocks; every drip queued meanwhile shares one block
+DRIP_INTERVAL = float(os.getenv("DRIP_INTERVAL", "10"))
+# Most drips settled in one block, the rest wait for the next interval
+DRIP_BATCH_SIZE = int(os.getenv("DRIP_BATCH_SIZE", "1000"))
+
+async def run_drip_worker() -> None:
+    while True:
+        await asyncio.sleep(DRIP_INTERVAL)
+        if not len(drip_queue):
+            continue
+        try:
+            # Proof of work runs in a thread so requests keep being accepted
+            await asyncio.to_thread(drip_queue.settle)
+        except Exception as e:
+            logger.error(f"Settling faucet drips failed: {str(e)}")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    worker = asyncio.create_task(run_drip_worker())
+    yield
+    worker.cancel()
+    with suppress(asyncio.CancelledError):
+        await worker
+
+app = FastAPI(default_response_class=FastJSONResponse, lifespan=lifespan)
 
 # Mount static files
-app.mount("/static", StaticFiles(directory="static"), name="static")
+app.mount("/static", StaticFiles(directory="static", check_dir=False), name="static")
 
 # Templates
 templates = Jinja2Templates(directory="templates")
@@ -21,6 +54,11 @@ templates = Jinja2Templates(directory="templates")
 # Initialize testnet blockchain
 testnet = RootChain(network="testnet")
 
+setup_metrics(app, "faucet", port=int(os.getenv("METRICS_PORT", "0")))
+register_chain_metrics("faucet", testnet)
+
+drip_queue = DripQueue(testnet, f"{testnet.prefix}_treasury", "trtc_faucet_miner", max_batch=DRIP_BATCH_SIZE)
+
 # Track faucet requests to prevent abuse
 faucet_requests = {}  # address -> last_request_time
 MAX_TOKENS = 1000  # Maximum tokens per request
@@ -65,52 +103,51 @@ async def request_tokens(request: FaucetRequest):
                 detail=f"Please wait {hours_left:.1f} hours before requesting more tokens"
             )
     
-    try:
-        # Send tokens from treasury to the requester
-        treasury_address = f"{testnet.prefix}_treasury"
-        success = testnet.add_transaction(
-            sender=treasury_address,
-            recipient=request.address,
-            amount=request.amount
+    # Accepted now and paid in the next settlement block
+    drip = drip_queue.submit(request.address, request.amount)
+    if drip is None:
+        raise HTTPException(
+            status_code=500,
+            detail="Failed to send tokens. Treasury might be empty."
         )
-        
-        if not success:
-            raise HTTPException(
-                status_code=500,
-                detail="Failed to send tokens. Treasury might be empty."
-            )
-        
-        # Mine the block to confirm the transaction
-        miner_address = "trtc_faucet_miner"
-        testnet.mine_pending_transactions(miner_address)
-        
-        # Update faucet request tracking
-        faucet_requests[request.address] = datetime.now()
-        
-        return {
-            "success": True,
-            "message": f"Successfully sent {request.amount} tROOT to {request.address}",
-            "transaction": {
-                "from": treasury_address,
-                "to": request.address,
-                "amount": request.amount,
-                "network": "testnet"
-            }
+
+    # Update faucet request tracking
+    faucet_requests[request.address] = datetime.now()
+
+    return FastJSONResponse({
+        "success": True,
+        "message": f"Queued {request.amount} tROOT for {request.address}; it is paid in the next block",
+        "receipt": drip.id,
+        "status": drip.status,
+        "transaction": {
+            "id": drip.id,
+            "from": drip_queue.sender,
+            "to": request.address,
+            "amount": request.amount,
+            "network": "testnet"
         }
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    }, status_code=202)
+
+@app.get("/api/drips/{drip_id}")
+async def get_drip(drip_id: str):
+    """Status of a faucet payout by receipt: queued, confirmed (with its block) or failed."""
+    receipt = drip_queue.receipt(drip_id)
+    if receipt is None:
+        raise HTTPException(status_code=404, detail="Unknown receipt")
+    return FastJSONResponse(receipt)
 
 @app.get("/api/faucet-info")
 async def get_faucet_info():
     treasury_address = f"{testnet.prefix}_treasury"
-    return {
+    return FastJSONResponse({
         "treasury_balance": testnet.get_balance(treasury_address),
         "max_tokens_per_request": MAX_TOKENS,
         "cooldown_hours": COOLDOWN_HOURS,
         "active_requests": len(faucet_requests),
+        "queued_drips": len(drip_queue),
+        "drip_interval": DRIP_INTERVAL,
         "network": "testnet"
-    }
+    })
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,142 @@
+import secrets
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Deque, Dict, List, Optional, Set
+
+from blockchain.core.block import Block
+from blockchain.core.blockchain import RootChain
+
+QUEUED, CONFIRMED, FAILED = "queued", "confirmed", "failed"
+
+class Drip:
+    """One faucet payout, from acceptance until it is settled in a block."""
+
+    __slots__ = ("id", "address", "amount", "requested_at", "status", "block_index", "block_hash", "settled_at", "error")
+
+    def __init__(self, address: str, amount: float):
+        self.id = secrets.token_hex(16)
+        self.address = address
+        self.amount = amount
+        self.requested_at = time.time()
+        self.status = QUEUED
+        self.block_index: Optional[int] = None
+        self.block_hash: Optional[str] = None
+        self.settled_at: Optional[float] = None
+        self.error: Optional[str] = None
+
+class DripQueue:
+    """
+    Faucet payouts accepted at once and settled together
+
+    submit() only queues a drip and reserves its amount against the
+    treasury, so requests never wait for proof of work. settle() moves
+    every queued drip into the mempool and mines them in a single block;
+    it is meant to run in a worker thread on a fixed interval.
+    """
+
+    def __init__(self, chain: RootChain, sender: str, miner: str, max_batch: int = 1000, max_receipts: int = 100_000):
+        """
+        Args:
+            chain (RootChain): Chain the drips are paid on
+            sender (str): Address the drips are paid from
+            miner (str): Address credited with the block reward
+            max_batch (int): Most drips settled in one block
+            max_receipts (int): Settled receipts kept for status lookups, oldest dropped first;
+                drips still queued or being mined are always kept
+        """
+        self.chain = chain
+        self.sender = sender
+        self.miner = miner
+        self.max_batch = max_batch
+        self.max_receipts = max_receipts
+        self.queue: Deque[Drip] = deque()
+        # Drips queued or being mined, by id, until they are settled
+        self.pending: Dict[str, Drip] = {}
+        # Settled drips, oldest first
+        self.receipts: "OrderedDict[str, Drip]" = OrderedDict()
+        # Sum of queued amounts, not yet taken from the sender's balance
+        self.reserved = 0.0
+        self.lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.queue)
+
+    def available(self) -> float:
+        return self.chain.get_balance(self.sender) - self.reserved
+
+    def submit(self, address: str, amount: float) -> Optional[Drip]:
+        """Queue a drip, or return None if the sender cannot cover it on top of those queued."""
+        with self.lock:
+            if self.available() < amount:
+                return None
+            drip = Drip(address, amount)
+            self.queue.append(drip)
+            self.reserved += amount
+            self.pending[drip.id] = drip
+            return drip
+
+    def settle(self) -> Optional[Block]:
+        """Mine every queued drip, up to max_batch, into one block."""
+        with self.lock:
+            batch: List[Drip] = [self.queue.popleft() for _ in range(min(self.max_batch, len(self.queue)))]
+        if not batch:
+            return None
+
+        try:
+            accepted: List[Drip] = []
+            # Mempool entries are compared by identity; transactions carry no id of their own
+            ours: Set[int] = set()
+            for drip in batch:
+                if self.chain.add_transaction(self.sender, drip.address, drip.amount):
+                    accepted.append(drip)
+                    ours.add(id(self.chain.pending_transactions[-1]))
+                else:
+                    drip.status, drip.error = FAILED, "Transaction was rejected"
+            if not accepted:
+                return None
+            queued = {id(tx) for tx in self.chain.pending_transactions}
+            try:
+                block = self.chain.mine_pending_transactions(self.miner)
+            except Exception as e:
+                # Take back this batch's transfers and the reward added for them, so a
+                # later block cannot pay drips reported as failed; others' stay queued
+                self.chain.pending_transactions = [
+                    tx for tx in self.chain.pending_transactions
+                    if id(tx) not in ours and (id(tx) in queued or tx["sender"] != "0x0")
+                ]
+                for drip in accepted:
+                    drip.status, drip.error = FAILED, str(e)
+                raise
+            for drip in accepted:
+                drip.status = CONFIRMED
+                drip.block_index, drip.block_hash, drip.settled_at = block.index, block.hash, block.timestamp
+            return block
+        finally:
+            # Pending transactions do not move balances, so amounts stay reserved until now
+            with self.lock:
+                self.reserved -= sum(drip.amount for drip in batch)
+                for drip in batch:
+                    # Filed as settled before leaving pending, so lookups always find it
+                    self.receipts[drip.id] = drip
+                    del self.pending[drip.id]
+                while len(self.receipts) > self.max_receipts:
+                    self.receipts.popitem(last=False)
+
+    def receipt(self, drip_id: str) -> Optional[Dict]:
+        drip = self.pending.get(drip_id) or self.receipts.get(drip_id)
+        if drip is None:
+            return None
+        return {
+            "id": drip.id,
+            "status": drip.status,
+            "from": self.sender,
+            "to": drip.address,
+            "amount": drip.amount,
+            "requested_at": drip.requested_at,
+            "block_index": drip.block_index,
+            "block_hash": drip.block_hash,
+            "settled_at": drip.settled_at,
+            "confirmations": len(self.chain.chain) - drip.block_index if drip.block_index is not None else 0,
+            "error": drip.error
+        }
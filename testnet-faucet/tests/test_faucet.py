@@ -0,0 +1,107 @@
+import importlib.util
+import os
+import sys
+
+FAUCET_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.dirname(FAUCET_DIR))
+import pytest
+from fastapi.testclient import TestClient
+
+from blockchain.core.block import Block
+from blockchain.core.blockchain import RootChain
+
+@pytest.fixture
+def faucet(monkeypatch):
+    monkeypatch.chdir(FAUCET_DIR)
+    monkeypatch.syspath_prepend(FAUCET_DIR)
+    # Loaded by path: other services also have an "app" module
+    if "faucet_app" not in sys.modules:
+        spec = importlib.util.spec_from_file_location("faucet_app", os.path.join(FAUCET_DIR, "app.py"))
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        sys.modules["faucet_app"] = module
+    return sys.modules["faucet_app"]
+
+def test_drips_settle_together_in_one_block(faucet):
+    chain = RootChain(network="testnet")
+    chain.difficulty = 1
+    queue = faucet.DripQueue(chain, "trtc_treasury", "trtc_miner")
+    drips = [queue.submit(f"trtc_user{i}", 10.0) for i in range(3)]
+    assert all(drip.status == "queued" for drip in drips)
+    assert len(chain.chain) == 1 and not chain.pending_transactions
+
+    block = queue.settle()
+    assert len(chain.chain) == 2 and len(block.transactions) == 4  # Three drips and the reward
+    assert queue.settle() is None
+    chain.mine_pending_transactions("trtc_miner")
+    receipt = queue.receipt(drips[0].id)
+    assert receipt["status"] == "confirmed"
+    assert (receipt["block_index"], receipt["block_hash"], receipt["confirmations"]) == (1, block.hash, 2)
+    assert chain.get_balance("trtc_user2") == 10.0
+
+def test_queued_drips_reserve_the_treasury(faucet):
+    chain = RootChain(network="testnet")
+    chain.difficulty = 1
+    queue = faucet.DripQueue(chain, "trtc_treasury", "trtc_miner", max_batch=2)
+    assert queue.submit("trtc_a", chain.total_supply - 100)
+    assert queue.submit("trtc_b", 200) is None
+    assert queue.submit("trtc_b", 60) and queue.submit("trtc_c", 40)
+    assert queue.available() == 0
+
+    # Only two drips fit in a block; the third waits, still reserved
+    queue.settle()
+    assert len(queue) == 1 and queue.available() == 0
+    queue.settle()
+    assert chain.get_balance("trtc_treasury") == 0 and queue.reserved == 0
+
+def test_only_settled_receipts_are_evicted(faucet):
+    chain = RootChain(network="testnet")
+    chain.difficulty = 1
+    queue = faucet.DripQueue(chain, "trtc_treasury", "trtc_miner", max_batch=1, max_receipts=1)
+    first, second, third = (queue.submit(f"trtc_user{i}", 10.0) for i in range(3))
+    assert all(queue.receipt(drip.id)["status"] == "queued" for drip in (first, second, third))
+
+    queue.settle()
+    queue.settle()
+    assert queue.receipt(first.id) is None
+    assert queue.receipt(second.id)["status"] == "confirmed"
+    assert queue.receipt(third.id)["status"] == "queued"
+
+def test_failed_block_only_withdraws_its_own_drips(faucet, monkeypatch):
+    chain = RootChain(network="testnet")
+    chain.difficulty = 1
+    queue = faucet.DripQueue(chain, "trtc_treasury", "trtc_miner")
+    assert chain.add_transaction("trtc_treasury", "trtc_other", 5.0)
+    drip = queue.submit("trtc_user", 10.0)
+
+    def crash(block, difficulty):
+        raise RuntimeError("miner crashed")
+
+    monkeypatch.setattr(Block, "mine_block", crash)
+    with pytest.raises(RuntimeError):
+        queue.settle()
+    assert [tx["recipient"] for tx in chain.pending_transactions] == ["trtc_other"]
+    assert queue.receipt(drip.id)["status"] == "failed" and queue.reserved == 0
+
+def test_requests_get_a_receipt_before_mining(faucet):
+    client = TestClient(faucet.app)
+    faucet.testnet.difficulty = 1
+    height = len(faucet.testnet.chain)
+
+    response = client.post("/api/request-tokens", json={"address": "trtc_receipt_test", "amount": 25})
+    assert response.status_code == 202
+    receipt = response.json()["receipt"]
+    assert response.json()["transaction"]["id"] == receipt
+    assert len(faucet.testnet.chain) == height
+    assert client.get(f"/api/drips/{receipt}").json()["status"] == "queued"
+    assert client.get("/api/faucet-info").json()["queued_drips"] == 1
+
+    # The cooldown counts from acceptance, not from settlement
+    again = client.post("/api/request-tokens", json={"address": "trtc_receipt_test", "amount": 25})
+    assert again.status_code == 400
+
+    faucet.drip_queue.settle()
+    status = client.get(f"/api/drips/{receipt}").json()
+    assert status["status"] == "confirmed" and status["confirmations"] == 1
+    assert faucet.testnet.get_balance("trtc_receipt_test") == 25
+    assert client.get("/api/drips/unknown").status_code == 404
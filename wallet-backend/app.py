@@ -1,94 +1,126 @@
-from fastapi import FastAPI, HTTPException, Request, Depends
+from fastapi import FastAPI, HTTPException, Request, Depends, Query
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import APIKeyHeader
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from pydantic import BaseModel, validator, constr, condecimal, Field
 from decimal import Decimal
-import stripe
 import os
+import json
+import asyncio
 from dotenv import load_dotenv
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Tuple
 import sys
 import time
 from datetime import datetime, timedelta
 import logging
 from functools import lru_cache
-from prometheus_client import Counter, Histogram, start_http_server
-import sentry_sdk
-from sentry_sdk.integrations.fastapi import FastApiIntegration # type: ignore
+import importlib
+import threading
+from contextlib import asynccontextmanager, suppress
 sys.path.append('../')
-from blockchain.wallet.wallet import RootWallet
 from blockchain.core.blockchain import RootChain
 from blockchain.wallet.symbols import ROOT, ROOT_TESTNET
 from cache_utils import TTLCache
-from fastapi.responses import RedirectResponse, JSONResponse
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('wallet.log'),
-        logging.StreamHandler()
-    ]
-)
-logger = logging.getLogger(__name__)
+from rate_limit import create_rate_limiter, parse_limits
+from logger import setup_logging
+from webhook_queue import WebhookQueue
+from payments import PaymentGateway, CircuitOpenError
+from common.responses import FastJSONResponse, json_dumps
+from common.metrics import request_metrics, setup_metrics, register_chain_metrics
+from fastapi.responses import RedirectResponse, JSONResponse, StreamingResponse
 
-# Initialize Sentry for error tracking
-sentry_sdk.init(
-    dsn=os.getenv("SENTRY_DSN"),
-    integrations=[FastApiIntegration()],
-    traces_sample_rate=1.0,
-    environment=os.getenv("ENVIRONMENT", "development")
-)
+load_dotenv()
 
-# Prometheus metrics
-REQUEST_COUNT = Counter(
-    'wallet_request_count',
-    'Number of requests received',
-    ['endpoint', 'method', 'status']
-)
-REQUEST_LATENCY = Histogram(
-    'wallet_request_latency_seconds',
-    'Request latency in seconds',
-    ['endpoint']
+# Configure logging: handlers only enqueue, a background listener writes
+setup_logging(
+    log_file=os.getenv("LOG_FILE", "wallet.log"),
+    level=os.getenv("LOG_LEVEL", "INFO"),
+    info_sample_rate=float(os.getenv("LOG_INFO_SAMPLE_RATE", "1.0"))
 )
+logger = logging.getLogger(__name__)
 
-# Start Prometheus metrics server
-start_http_server(8001)
+# Initialize Sentry for error tracking; without a DSN it would be a no-op, so skip the import
+if os.getenv("SENTRY_DSN"):
+    import sentry_sdk
+    from sentry_sdk.integrations.fastapi import FastApiIntegration # type: ignore
+    sentry_sdk.init(
+        dsn=os.getenv("SENTRY_DSN"),
+        integrations=[FastApiIntegration()],
+        traces_sample_rate=1.0,
+        environment=os.getenv("ENVIRONMENT", "development")
+    )
 
-load_dotenv()
+# Prometheus metrics, recorded by PrometheusMiddleware
+REQUEST_COUNT, REQUEST_LATENCY, REQUEST_IN_FLIGHT = request_metrics("wallet")
+
+# Imported on first use rather than at import time; preloaded after startup
+LAZY_MODULES = ("stripe", "blockchain.wallet.wallet")
+
+def preload_lazy_modules() -> None:
+    for module in LAZY_MODULES:
+        importlib.import_module(module)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    get_chain("mainnet")
+    get_chain("testnet")
+    webhook_stop = asyncio.Event()
+    webhook_worker = asyncio.create_task(process_webhook_events(webhook_stop))
+    # Serve immediately; the first payment or wallet request waits only if this is still running
+    preload = asyncio.create_task(asyncio.to_thread(preload_lazy_modules))
+    yield
+    # Let a batch already running in its thread finish before the queue is closed
+    webhook_stop.set()
+    await webhook_worker
+    await preload
+    webhook_queue.close()
+    await payment_gateway.close()
 
 app = FastAPI(
     title="RootChain Wallet API",
     description="API for managing RootChain wallets and transactions",
     version="1.0.0",
     docs_url="/api/docs",
-    redoc_url="/api/redoc"
+    redoc_url="/api/redoc",
+    default_response_class=FastJSONResponse,
+    lifespan=lifespan
+)
+# Outbound payment calls go through a pooled async client with retries and a circuit breaker
+payment_gateway = PaymentGateway(
+    os.getenv("STRIPE_SECRET_KEY") or "",
+    api_base=os.getenv("STRIPE_API_BASE"),
+    timeout=float(os.getenv("STRIPE_TIMEOUT", "10")),
+    max_retries=int(os.getenv("STRIPE_MAX_RETRIES", "2"))
 )
-stripe.api_key = os.getenv("STRIPE_SECRET_KEY")
 API_KEY = os.getenv("API_KEY", "YJMiJqoKKSpVvzAilQ9AIB5z0UYge1YmQqqDEU1a_KM")  # Default development key
 api_key_header = APIKeyHeader(name="X-API-Key", auto_error=False)
 
 # Rate limiting
-request_counts: Dict[str, list] = {}
 RATE_LIMIT = 100  # requests per minute
-
-async def check_rate_limit(request: Request):
-    client_ip = request.client.host
-    now = time.time()
-    
-    if client_ip not in request_counts:
-        request_counts[client_ip] = []
-    
-    # Remove old requests
-    request_counts[client_ip] = [t for t in request_counts[client_ip] if now - t < 60]
-    
-    if len(request_counts[client_ip]) >= RATE_LIMIT:
+RATE_LIMIT_WINDOW = 60  # seconds
+# Per-route overrides get their own bucket, e.g. "/api/transfer:30"
+ROUTE_RATE_LIMITS = parse_limits(os.getenv("RATE_LIMIT_ROUTES"))
+# Per-API-key limits replace the per-IP limit, e.g. "partner_key:1000"
+API_KEY_RATE_LIMITS = parse_limits(os.getenv("RATE_LIMIT_API_KEYS"))
+rate_limiter = create_rate_limiter(os.getenv("RATE_LIMIT_BACKEND", "memory"))
+
+async def check_rate_limit(request: Request, api_key: Optional[str] = None):
+    if api_key and api_key in API_KEY_RATE_LIMITS:
+        client = f"key:{api_key}"
+        limit = API_KEY_RATE_LIMITS[api_key]
+    else:
+        client = f"ip:{request.client.host}"
+        limit = RATE_LIMIT
+
+    route = request.scope.get("route")
+    path = route.path if route else request.url.path
+    if path in ROUTE_RATE_LIMITS:
+        client = f"{client}:{path}"
+        limit = min(limit, ROUTE_RATE_LIMITS[path])
+
+    if not await rate_limiter.hit(client, limit, RATE_LIMIT_WINDOW):
         raise HTTPException(status_code=429, detail="Rate limit exceeded")
-    
-    request_counts[client_ip].append(now)
 
 # CORS middleware
 origins = [
@@ -104,9 +136,41 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize blockchain and wallet for both networks
-mainnet = RootChain(network="mainnet")
-testnet = RootChain(network="testnet")
+# Chains are created on first use (or at startup) rather than at import
+_chains: Dict[str, RootChain] = {}
+_chains_lock = threading.Lock()
+
+def get_chain(network: str) -> RootChain:
+    network = "testnet" if network == "testnet" else "mainnet"
+    chain = _chains.get(network)
+    if chain is None:
+        with _chains_lock:
+            chain = _chains.get(network)
+            if chain is None:
+                chain = _chains[network] = RootChain(network=network)
+                register_chain_metrics("wallet", chain)
+    return chain
+
+def __getattr__(name: str):
+    # Keeps `app.mainnet` / `from app import testnet` working
+    if name in ("mainnet", "testnet"):
+        return get_chain(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# Metrics are served from /metrics unless METRICS_PORT selects a separate port. This runs at
+# import, as middleware cannot be added after startup, so prometheus_client is not lazy
+setup_metrics(app, "wallet", port=int(os.getenv("METRICS_PORT", "0")))
+
+# Stripe webhook events are persisted here and applied by a background worker
+webhook_queue = WebhookQueue(os.getenv("WEBHOOK_QUEUE_PATH", "webhook_queue.db"))
+WEBHOOK_BATCH_SIZE = 100
+WEBHOOK_BATCH_INTERVAL = 1.0  # seconds
+
+# Symbols never change, so build their JSON payloads once
+SYMBOL_PAYLOADS = {
+    "mainnet": ROOT.to_dict(),
+    "testnet": ROOT_TESTNET.to_dict()
+}
 
 # Templates
 templates = Jinja2Templates(directory="templates")
@@ -173,9 +237,12 @@ class TransactionResponse(BaseModel):
 def get_cached_balance(chain: RootChain, address: str) -> Decimal:
     return chain.get_balance(address)
 
+# RootChain has no fee market yet, so every transfer pays the floor price
+MIN_GAS_PRICE = Decimal(os.getenv("MIN_GAS_PRICE", "0.00001"))
+
 @TTLCache(maxsize=1, ttl=10)  # Cache for 10 seconds
 def get_cached_gas_price(chain: RootChain) -> Decimal:
-    return chain.get_gas_price()
+    return MIN_GAS_PRICE
 
 async def verify_api_key(api_key: str = Depends(api_key_header)):
     if not api_key:
@@ -193,20 +260,22 @@ async def create_wallet(
     req: Request,
     api_key: str = Depends(verify_api_key)
 ):
-    await check_rate_limit(req)
+    await check_rate_limit(req, api_key)
     try:
+        from blockchain.wallet.wallet import RootWallet
         wallet = RootWallet(network=request.network)
-        wallet_info = wallet.create_wallet()  # Get wallet info using create_wallet method
+        # Key derivation is CPU-bound; keep it off the event loop
+        wallet_info = await asyncio.to_thread(wallet.create_wallet)
         
         logger.info(f"Created new wallet on {request.network}")
-        return {
+        return FastJSONResponse({
             "address": wallet_info["address"],
             "private_key": wallet_info["private_key"],
             "mnemonic": wallet_info["mnemonic"],
             "network": request.network,
-            "symbol": ROOT_TESTNET if request.network == 'testnet' else ROOT,
+            "symbol": SYMBOL_PAYLOADS[request.network],
             "balance": 0.0
-        }
+        })
     except Exception as e:
         logger.error(f"Error creating wallet: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -217,58 +286,97 @@ async def recover_wallet(
     req: Request,
     api_key: str = Depends(verify_api_key)
 ):
-    await check_rate_limit(req)
+    await check_rate_limit(req, api_key)
     try:
         # Create wallet instance first
+        from blockchain.wallet.wallet import RootWallet
         wallet = RootWallet(network=request.network)
         # Then recover using the mnemonic
-        wallet_info = wallet.recover_wallet(request.mnemonic)
+        wallet_info = await asyncio.to_thread(wallet.recover_wallet, request.mnemonic)
         
-        chain = testnet if request.network == 'testnet' else mainnet
+        chain = get_chain(request.network)
         balance = get_cached_balance(chain, wallet_info["address"])
         
-        return {
+        return FastJSONResponse({
             "address": wallet_info["address"],
             "private_key": wallet_info["private_key"],
             "mnemonic": request.mnemonic,
             "network": request.network,
-            "symbol": ROOT_TESTNET if request.network == 'testnet' else ROOT,
+            "symbol": SYMBOL_PAYLOADS[request.network],
             "balance": float(balance)
-        }
+        })
     except Exception as e:
         logger.error(f"Error recovering wallet: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+def format_transaction(tx: Dict, address: str) -> Dict:
+    return {
+        "type": 'receive' if tx['recipient'] == address else 'send',
+        "amount": float(tx['amount']),
+        "timestamp": tx['timestamp'],
+        "sender": tx['sender'],
+        "recipient": tx['recipient']
+    }
+
+def encode_cursor(block_index: int, tx_index: int) -> str:
+    return f"{block_index}-{tx_index}"
+
+def decode_cursor(cursor: Optional[str]) -> Tuple[int, int]:
+    if not cursor:
+        return (0, 0)
+    try:
+        block_index, tx_index = (int(part) for part in cursor.split("-"))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if block_index < 0 or tx_index < 0:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return (block_index, tx_index)
+
 @app.get("/api/wallet/{address}")
 async def get_wallet_info(
     address: str,
     req: Request,
     api_key: str = Depends(verify_api_key),
-    network: str = 'mainnet'
+    network: str = 'mainnet',
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    since: Optional[float] = None,
+    format: str = Query('json', pattern='^(json|ndjson)$')
 ):
-    await check_rate_limit(req)
+    await check_rate_limit(req, api_key)
+    start = decode_cursor(cursor)
     try:
-        chain = testnet if network == 'testnet' else mainnet
+        chain = get_chain(network)
+        transactions = chain.iter_transactions_by_address(address, start=start, since=since)
+
+        if format == 'ndjson':
+            # Stream the whole history (from cursor/since) one line per transaction
+            def stream_transactions():
+                for _, _, tx in transactions:
+                    yield json_dumps(format_transaction(tx, address)) + b"\n"
+
+            return StreamingResponse(stream_transactions(), media_type="application/x-ndjson")
+
+        page = []
+        next_cursor = None
+        for block_index, tx_index, tx in transactions:
+            if len(page) == limit:
+                next_cursor = encode_cursor(block_index, tx_index)
+                break
+            page.append(format_transaction(tx, address))
+
         balance = get_cached_balance(chain, address)
-        transactions = chain.get_transactions(address)
-        
-        formatted_transactions = []
-        for tx in transactions:
-            tx_type = 'receive' if tx['recipient'] == address else 'send'
-            formatted_transactions.append({
-                "type": tx_type,
-                "amount": float(tx['amount']),
-                "timestamp": tx['timestamp'],
-                "sender": tx['sender'],
-                "recipient": tx['recipient']
-            })
-        
-        return {
+        return FastJSONResponse({
             "address": address,
             "balance": float(balance),
-            "symbol": ROOT_TESTNET if network == 'testnet' else ROOT,
-            "transactions": formatted_transactions
-        }
+            "network": network,
+            "symbol": SYMBOL_PAYLOADS["testnet" if network == 'testnet' else "mainnet"],
+            "transactions": page,
+            "next_cursor": next_cursor
+        })
     except Exception as e:
         logger.error(f"Error getting wallet info: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -279,13 +387,17 @@ async def transfer_tokens(
     req: Request,
     api_key: str = Depends(verify_api_key)
 ):
-    await check_rate_limit(req)
+    await check_rate_limit(req, api_key)
     try:
-        chain = testnet if request.network == 'testnet' else mainnet
-        wallet = RootWallet.from_private_key(
-            request.private_key,
-            network_type=request.network
-        )
+        chain = get_chain(request.network)
+        from blockchain.wallet.wallet import RootWallet
+        try:
+            wallet = RootWallet.from_private_key(
+                request.private_key,
+                network_type=request.network
+            )
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid wallet credentials")
         
         if wallet.address != request.from_address:
             raise HTTPException(status_code=400, detail="Invalid wallet credentials")
@@ -310,7 +422,8 @@ async def transfer_tokens(
             "gas_limit": float(gas_limit)
         }
         
-        chain.add_transaction(tx)
+        if not chain.add_transaction(tx["sender"], tx["recipient"], tx["amount"]):
+            raise HTTPException(status_code=400, detail="Transaction rejected")
         logger.info(f"Transfer successful: {request.amount} tokens from {wallet.address} to {request.to_address}")
         
         return TransactionResponse(
@@ -320,6 +433,8 @@ async def transfer_tokens(
             gas_used=gas_limit,
             fee=fee
         )
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error in transfer: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -330,7 +445,7 @@ async def create_payment_intent(payment: PaymentIntent):
         # Calculate token amount
         token_amount = payment.amount / Decimal('90.0')  # $90 = 1 ROOT/tROOT
         
-        intent = stripe.PaymentIntent.create(
+        intent = await payment_gateway.create_payment_intent(
             amount=int(payment.amount * 100),  # Convert to cents
             currency="usd",
             metadata={
@@ -345,12 +460,51 @@ async def create_payment_intent(payment: PaymentIntent):
             "token_amount": float(token_amount),
             "wallet_address": payment.wallet_address
         }
+    except CircuitOpenError as e:
+        logger.warning(f"Payment intent rejected: {str(e)}")
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         logger.error(f"Error creating payment intent: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+def apply_webhook_event(event: Dict) -> None:
+    """
+    Credit purchased tokens for a queued payment_intent.succeeded event
+
+    Runs inside the queue's batch transaction, which marks the event applied
+    and rolls that back if this raises, so it is only called once per event.
+    """
+    payment_intent = json.loads(event["payload"])["data"]["object"]
+    metadata = payment_intent.get("metadata") or {}
+    network = metadata.get("network", "mainnet")
+    recipient_address = metadata.get("recipient_address")
+    token_amount = Decimal(metadata.get("token_amount", "0"))
+
+    if not recipient_address:
+        raise ValueError("No recipient address provided")
+
+    # Select appropriate chain and treasury address
+    chain = get_chain(network)
+    treasury = f"{chain.prefix}_treasury"
+
+    if not chain.add_transaction(treasury, recipient_address, float(token_amount)):
+        raise ValueError(f"Transaction rejected for {recipient_address}")
+    logger.info(f"ICO purchase successful: {token_amount} tokens sent to {recipient_address}")
+
+async def process_webhook_events(stop: asyncio.Event) -> None:
+    """Background worker applying queued webhook events in batches until stop is set."""
+    while not stop.is_set():
+        try:
+            await asyncio.to_thread(webhook_queue.process_batch, apply_webhook_event, WEBHOOK_BATCH_SIZE)
+        except Exception as e:
+            logger.error(f"Error applying webhook events: {str(e)}")
+        with suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(stop.wait(), WEBHOOK_BATCH_INTERVAL)
+
 @app.post("/api/payment/webhook")
 async def stripe_webhook(request: Request):
+    import stripe
+
     payload = await request.body()
     sig_header = request.headers.get("stripe-signature")
     
@@ -358,42 +512,19 @@ async def stripe_webhook(request: Request):
         event = stripe.Webhook.construct_event(
             payload, sig_header, os.getenv("STRIPE_WEBHOOK_SECRET")
         )
-        
-        if event.type == "payment_intent.succeeded":
-            payment_intent = event.data.object
-            metadata = payment_intent.metadata
-            network = metadata.get("network", "mainnet")
-            recipient_address = metadata.get("recipient_address")
-            token_amount = Decimal(metadata.get("token_amount", "0"))
-            
-            if not recipient_address:
-                logger.error("No recipient address provided in payment metadata")
-                raise ValueError("No recipient address provided")
-            
-            # Select appropriate chain and treasury address
-            chain = mainnet if network == "mainnet" else testnet
-            treasury = "rtc_treasury" if network == "mainnet" else "trtc_treasury"
-            
-            # Create and send the transaction
-            tx = {
-                "sender": treasury,
-                "recipient": recipient_address,
-                "amount": float(token_amount),
-                "timestamp": int(time.time()),
-                "type": "ico_purchase"
-            }
-            
-            chain.add_transaction(tx)
-            logger.info(f"ICO purchase successful: {token_amount} tokens sent to {recipient_address}")
-            
-            return {
-                "status": "success",
-                "transaction": tx
-            }
     except Exception as e:
         logger.error(f"Error processing webhook: {str(e)}")
         raise HTTPException(status_code=400, detail=str(e))
 
+    if event.type != "payment_intent.succeeded":
+        return {"status": "ignored", "event_id": event.id}
+
+    # Persist and acknowledge; the worker credits tokens asynchronously
+    queued = await asyncio.to_thread(
+        webhook_queue.enqueue, event.id, event.type, payload.decode("utf-8")
+    )
+    return {"status": "queued" if queued else "duplicate", "event_id": event.id}
+
 @app.get("/")
 async def root():
     return RedirectResponse(url="http://localhost:3001")
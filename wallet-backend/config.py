@@ -33,13 +33,14 @@ class Settings(BaseSettings):
     MIN_GAS_PRICE: float = 0.00001
     
     # Monitoring Settings
-    PROMETHEUS_PORT: int = 8001
+    METRICS_PORT: int = 0  # 0 serves /metrics on the API port
     SENTRY_DSN: str = ""
     LOG_LEVEL: str = "INFO"
     LOG_FILE: str = "logs/wallet.log"
     LOG_FORMAT: str = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
     LOG_MAX_BYTES: int = 10 * 1024 * 1024  # 10MB
     LOG_BACKUP_COUNT: int = 5
+    LOG_INFO_SAMPLE_RATE: float = 1.0  # Fraction of INFO logs kept
     
     # Security Settings
     CORS_ORIGINS: list = ["*"]
@@ -1,66 +1,162 @@
 import logging
 import json
-from datetime import datetime
+import atexit
+import copy
+import queue
+from datetime import datetime, timezone
 from typing import Any, Dict, Optional
 import os
-from logging.handlers import RotatingFileHandler
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+_listener: Optional[QueueListener] = None
+
+_exception_formatter = logging.Formatter()
+
+class DeferredQueueHandler(QueueHandler):
+    """QueueHandler that leaves formatting to the listener thread.
+
+    The stock QueueHandler runs the full formatter before enqueueing, which
+    puts timestamps and JSON rendering back on the request path. This one
+    only freezes what the caller could still change once the call returns:
+    the message is interpolated, since args may be mutable objects, and the
+    traceback is rendered to text.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = _exception_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        structured = getattr(record, "structured", None)
+        if structured is not None:
+            record.structured = dict(structured)
+        return record
+
+class InfoSamplingFilter(logging.Filter):
+    """Keep a fixed fraction of INFO-and-below records; always keep warnings.
+
+    Sampling is deterministic: a rate of 0.25 keeps exactly every fourth
+    record, so dropped records cost nothing beyond this check.
+    """
+
+    def __init__(self, rate: float = 1.0):
+        super().__init__()
+        self.rate = max(0.0, min(1.0, rate))
+        self.credit = 0.0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.INFO or self.rate >= 1.0:
+            return True
+        self.credit += self.rate
+        if self.credit >= 1.0:
+            self.credit -= 1.0
+            return True
+        return False
+
+class StructuredFormatter(logging.Formatter):
+    """Renders StructuredLogger records as JSON, other records as plain text."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        fields = getattr(record, "structured", None)
+        if fields is not None:
+            log_data = {
+                "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+                "message": record.getMessage()
+            }
+            log_data.update(fields)
+            record = copy.copy(record)
+            record.msg = json.dumps(log_data, default=str)
+            record.args = None
+        return super().format(record)
+
+def setup_logging(
+    log_file: str = 'logs/wallet.log',
+    level: str = 'INFO',
+    max_bytes: int = 10 * 1024 * 1024,
+    backup_count: int = 5,
+    info_sample_rate: float = 1.0,
+    log_format: str = LOG_FORMAT
+) -> QueueListener:
+    """
+    Route root logging through a queue drained by a background listener
+
+    Callers only enqueue records. The listener thread formats them and
+    writes to a rotating file and the console. Safe to call more than once;
+    only the first call configures logging.
+    """
+    global _listener
+    if _listener is not None:
+        return _listener
+
+    log_dir = os.path.dirname(log_file)
+    if log_dir:
+        os.makedirs(log_dir, exist_ok=True)
+
+    formatter = StructuredFormatter(log_format)
+    file_handler = RotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=backup_count)
+    file_handler.setFormatter(formatter)
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(formatter)
+
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    queue_handler = DeferredQueueHandler(log_queue)
+    queue_handler.addFilter(InfoSamplingFilter(info_sample_rate))
+
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(queue_handler)
+
+    _listener = QueueListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+    return _listener
+
+def stop_logging() -> None:
+    """Flush queued records and stop the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
 
 class StructuredLogger:
+    """Logger whose records carry extra fields rendered as JSON off-thread.
+
+    Handlers are configured once by setup_logging, so constructing several
+    StructuredLoggers for the same name no longer duplicates output.
+    """
+
     def __init__(self, name: str):
         self.logger = logging.getLogger(name)
-        self.logger.setLevel(logging.INFO)
-        
-        # Create logs directory if it doesn't exist
-        os.makedirs('logs', exist_ok=True)
-        
-        # File handler with rotation
-        file_handler = RotatingFileHandler(
-            'logs/wallet.log',
-            maxBytes=10*1024*1024,  # 10MB
-            backupCount=5
-        )
-        file_handler.setLevel(logging.INFO)
-        
-        # Console handler
-        console_handler = logging.StreamHandler()
-        console_handler.setLevel(logging.INFO)
-        
-        # Create formatters and add it to the handlers
-        log_format = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        file_formatter = logging.Formatter(log_format)
-        console_formatter = logging.Formatter(log_format)
-        
-        file_handler.setFormatter(file_formatter)
-        console_handler.setFormatter(console_formatter)
-        
-        # Add the handlers to the logger
-        self.logger.addHandler(file_handler)
-        self.logger.addHandler(console_handler)
-    
-    def _format_message(
+
+    def _log(
         self,
+        level: int,
         message: str,
-        extra: Optional[Dict[str, Any]] = None
-    ) -> str:
-        log_data = {
-            "timestamp": datetime.utcnow().isoformat(),
-            "message": message
-        }
-        if extra:
-            log_data.update(extra)
-        return json.dumps(log_data)
-    
+        extra: Optional[Dict[str, Any]] = None,
+        exc_info=False
+    ):
+        if self.logger.isEnabledFor(level):
+            self.logger.log(level, message, extra={"structured": extra or {}}, exc_info=exc_info)
+
     def info(self, message: str, extra: Optional[Dict[str, Any]] = None):
-        self.logger.info(self._format_message(message, extra))
-    
+        self._log(logging.INFO, message, extra)
+
     def warning(self, message: str, extra: Optional[Dict[str, Any]] = None):
-        self.logger.warning(self._format_message(message, extra))
-    
+        self._log(logging.WARNING, message, extra)
+
     def error(self, message: str, extra: Optional[Dict[str, Any]] = None, exc_info=True):
-        self.logger.error(self._format_message(message, extra), exc_info=exc_info)
-    
+        self._log(logging.ERROR, message, extra, exc_info=exc_info)
+
     def critical(self, message: str, extra: Optional[Dict[str, Any]] = None, exc_info=True):
-        self.logger.critical(self._format_message(message, extra), exc_info=exc_info)
+        self._log(logging.CRITICAL, message, extra, exc_info=exc_info)
 
 # Create logger instance
-logger = StructuredLogger('wallet_backend') 
\ No newline at end of file
+logger = StructuredLogger('wallet_backend')
@@ -0,0 +1,149 @@
+import time
+from typing import Any, Dict, Optional
+
+from prometheus_client import Counter, Histogram
+
+STRIPE_REQUEST_LATENCY = Histogram(
+    'wallet_stripe_request_latency_seconds',
+    'Latency of outbound Stripe calls in seconds, including retries',
+    ['operation', 'outcome']
+)
+STRIPE_CIRCUIT_REJECTIONS = Counter(
+    'wallet_stripe_circuit_rejections',
+    'Stripe calls rejected because the circuit breaker was open',
+    ['operation']
+)
+
+class CircuitOpenError(Exception):
+    """Raised when calls are short-circuited after repeated upstream failures."""
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker.
+
+    After failure_threshold consecutive failures the circuit opens and calls
+    fail fast. Once reset_timeout has passed a single trial call is let
+    through (half-open); its outcome closes or re-opens the circuit.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.trial_in_progress = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half-open" and not self.trial_in_progress:
+            self.trial_in_progress = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self.trial_in_progress = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self.trial_in_progress = False
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+
+def _is_upstream_failure(error: Exception) -> bool:
+    import stripe
+
+    # Client errors (bad params, declined cards) say nothing about Stripe's health
+    if isinstance(error, (stripe.APIConnectionError, stripe.RateLimitError)):
+        return True
+    if isinstance(error, stripe.StripeError):
+        return error.http_status is None or error.http_status >= 500
+    return True
+
+class PaymentGateway:
+    """
+    Async Stripe client for request handlers
+
+    Uses one pooled keep-alive httpx client. Calls are awaited rather than
+    blocking the event loop. Connection errors and 5xx responses are retried
+    by the Stripe SDK with jittered exponential backoff, under an idempotency
+    key. A circuit breaker fails fast while Stripe is unhealthy. The SDK is
+    imported on first use, since importing it is a large part of startup.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        api_base: Optional[str] = None,
+        timeout: float = 10.0,
+        max_retries: int = 2,
+        breaker: Optional[CircuitBreaker] = None
+    ):
+        self.api_key = api_key
+        self.api_base = api_base
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.breaker = breaker or CircuitBreaker()
+        self.http_client = None
+        self._client = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            import stripe
+
+            self.http_client = stripe.HTTPXClient(timeout=self.timeout)
+            self._client = stripe.StripeClient(
+                self.api_key,
+                http_client=self.http_client,
+                max_network_retries=self.max_retries,
+                base_addresses={"api": self.api_base} if self.api_base else None
+            )
+        return self._client
+
+    async def create_payment_intent(self, **params: Any) -> Any:
+        return await self._call(
+            "create_payment_intent",
+            self.client.v1.payment_intents.create_async,
+            params
+        )
+
+    async def _call(self, operation: str, method, params: Dict[str, Any]) -> Any:
+        if not self.breaker.allow():
+            STRIPE_CIRCUIT_REJECTIONS.labels(operation).inc()
+            raise CircuitOpenError("Payment provider temporarily unavailable")
+
+        start = time.perf_counter()
+        outcome = "cancelled"
+        try:
+            result = await method(params=params)
+            outcome = "success"
+            self.breaker.record_success()
+            return result
+        except Exception as e:
+            if _is_upstream_failure(e):
+                outcome = "failure"
+                self.breaker.record_failure()
+            else:
+                outcome = "rejected"
+                self.breaker.record_success()
+            raise
+        finally:
+            if outcome == "cancelled":
+                # Let the next call act as the half-open trial instead
+                self.breaker.trial_in_progress = False
+            STRIPE_REQUEST_LATENCY.labels(operation, outcome).observe(time.perf_counter() - start)
+
+    async def close(self) -> None:
+        if self.http_client is not None:
+            await self.http_client.close_async()
@@ -0,0 +1,133 @@
+import os
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Dict, Optional
+
+class RateLimiter(ABC):
+    """Base class for rate limiter backends.
+
+    Limiters use a sliding-window counter: the request count of the current
+    fixed window plus the previous window's count weighted by how much of it
+    still overlaps the sliding window. Each key costs O(1) time and memory.
+    """
+
+    @abstractmethod
+    async def hit(self, key: str, limit: int, window: int) -> bool:
+        """Record a request for key and return False if it exceeds limit."""
+        pass
+
+class _Window:
+    __slots__ = ("start", "current", "previous", "expires")
+
+    def __init__(self, start: float, expires: float):
+        self.start = start
+        self.current = 0
+        self.previous = 0
+        self.expires = expires
+
+class MemoryRateLimiter(RateLimiter):
+    """In-process limiter. Limits only hold within a single worker."""
+
+    def __init__(self, max_entries: int = 100_000):
+        self.max_entries = max_entries
+        # Ordered by last access so idle keys sit at the front
+        self.entries: "OrderedDict[str, _Window]" = OrderedDict()
+
+    async def hit(self, key: str, limit: int, window: int) -> bool:
+        return self.hit_sync(key, limit, window)
+
+    def hit_sync(self, key: str, limit: int, window: int, now: Optional[float] = None) -> bool:
+        if now is None:
+            now = time.time()
+        window_start = now - (now % window)
+
+        entry = self.entries.get(key)
+        if entry is None:
+            entry = _Window(window_start, window_start + 2 * window)
+            self.entries[key] = entry
+        else:
+            if entry.start != window_start:
+                # Only the immediately preceding window still overlaps
+                adjacent = window_start - entry.start == window
+                entry.previous = entry.current if adjacent else 0
+                entry.current = 0
+                entry.start = window_start
+                entry.expires = window_start + 2 * window
+            self.entries.move_to_end(key)
+
+        weight = (window - (now - window_start)) / window
+        allowed = entry.previous * weight + entry.current < limit
+        if allowed:
+            entry.current += 1
+
+        self._evict(now)
+        return allowed
+
+    def _evict(self, now: float) -> None:
+        entries = self.entries
+        while entries:
+            key, entry = next(iter(entries.items()))
+            if entry.expires > now and len(entries) <= self.max_entries:
+                break
+            del entries[key]
+
+# Sliding-window counter evaluated atomically on the Redis server, using the
+# server clock so every worker and host agrees on window boundaries.
+_REDIS_SLIDING_WINDOW = """
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local index = math.floor(now / window)
+local current_key = KEYS[1] .. ':' .. index
+local previous_key = KEYS[1] .. ':' .. (index - 1)
+local current = tonumber(redis.call('GET', current_key) or '0')
+local previous = tonumber(redis.call('GET', previous_key) or '0')
+local weight = (window - (now - index * window)) / window
+if previous * weight + current >= limit then
+    return 0
+end
+redis.call('INCR', current_key)
+redis.call('EXPIRE', current_key, window * 2)
+return 1
+"""
+
+class RedisRateLimiter(RateLimiter):
+    """Shared limiter backed by Redis, so limits hold across workers and hosts."""
+
+    def __init__(self, client, prefix: str = "rootchain:ratelimit"):
+        self.client = client
+        self.prefix = prefix
+        self.script = client.register_script(_REDIS_SLIDING_WINDOW)
+
+    async def hit(self, key: str, limit: int, window: int) -> bool:
+        result = await self.script(keys=[f"{self.prefix}:{key}"], args=[limit, window])
+        return bool(result)
+
+def create_rate_limiter(backend: str = "memory") -> RateLimiter:
+    if backend == "redis":
+        import redis.asyncio as aioredis
+
+        client = aioredis.Redis(
+            host=os.getenv('REDIS_HOST', 'localhost'),
+            port=int(os.getenv('REDIS_PORT', 6379)),
+            db=0
+        )
+        return RedisRateLimiter(client)
+    if backend == "memory":
+        return MemoryRateLimiter()
+    raise ValueError(f"Invalid rate limit backend: {backend}")
+
+def parse_limits(spec: Optional[str]) -> Dict[str, int]:
+    """Parse "name:limit,name:limit" into a dict, e.g. "/api/transfer:30"."""
+    limits: Dict[str, int] = {}
+    if not spec:
+        return limits
+    for item in spec.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        name, _, limit = item.rpartition(":")
+        limits[name] = int(limit)
+    return limits
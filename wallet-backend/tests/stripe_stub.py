@@ -0,0 +1,129 @@
+"""
+Local stand-in for Stripe used by the payment tests
+
+Builds webhook payloads signed exactly the way Stripe signs them, so
+requests go through the real stripe.Webhook.construct_event verification,
+and serves a minimal Stripe REST API over real HTTP for outbound calls.
+"""
+
+import hashlib
+import hmac
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs
+
+WEBHOOK_SECRET = "whsec_test_secret"
+
+def sign_payload(payload: str, secret: str = WEBHOOK_SECRET, timestamp: Optional[int] = None) -> str:
+    timestamp = int(time.time()) if timestamp is None else timestamp
+    signed = f"{timestamp}.{payload}".encode()
+    signature = hmac.new(secret.encode(), signed, hashlib.sha256).hexdigest()
+    return f"t={timestamp},v1={signature}"
+
+def payment_succeeded_event(
+    event_id: str,
+    recipient_address: str,
+    token_amount: str,
+    network: str = "testnet",
+    secret: str = WEBHOOK_SECRET
+) -> Tuple[str, Dict[str, str]]:
+    """Return (payload, headers) for a signed payment_intent.succeeded event."""
+    payload = json.dumps({
+        "id": event_id,
+        "object": "event",
+        "type": "payment_intent.succeeded",
+        "data": {
+            "object": {
+                "id": f"pi_{event_id}",
+                "object": "payment_intent",
+                "amount": 9000,
+                "metadata": {
+                    "product": "ROOT_TOKEN",
+                    "network": network,
+                    "recipient_address": recipient_address,
+                    "token_amount": token_amount
+                }
+            }
+        }
+    })
+    return payload, {"stripe-signature": sign_payload(payload, secret), "content-type": "application/json"}
+
+class StripeMockServer:
+    """
+    Minimal Stripe API on localhost, usable as a context manager
+
+    Set fail_next to answer that many requests with a 500, and delay to
+    slow every response down. Received requests are kept in requests.
+    """
+
+    def __init__(self):
+        self.fail_next = 0
+        self.delay = 0.0
+        self.requests: List[Dict] = []
+        self.lock = threading.Lock()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "StripeMockServer":
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _handler(self):
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, status: int, body: Dict) -> None:
+                data = json.dumps(body).encode()
+                try:
+                    self.send_response(status)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(data)))
+                    self.end_headers()
+                    self.wfile.write(data)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # Client gave up, e.g. after a timeout
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                form = parse_qs(self.rfile.read(length).decode())
+                with mock.lock:
+                    mock.requests.append({
+                        "path": self.path,
+                        "form": form,
+                        "idempotency_key": self.headers.get("Idempotency-Key")
+                    })
+                    fail = mock.fail_next > 0
+                    if fail:
+                        mock.fail_next -= 1
+                if mock.delay:
+                    time.sleep(mock.delay)
+                if fail:
+                    self._reply(500, {"error": {"type": "api_error", "message": "Mock outage"}})
+                elif self.path == "/v1/payment_intents":
+                    intent_id = f"pi_mock_{len(mock.requests)}"
+                    self._reply(200, {
+                        "id": intent_id,
+                        "object": "payment_intent",
+                        "amount": int(form["amount"][0]),
+                        "currency": form["currency"][0],
+                        "client_secret": f"{intent_id}_secret_mock"
+                    })
+                else:
+                    self._reply(404, {"error": {"type": "invalid_request_error", "message": "Unknown path"}})
+
+        return Handler
@@ -0,0 +1,77 @@
+import json
+import logging
+import queue
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from logger import DeferredQueueHandler, InfoSamplingFilter, StructuredFormatter, StructuredLogger
+
+def make_record(level=logging.INFO, msg="hello %s", args=("world",)):
+    return logging.LogRecord("test", level, __file__, 1, msg, args, None)
+
+def test_sampling_keeps_exact_fraction():
+    sampler = InfoSamplingFilter(0.25)
+    kept = sum(sampler.filter(make_record()) for _ in range(100))
+    assert kept == 25
+
+def test_sampling_never_drops_warnings():
+    sampler = InfoSamplingFilter(0.0)
+    assert not sampler.filter(make_record(logging.INFO))
+    assert sampler.filter(make_record(logging.WARNING))
+    assert sampler.filter(make_record(logging.ERROR))
+
+def test_queue_handler_defers_formatting():
+    log_queue = queue.SimpleQueue()
+    handler = DeferredQueueHandler(log_queue)
+    handler.setFormatter(logging.Formatter("%(levelname)s %(message)s"))
+    record = make_record()
+    handler.handle(record)
+    queued = log_queue.get_nowait()
+    assert queued.msg == "hello world"
+    assert queued.args is None
+    assert record.args == ("world",)
+
+def test_queue_handler_freezes_mutable_args():
+    log_queue = queue.SimpleQueue()
+    handler = DeferredQueueHandler(log_queue)
+    balances = {"trtc_a": 1.0}
+    handler.handle(make_record(msg="balances %s", args=(balances,)))
+    balances["trtc_a"] = 0.0
+    line = StructuredFormatter("%(message)s").format(log_queue.get_nowait())
+    assert line == "balances {'trtc_a': 1.0}"
+
+def test_queue_handler_renders_traceback_before_enqueueing():
+    log_queue = queue.SimpleQueue()
+    handler = DeferredQueueHandler(log_queue)
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        record = logging.LogRecord("test", logging.ERROR, __file__, 1, "failed", None, sys.exc_info())
+    handler.handle(record)
+    queued = log_queue.get_nowait()
+    assert queued.exc_info is None
+    assert "ValueError: boom" in queued.exc_text
+    assert StructuredFormatter("%(message)s").format(queued).endswith("ValueError: boom")
+
+def test_structured_logger_renders_json_in_formatter():
+    log_queue = queue.SimpleQueue()
+    structured = StructuredLogger("test_structured")
+    structured.logger.addHandler(DeferredQueueHandler(log_queue))
+    structured.logger.propagate = False
+    structured.logger.setLevel(logging.INFO)
+    try:
+        structured.info("Wallet created", {"network": "testnet"})
+    finally:
+        structured.logger.handlers.clear()
+
+    record = log_queue.get_nowait()
+    line = StructuredFormatter("%(message)s").format(record)
+    data = json.loads(line)
+    assert data["message"] == "Wallet created"
+    assert data["network"] == "testnet"
+    assert "timestamp" in data
+
+def test_plain_records_are_formatted_as_text():
+    line = StructuredFormatter("%(levelname)s %(message)s").format(make_record())
+    assert line == "INFO hello world"
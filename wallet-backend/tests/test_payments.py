@@ -0,0 +1,80 @@
+import pytest
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+import stripe
+from stripe._http_client import HTTPClient
+from payments import CircuitBreaker, CircuitOpenError, PaymentGateway
+from stripe_stub import StripeMockServer
+
+@pytest.fixture
+def stripe_mock(monkeypatch):
+    # Keep the SDK's jittered backoff, just shorter
+    monkeypatch.setattr(HTTPClient, "INITIAL_DELAY", 0.01)
+    monkeypatch.setattr(HTTPClient, "MAX_DELAY", 0.02)
+    with StripeMockServer() as server:
+        yield server
+
+def make_gateway(server, **kwargs):
+    return PaymentGateway("sk_test_mock", api_base=server.url, **kwargs)
+
+INTENT = {"amount": 9000, "currency": "usd", "metadata": {"network": "testnet"}}
+
+@pytest.mark.asyncio
+async def test_create_payment_intent(stripe_mock):
+    gateway = make_gateway(stripe_mock)
+    try:
+        intent = await gateway.create_payment_intent(**INTENT)
+    finally:
+        await gateway.close()
+    assert intent.client_secret.endswith("_secret_mock")
+    assert stripe_mock.requests[0]["form"]["metadata[network]"] == ["testnet"]
+
+@pytest.mark.asyncio
+async def test_retries_reuse_idempotency_key(stripe_mock):
+    stripe_mock.fail_next = 2
+    gateway = make_gateway(stripe_mock, max_retries=2)
+    try:
+        intent = await gateway.create_payment_intent(**INTENT)
+    finally:
+        await gateway.close()
+    assert intent.id
+    assert len(stripe_mock.requests) == 3
+    assert len({r["idempotency_key"] for r in stripe_mock.requests}) == 1
+
+@pytest.mark.asyncio
+async def test_timeout_is_enforced(stripe_mock):
+    stripe_mock.delay = 0.5
+    gateway = make_gateway(stripe_mock, timeout=0.1, max_retries=0)
+    try:
+        with pytest.raises(stripe.APIConnectionError):
+            await gateway.create_payment_intent(**INTENT)
+    finally:
+        await gateway.close()
+
+@pytest.mark.asyncio
+async def test_circuit_opens_after_failures(stripe_mock):
+    stripe_mock.fail_next = 100
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    gateway = make_gateway(stripe_mock, max_retries=0, breaker=breaker)
+    try:
+        for _ in range(2):
+            with pytest.raises(stripe.APIError):
+                await gateway.create_payment_intent(**INTENT)
+        with pytest.raises(CircuitOpenError):
+            await gateway.create_payment_intent(**INTENT)
+    finally:
+        await gateway.close()
+    assert len(stripe_mock.requests) == 2
+    assert breaker.state == "open"
+
+def test_breaker_half_open_allows_single_trial():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+    assert breaker.state == "half-open"
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
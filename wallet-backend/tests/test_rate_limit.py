@@ -0,0 +1,66 @@
+import pytest
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from rate_limit import MemoryRateLimiter, RateLimiter, create_rate_limiter, parse_limits
+
+def test_blocks_after_limit():
+    limiter = MemoryRateLimiter()
+    results = [limiter.hit_sync("ip:1", 3, 60, now=1200.0) for _ in range(4)]
+    assert results == [True, True, True, False]
+
+def test_keys_are_independent():
+    limiter = MemoryRateLimiter()
+    for _ in range(3):
+        limiter.hit_sync("ip:1", 3, 60, now=1200.0)
+    assert not limiter.hit_sync("ip:1", 3, 60, now=1200.0)
+    assert limiter.hit_sync("ip:2", 3, 60, now=1200.0)
+
+def test_previous_window_is_weighted():
+    limiter = MemoryRateLimiter()
+    for _ in range(10):
+        limiter.hit_sync("ip:1", 10, 60, now=1200.0)
+    # Halfway into the next window half of the previous count still applies
+    allowed = sum(limiter.hit_sync("ip:1", 10, 60, now=1290.0) for _ in range(10))
+    assert allowed == 5
+
+def test_old_windows_are_forgotten():
+    limiter = MemoryRateLimiter()
+    for _ in range(10):
+        limiter.hit_sync("ip:1", 10, 60, now=1200.0)
+    assert limiter.hit_sync("ip:1", 10, 60, now=1400.0)
+
+def test_idle_entries_are_evicted():
+    limiter = MemoryRateLimiter()
+    for i in range(100):
+        limiter.hit_sync(f"ip:{i}", 10, 60, now=1200.0)
+    limiter.hit_sync("ip:new", 10, 60, now=1400.0)
+    assert list(limiter.entries) == ["ip:new"]
+
+def test_max_entries_is_enforced():
+    limiter = MemoryRateLimiter(max_entries=10)
+    for i in range(100):
+        limiter.hit_sync(f"ip:{i}", 10, 60, now=1200.0)
+    assert len(limiter.entries) == 10
+    assert "ip:99" in limiter.entries
+
+@pytest.mark.asyncio
+async def test_async_hit():
+    limiter = MemoryRateLimiter()
+    assert await limiter.hit("ip:1", 1, 60)
+    assert not await limiter.hit("ip:1", 1, 60)
+
+def test_backend_is_validated():
+    assert isinstance(create_rate_limiter("memory"), MemoryRateLimiter)
+    with pytest.raises(ValueError):
+        create_rate_limiter("memcached")
+    with pytest.raises(TypeError):
+        RateLimiter()
+
+def test_parse_limits():
+    assert parse_limits("/api/transfer:30, key_abc:1000") == {
+        "/api/transfer": 30,
+        "key_abc": 1000
+    }
+    assert parse_limits(None) == {}
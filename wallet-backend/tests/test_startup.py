@@ -0,0 +1,71 @@
+import json
+import os
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BACKEND_DIR)
+from fastapi.testclient import TestClient
+import app as backend
+from payments import PaymentGateway
+from webhook_queue import WebhookQueue
+
+# Generous for slow CI machines; importing eagerly took ~1.3s on a dev laptop
+STARTUP_BUDGET = float(os.getenv("STARTUP_BUDGET_SECONDS", "1.0"))
+# prometheus_client is not listed: setup_metrics adds its middleware while the
+# app module is imported, since Starlette refuses middleware once the app has
+# started, and the import itself takes about 45ms
+HEAVY_MODULES = ["stripe", "hdwallet", "mnemonic", "sentry_sdk"]
+
+PROBE = """
+import asyncio, json, sys, time
+started = time.perf_counter()
+import app
+imported = time.perf_counter() - started
+loaded_at_import = [m for m in HEAVY if m in sys.modules]
+
+async def run_lifespan():
+    async with app.app.router.lifespan_context(app.app):
+        pass
+
+asyncio.run(run_lifespan())
+print(json.dumps({
+    "import_seconds": imported,
+    "loaded_at_import": loaded_at_import,
+    "loaded_after_startup": [m for m in HEAVY if m in sys.modules]
+}))
+"""
+
+def probe(tmp_path):
+    env = dict(
+        os.environ,
+        LOG_FILE=str(tmp_path / "wallet.log"),
+        WEBHOOK_QUEUE_PATH=str(tmp_path / "webhook_queue.db"),
+        SENTRY_DSN=""
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", f"HEAVY = {HEAVY_MODULES!r}\n{PROBE}"],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def test_import_stays_within_startup_budget(tmp_path):
+    # Best of three, so one noisy run does not fail the build
+    best = min(probe(tmp_path)["import_seconds"] for _ in range(3))
+    assert best < STARTUP_BUDGET, f"import app took {best:.2f}s (budget {STARTUP_BUDGET}s)"
+
+def test_heavy_dependencies_load_after_startup(tmp_path):
+    result = probe(tmp_path)
+    assert result["loaded_at_import"] == []
+    assert {"stripe", "hdwallet", "mnemonic"} <= set(result["loaded_after_startup"])
+
+def test_lifespan_serves_and_shuts_down(tmp_path, monkeypatch):
+    # The lifespan closes these on the way out, so the shared ones stay open for other tests
+    queue = WebhookQueue(str(tmp_path / "webhook_queue.db"))
+    monkeypatch.setattr(backend, "webhook_queue", queue)
+    monkeypatch.setattr(backend, "payment_gateway", PaymentGateway(""))
+    with TestClient(backend.app) as client:
+        assert client.get("/health").status_code == 200
+        assert {"mainnet", "testnet"} <= set(backend._chains)
+    assert queue.closed
+    assert "stripe" in sys.modules
@@ -4,6 +4,8 @@ from decimal import Decimal
 from unittest.mock import Mock, patch
 import sys
 import os
+import json
+import time
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app import app, mainnet, testnet
@@ -166,4 +168,57 @@ def test_full_wallet_workflow():
             "private_key": wallet_data["private_key"]
         }
     )
-    assert transfer_response.status_code in [200, 400]  # Either success or insufficient balance 
\ No newline at end of file
+    assert transfer_response.status_code in [200, 400]  # Either success or insufficient balance 
+
+
+@pytest.fixture
+def funded_testnet_address():
+    address = f"trtc_history_{len(testnet.chain)}_{time.time_ns()}"
+    for amount in range(1, 6):
+        testnet.add_transaction("trtc_treasury", address, float(amount))
+    testnet.mine_pending_transactions("trtc_miner")
+    return address
+
+def test_get_wallet_details_paginates(funded_testnet_address):
+    address = funded_testnet_address
+    amounts = []
+    cursor = None
+    pages = 0
+    while True:
+        params = {"network": "testnet", "limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get(f"/api/wallet/{address}", params=params)
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data["transactions"]) <= 2 and data["network"] == "testnet"
+        amounts.extend(tx["amount"] for tx in data["transactions"])
+        pages += 1
+        cursor = data["next_cursor"]
+        if cursor is None:
+            break
+    assert amounts == [1.0, 2.0, 3.0, 4.0, 5.0]
+    assert pages == 3
+
+def test_get_wallet_details_ndjson(funded_testnet_address):
+    response = client.get(
+        f"/api/wallet/{funded_testnet_address}",
+        params={"network": "testnet", "format": "ndjson"}
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [tx["amount"] for tx in lines] == [1.0, 2.0, 3.0, 4.0, 5.0]
+    assert all(tx["type"] == "receive" for tx in lines)
+
+def test_get_wallet_details_since(funded_testnet_address):
+    response = client.get(
+        f"/api/wallet/{funded_testnet_address}",
+        params={"network": "testnet", "since": time.time() + 60}
+    )
+    assert response.status_code == 200
+    assert response.json()["transactions"] == []
+
+def test_get_wallet_details_invalid_cursor():
+    response = client.get("/api/wallet/trtc_anything", params={"cursor": "abc"})
+    assert response.status_code == 400
@@ -0,0 +1,134 @@
+import pytest
+import sqlite3
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from fastapi.testclient import TestClient
+from webhook_queue import WebhookQueue, APPLIED, FAILED, PENDING
+import app as backend
+from stripe_stub import WEBHOOK_SECRET, payment_succeeded_event
+
+client = TestClient(backend.app)
+
+@pytest.fixture
+def queue(tmp_path):
+    queue = WebhookQueue(str(tmp_path / "webhooks.db"), max_attempts=2)
+    yield queue
+    queue.close()
+
+@pytest.fixture
+def webhook_env(monkeypatch, queue):
+    monkeypatch.setenv("STRIPE_WEBHOOK_SECRET", WEBHOOK_SECRET)
+    monkeypatch.setattr(backend, "webhook_queue", queue)
+    return queue
+
+def test_enqueue_deduplicates_by_event_id(queue):
+    assert queue.enqueue("evt_1", "payment_intent.succeeded", "{}")
+    assert not queue.enqueue("evt_1", "payment_intent.succeeded", "{}")
+    assert len(queue.pending()) == 1
+
+def test_process_batch_applies_each_event_once(queue):
+    for i in range(3):
+        queue.enqueue(f"evt_{i}", "payment_intent.succeeded", "{}")
+    applied = []
+    assert queue.process_batch(lambda event: applied.append(event["event_id"])) == 3
+    assert queue.process_batch(lambda event: applied.append(event["event_id"])) == 0
+    assert applied == ["evt_0", "evt_1", "evt_2"]
+    assert queue.get("evt_0")["status"] == APPLIED
+
+def test_interrupted_batch_keeps_events_already_applied(queue):
+    for i in range(3):
+        queue.enqueue(f"evt_{i}", "payment_intent.succeeded", "{}")
+
+    def crash_on_second(event):
+        if event["event_id"] == "evt_1":
+            raise KeyboardInterrupt
+    with pytest.raises(KeyboardInterrupt):
+        queue.process_batch(crash_on_second)
+
+    assert queue.get("evt_0")["status"] == APPLIED
+    assert [event["event_id"] for event in queue.pending()] == ["evt_1", "evt_2"]
+
+def test_closed_queue_does_not_reconnect(queue):
+    queue.enqueue("evt_1", "payment_intent.succeeded", "{}")
+    queue.close()
+    with pytest.raises(sqlite3.ProgrammingError):
+        queue.pending()
+
+def test_failed_events_are_retried_then_parked(queue):
+    queue.enqueue("evt_bad", "payment_intent.succeeded", "{}")
+
+    def fail(event):
+        raise ValueError("boom")
+
+    queue.process_batch(fail)
+    assert queue.get("evt_bad")["status"] == PENDING
+    queue.process_batch(fail)
+    event = queue.get("evt_bad")
+    assert event["status"] == FAILED
+    assert event["attempts"] == 2
+    assert event["error"] == "boom"
+
+def test_queue_survives_reopen(tmp_path):
+    path = str(tmp_path / "webhooks.db")
+    first = WebhookQueue(path)
+    first.enqueue("evt_1", "payment_intent.succeeded", "{}")
+    first.close()
+    second = WebhookQueue(path)
+    assert [event["event_id"] for event in second.pending()] == ["evt_1"]
+    second.close()
+
+def test_webhook_is_acknowledged_and_applied_once(webhook_env):
+    recipient = "trtc_webhook_recipient_000000000001"
+    payload, headers = payment_succeeded_event("evt_stub_1", recipient, "2.5")
+    pending_before = len(backend.testnet.pending_transactions)
+
+    first = client.post("/api/payment/webhook", content=payload, headers=headers)
+    retry = client.post("/api/payment/webhook", content=payload, headers=headers)
+    assert first.json() == {"status": "queued", "event_id": "evt_stub_1"}
+    assert retry.json() == {"status": "duplicate", "event_id": "evt_stub_1"}
+
+    # Nothing is credited until the worker runs
+    assert len(backend.testnet.pending_transactions) == pending_before
+    assert webhook_env.process_batch(backend.apply_webhook_event) == 1
+    assert webhook_env.process_batch(backend.apply_webhook_event) == 0
+
+    credited = [tx for tx in backend.testnet.pending_transactions if tx["recipient"] == recipient]
+    assert len(credited) == 1
+    assert credited[0]["amount"] == 2.5
+
+def test_batch_commits_once(queue):
+    for i in range(3):
+        queue.enqueue(f"evt_{i}", "payment_intent.succeeded", "{}")
+    reader = sqlite3.connect(queue.path)
+    seen = []
+
+    def apply(event):
+        seen.append(reader.execute("SELECT COUNT(*) FROM webhook_events WHERE status = ?", (APPLIED,)).fetchone()[0])
+
+    assert queue.process_batch(apply) == 3
+    # Other connections see none of the batch until it commits
+    assert seen == [0, 0, 0]
+    assert reader.execute("SELECT COUNT(*) FROM webhook_events WHERE status = ?", (APPLIED,)).fetchone()[0] == 3
+    reader.close()
+
+def test_failed_event_does_not_stay_marked_applied(queue):
+    queue.enqueue("evt_ok", "payment_intent.succeeded", "{}")
+    queue.enqueue("evt_bad", "payment_intent.succeeded", "{}")
+
+    def apply(event):
+        if event["event_id"] == "evt_bad":
+            raise ValueError("rejected")
+
+    assert queue.process_batch(apply) == 1
+    assert queue.get("evt_ok")["status"] == APPLIED
+    bad = queue.get("evt_bad")
+    assert (bad["status"], bad["attempts"], bad["applied_at"]) == (PENDING, 1, None)
+
+def test_webhook_rejects_bad_signature(webhook_env):
+    payload, headers = payment_succeeded_event("evt_stub_2", "trtc_x", "1", secret="whsec_wrong")
+    response = client.post("/api/payment/webhook", content=payload, headers=headers)
+    assert response.status_code == 400
+    assert webhook_env.get("evt_stub_2") is None
@@ -0,0 +1,141 @@
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+PENDING = "pending"
+APPLIED = "applied"
+FAILED = "failed"
+
+class WebhookQueue:
+    """Durable queue of webhook events keyed by event ID.
+
+    Events are stored in SQLite before the webhook is acknowledged, so a
+    crash after the acknowledgement loses nothing. Inserting an event ID that
+    is already queued is a no-op, which absorbs Stripe's retries. Events are
+    applied in batches, each one SQLite transaction: an event is marked
+    applied in that transaction just before its handler runs and the mark is
+    rolled back if the handler fails, so each event is applied once.
+    """
+
+    def __init__(self, path: str = "webhook_queue.db", max_attempts: int = 5):
+        self.path = path
+        self.max_attempts = max_attempts
+        self.lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self.closed = False
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        # Connect lazily so importing the app does not create the database
+        if self._conn is None:
+            if self.closed:
+                raise sqlite3.ProgrammingError("Webhook queue is closed")
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS webhook_events (
+                    event_id TEXT PRIMARY KEY,
+                    type TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    error TEXT,
+                    received_at REAL NOT NULL,
+                    applied_at REAL
+                )
+            """)
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS webhook_events_status ON webhook_events (status, received_at)"
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def enqueue(self, event_id: str, event_type: str, payload: str) -> bool:
+        """Persist an event. Returns False if the event ID was already queued."""
+        with self.lock:
+            cursor = self.conn.execute(
+                "INSERT OR IGNORE INTO webhook_events (event_id, type, payload, status, received_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (event_id, event_type, payload, PENDING, time.time())
+            )
+            self.conn.commit()
+            return cursor.rowcount == 1
+
+    def pending(self, limit: int = 100) -> List[Dict[str, Any]]:
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT * FROM webhook_events WHERE status = ? ORDER BY received_at LIMIT ?",
+                (PENDING, limit)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def get(self, event_id: str) -> Optional[Dict[str, Any]]:
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT * FROM webhook_events WHERE event_id = ?", (event_id,)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def process_batch(self, apply: Callable[[Dict[str, Any]], None], limit: int = 100) -> int:
+        """
+        Apply up to limit pending events in order. Returns the number applied.
+
+        The batch commits once at the end, or as soon as a handler is
+        interrupted, so the events whose handlers completed stay applied and
+        are never handed over again.
+        """
+        applied = 0
+        with self.lock:
+            conn = self.conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = conn.execute(
+                    "SELECT * FROM webhook_events WHERE status = ? ORDER BY received_at LIMIT ?",
+                    (PENDING, limit)
+                ).fetchall()
+                for row in rows:
+                    event = dict(row)
+                    conn.execute("SAVEPOINT event")
+                    claimed = conn.execute(
+                        "UPDATE webhook_events SET status = ?, applied_at = ?, attempts = attempts + 1 "
+                        "WHERE event_id = ? AND status != ?",
+                        (APPLIED, time.time(), event["event_id"], APPLIED)
+                    ).rowcount
+                    if not claimed:
+                        conn.execute("RELEASE event")
+                        continue
+                    try:
+                        apply(event)
+                    except Exception as e:
+                        conn.execute("ROLLBACK TO event")
+                        self._record_failure(event["event_id"], str(e))
+                        conn.execute("RELEASE event")
+                        continue
+                    except BaseException:
+                        conn.execute("ROLLBACK TO event")
+                        conn.execute("RELEASE event")
+                        raise
+                    conn.execute("RELEASE event")
+                    applied += 1
+            finally:
+                conn.commit()
+        return applied
+
+    def _record_failure(self, event_id: str, error: str) -> None:
+        """Count a failed attempt, parking the event after max_attempts."""
+        self.conn.execute(
+            "UPDATE webhook_events SET attempts = attempts + 1, error = ?, "
+            "status = CASE WHEN attempts + 1 >= ? THEN ? ELSE status END "
+            "WHERE event_id = ?",
+            (error, self.max_attempts, FAILED, event_id)
+        )
+
+    def close(self) -> None:
+        with self.lock:
+            self.closed = True
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
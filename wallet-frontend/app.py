@@ -1,16 +1,58 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from fastapi.responses import HTMLResponse, JSONResponse
 from fastapi.requests import Request
 from pydantic import BaseModel
-import requests
+from contextlib import asynccontextmanager
+from typing import Optional
+import httpx
 import os
+import sys
 from dotenv import load_dotenv
+sys.path.append('../')
+from common.metrics import setup_metrics
+from backend_client import BackendClient
+from response_cache import ResponseCache, cache_key, conditional_response
 
 load_dotenv()
 
-app = FastAPI()
+# Backend API URLs
+BACKEND_URL = os.getenv("BACKEND_URL", "http://localhost:8000/api")
+
+# One pooled client for all backend calls; key derivation and transfers get longer timeouts
+backend = BackendClient(
+    BACKEND_URL,
+    timeout=float(os.getenv("BACKEND_TIMEOUT", "5")),
+    route_timeouts={
+        "wallet/create": 10.0,
+        "wallet/recover": 10.0,
+        "transfer": 15.0
+    },
+    max_retries=int(os.getenv("BACKEND_MAX_RETRIES", "2"))
+)
+
+# Short-lived cache for dashboard reads; stale entries are served while refreshed in the background
+response_cache = ResponseCache(
+    ttl=float(os.getenv("RESPONSE_CACHE_TTL", "5")),
+    stale_ttl=float(os.getenv("RESPONSE_CACHE_STALE_TTL", "30"))
+)
+
+async def cached_get(request: Request, route: str, path: str, params: dict):
+    entry = await response_cache.get(
+        route, cache_key(path, params), lambda: backend.get(route, path, params=params)
+    )
+    return conditional_response(request, entry)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    await backend.close()
+
+app = FastAPI(lifespan=lifespan)
+
+# Metrics, including the response cache hit ratio, are served from /metrics
+setup_metrics(app, "frontend", port=int(os.getenv("METRICS_PORT", "0")))
 
 # Mount static files
 app.mount("/static", StaticFiles(directory="static"), name="static")
@@ -18,8 +60,13 @@ app.mount("/static", StaticFiles(directory="static"), name="static")
 # Templates
 templates = Jinja2Templates(directory="templates")
 
-# Backend API URLs
-BACKEND_URL = "http://localhost:8000/api"
+@app.exception_handler(httpx.TimeoutException)
+async def backend_timeout(request: Request, exc: httpx.TimeoutException):
+    return JSONResponse({"detail": "Wallet backend timed out"}, status_code=504)
+
+@app.exception_handler(httpx.TransportError)
+async def backend_unavailable(request: Request, exc: httpx.TransportError):
+    return JSONResponse({"detail": "Wallet backend unavailable"}, status_code=502)
 
 class CreateWalletRequest(BaseModel):
     network: str = "mainnet"
@@ -41,66 +88,69 @@ async def index(request: Request):
         "networks": ["mainnet", "testnet"]
     })
 
+# Backend responses, including errors, are passed through with their status code
+
 @app.post("/api/wallet/create")
 async def create_wallet(request: CreateWalletRequest):
-    try:
-        response = requests.post(f"{BACKEND_URL}/wallet/create", json={"network": request.network})
-        return JSONResponse(response.json())
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    response = await backend.request("POST", "wallet/create", "/wallet/create", json={
+        "network": request.network
+    })
+    return response.to_response()
 
 @app.post("/api/wallet/recover")
 async def recover_wallet(request: RecoverWalletRequest):
-    try:
-        response = requests.post(f"{BACKEND_URL}/wallet/recover", json={
-            "mnemonic": request.mnemonic,
-            "network": request.network
-        })
-        return JSONResponse(response.json())
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    response = await backend.request("POST", "wallet/recover", "/wallet/recover", json={
+        "mnemonic": request.mnemonic,
+        "network": request.network
+    })
+    return response.to_response()
 
 @app.get("/api/wallet/{address}")
-async def get_wallet_details(address: str):
-    try:
-        # Network is determined from address prefix
-        network = "mainnet" if address.startswith("rtc") else "testnet"
-        response = requests.get(f"{BACKEND_URL}/wallet/{address}?network={network}")
-        return JSONResponse(response.json())
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+async def get_wallet_details(
+    req: Request,
+    address: str,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    since: Optional[float] = None,
+    format: str = Query('json', pattern='^(json|ndjson)$')
+):
+    # Network is determined from address prefix
+    network = "mainnet" if address.startswith("rtc") else "testnet"
+    params = {"network": network, "limit": limit, "cursor": cursor, "since": since, "format": format}
+    params = {k: v for k, v in params.items() if v is not None}
+    if format == "ndjson":
+        return await backend.stream("GET", "wallet", f"/wallet/{address}", params=params)
+    return await cached_get(req, "wallet", f"/wallet/{address}", params)
 
 @app.post("/api/transfer")
 async def transfer_tokens(request: TransferRequest):
-    try:
-        # Validate addresses are on the same network
-        from_network = "mainnet" if request.from_address.startswith("rtc") else "testnet"
-        to_network = "mainnet" if request.to_address.startswith("rtc") else "testnet"
+    # Validate addresses are on the same network
+    from_network = "mainnet" if request.from_address.startswith("rtc") else "testnet"
+    to_network = "mainnet" if request.to_address.startswith("rtc") else "testnet"
+    
+    if from_network != to_network:
+        raise HTTPException(
+            status_code=400,
+            detail="Cannot transfer between different networks"
+        )
         
-        if from_network != to_network:
-            raise HTTPException(
-                status_code=400,
-                detail="Cannot transfer between different networks"
-            )
-            
-        response = requests.post(f"{BACKEND_URL}/transfer", json={
-            "from_address": request.from_address,
-            "to_address": request.to_address,
-            "amount": request.amount,
-            "private_key": request.private_key,
-            "network": from_network
-        })
-        return JSONResponse(response.json())
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    response = await backend.request("POST", "transfer", "/transfer", json={
+        "from_address": request.from_address,
+        "to_address": request.to_address,
+        "amount": request.amount,
+        "private_key": request.private_key,
+        "network": from_network
+    })
+    if response.status_code == 200:
+        # Let both parties see the new balance straight away
+        for address in (request.from_address, request.to_address):
+            backend.invalidate(f"/wallet/{address}")
+            response_cache.invalidate(f"/wallet/{address}")
+    return response.to_response()
 
 @app.get("/api/network/info")
-async def get_network_info(network: str = "mainnet"):
-    try:
-        response = requests.get(f"{BACKEND_URL}/network/info?network={network}")
-        return JSONResponse(response.json())
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+async def get_network_info(req: Request, network: str = "mainnet"):
+    return await cached_get(req, "network/info", "/network/info", {"network": network})
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,148 @@
+import asyncio
+import random
+from typing import Dict, Optional, Tuple
+
+import httpx
+from starlette.background import BackgroundTask
+from starlette.responses import Response, StreamingResponse
+
+# Hop-by-hop and length headers are recomputed by our own server
+_SKIP_HEADERS = {"connection", "keep-alive", "transfer-encoding", "content-length", "content-encoding"}
+RETRY_STATUSES = {502, 503, 504}
+
+class BackendResponse:
+    """Fully read backend response that can be shared by coalesced callers."""
+
+    def __init__(self, status_code: int, headers: Dict[str, str], body: bytes):
+        self.status_code = status_code
+        self.headers = headers
+        self.body = body
+
+    def to_response(self) -> Response:
+        return Response(self.body, status_code=self.status_code, headers=self.headers)
+
+def _forward_headers(response: httpx.Response) -> Dict[str, str]:
+    return {k: v for k, v in response.headers.items() if k.lower() not in _SKIP_HEADERS}
+
+class BackendClient:
+    """
+    Shared async client for calls from the frontend to the wallet backend
+
+    One pooled keep-alive connection pool serves every request. Each route
+    can have its own timeout. Connection failures are retried with jittered
+    backoff, as are 502/503/504 responses to GETs. Identical GETs that are
+    in flight at the same time share one backend request.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        timeout: float = 5.0,
+        route_timeouts: Optional[Dict[str, float]] = None,
+        max_retries: int = 2,
+        backoff: float = 0.1,
+        max_connections: int = 100,
+        max_keepalive: int = 20,
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.route_timeouts = route_timeouts or {}
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive
+        )
+        self.transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+        self._inflight: Dict[Tuple[str, str], asyncio.Future] = {}
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                limits=self.limits,
+                transport=self.transport
+            )
+        return self._client
+
+    def timeout_for(self, route: str) -> float:
+        return self.route_timeouts.get(route, self.timeout)
+
+    async def _send(self, request: httpx.Request, stream: bool = False) -> httpx.Response:
+        # POSTs are only retried when the connection failed, i.e. the backend never saw them
+        idempotent = request.method == "GET"
+        attempt = 0
+        while True:
+            try:
+                response = await self.client.send(request, stream=stream)
+            except (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout):
+                if attempt >= self.max_retries:
+                    raise
+            except httpx.TransportError:
+                if not idempotent or attempt >= self.max_retries:
+                    raise
+            else:
+                if not (idempotent and response.status_code in RETRY_STATUSES and attempt < self.max_retries):
+                    return response
+                await response.aclose()
+            attempt += 1
+            await asyncio.sleep(self.backoff * 2 ** (attempt - 1) * random.uniform(0.5, 1.5))
+
+    def _build(self, method: str, route: str, path: str, **kwargs) -> httpx.Request:
+        return self.client.build_request(method, path, timeout=self.timeout_for(route), **kwargs)
+
+    async def request(self, method: str, route: str, path: str, **kwargs) -> BackendResponse:
+        """Send a request and read the whole response."""
+        return await self._fetch(self._build(method, route, path, **kwargs))
+
+    async def get(self, route: str, path: str, params: Optional[Dict] = None) -> BackendResponse:
+        """GET with in-flight coalescing: concurrent identical GETs share one backend call."""
+        request = self._build("GET", route, path, params=params)
+        key = ("GET", str(request.url))
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._fetch(request))
+            self._inflight[key] = future
+            future.add_done_callback(lambda done: self._finish(key, done))
+        # Shielded so one caller disconnecting does not cancel the others
+        return await asyncio.shield(future)
+
+    def _finish(self, key: Tuple[str, str], future: asyncio.Future) -> None:
+        # invalidate() may have replaced it with a newer request for the same URL
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+        if not future.cancelled():
+            future.exception()  # Retrieved here in case every waiter went away
+
+    def invalidate(self, path: str) -> None:
+        """
+        Make later GETs for path start a new backend call
+
+        GETs already in flight were sent before whatever changed path, so
+        their callers still get that response but nobody else joins them.
+        """
+        url = str(self.client.build_request("GET", path).url)
+        for key in [key for key in self._inflight if key[1] == url or key[1].startswith(f"{url}?")]:
+            del self._inflight[key]
+
+    async def _fetch(self, request: httpx.Request) -> BackendResponse:
+        response = await self._send(request)
+        return BackendResponse(response.status_code, _forward_headers(response), response.content)
+
+    async def stream(self, method: str, route: str, path: str, **kwargs) -> StreamingResponse:
+        """Pass the backend response through chunk by chunk without buffering it."""
+        response = await self._send(self._build(method, route, path, **kwargs), stream=True)
+        return StreamingResponse(
+            response.aiter_bytes(),
+            status_code=response.status_code,
+            headers=_forward_headers(response),
+            background=BackgroundTask(response.aclose)
+        )
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
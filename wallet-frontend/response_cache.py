@@ -0,0 +1,158 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Optional
+from urllib.parse import urlencode
+
+from prometheus_client import Counter, Gauge
+from starlette.requests import Request
+from starlette.responses import Response
+
+from backend_client import BackendResponse
+from common.responses import etag_matches, strong_etag
+
+logger = logging.getLogger(__name__)
+
+CACHE_LOOKUPS = Counter(
+    'frontend_cache_lookups',
+    'Response cache lookups by result (hit, stale or miss)',
+    ['route', 'result']
+)
+CACHE_HIT_RATIO = Gauge(
+    'frontend_cache_hit_ratio',
+    'Share of response cache lookups served from the cache, fresh or stale'
+)
+
+def cache_key(path: str, params: Optional[Dict] = None) -> str:
+    return f"{path}?{urlencode(sorted((params or {}).items()))}"
+
+def _key_path(key: str) -> str:
+    return key.partition("?")[0]
+
+class CacheEntry:
+    __slots__ = ("response", "etag", "stored_at")
+
+    def __init__(self, response: BackendResponse, etag: Optional[str], stored_at: float):
+        self.response = response
+        self.etag = etag
+        self.stored_at = stored_at
+
+class ResponseCache:
+    """
+    TTL cache of successful backend GET responses
+
+    Entries younger than ttl are served as they are. Entries up to
+    stale_ttl past that are still served, while one background request
+    refreshes them (stale-while-revalidate); if the refresh fails the stale
+    entry keeps being served until it expires. Each entry carries an ETag
+    derived from its body so browsers can revalidate with If-None-Match.
+
+    invalidate() bumps the generation of a path that has fetches in flight,
+    and a fetch that finishes for an older generation is returned to its
+    caller but not stored, so it cannot bring back the body just dropped.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 5.0,
+        stale_ttl: float = 30.0,
+        maxsize: int = 1024,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.maxsize = maxsize
+        self.clock = clock
+        self.entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self.refreshing: Dict[str, asyncio.Task] = {}
+        # Only kept for paths with fetches in flight, so both stay bounded
+        self.fetching: Dict[str, int] = {}
+        self.generations: Dict[str, int] = {}
+        self.lookups = 0
+        self.hits = 0
+
+    async def get(
+        self,
+        route: str,
+        key: str,
+        fetch: Callable[[], Awaitable[BackendResponse]]
+    ) -> CacheEntry:
+        entry = self.entries.get(key)
+        age = self.clock() - entry.stored_at if entry else None
+        if entry and age < self.ttl:
+            result = "hit"
+        elif entry and age < self.ttl + self.stale_ttl:
+            result = "stale"
+            if key not in self.refreshing:
+                task = asyncio.ensure_future(self._refresh(key, fetch))
+                self.refreshing[key] = task
+                task.add_done_callback(lambda _: self.refreshing.pop(key, None))
+        else:
+            result = "miss"
+        self._record(route, result)
+
+        if result == "miss":
+            return await self._fetch(key, fetch)
+        self.entries.move_to_end(key)
+        return entry
+
+    async def _refresh(self, key: str, fetch: Callable[[], Awaitable[BackendResponse]]) -> None:
+        try:
+            await self._fetch(key, fetch)
+        except Exception as e:
+            logger.warning(f"Refreshing cached {key} failed: {str(e)}")
+
+    async def _fetch(self, key: str, fetch: Callable[[], Awaitable[BackendResponse]]) -> CacheEntry:
+        path = _key_path(key)
+        self.fetching[path] = self.fetching.get(path, 0) + 1
+        generation = self.generations.get(path, 0)
+        try:
+            return self._store(key, await fetch(), generation)
+        finally:
+            remaining = self.fetching.pop(path) - 1
+            if remaining:
+                self.fetching[path] = remaining
+            else:
+                self.generations.pop(path, None)
+
+    def _store(self, key: str, response: BackendResponse, generation: int) -> CacheEntry:
+        if response.status_code != 200:
+            # Errors are passed through but never cached or replace a good entry
+            return CacheEntry(response, None, self.clock())
+        if self.generations.get(_key_path(key), 0) != generation:
+            # Fetched before an invalidation; good for this caller, not for the cache
+            return CacheEntry(response, None, self.clock())
+        entry = CacheEntry(response, strong_etag(response.body), self.clock())
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+        return entry
+
+    def _record(self, route: str, result: str) -> None:
+        CACHE_LOOKUPS.labels(route, result).inc()
+        self.lookups += 1
+        if result != "miss":
+            self.hits += 1
+        CACHE_HIT_RATIO.set(self.hits / self.lookups)
+
+    def invalidate(self, path: str) -> None:
+        """Drop every entry for a path, whatever its query parameters."""
+        prefix = f"{path}?"
+        for key in [key for key in self.entries if key.startswith(prefix)]:
+            del self.entries[key]
+        if path in self.fetching:
+            self.generations[path] = self.generations.get(path, 0) + 1
+
+def conditional_response(request: Request, entry: CacheEntry) -> Response:
+    """Response for a cache entry, or 304 Not Modified if the browser's copy is current."""
+    if entry.etag is None:
+        return entry.response.to_response()
+    # Browsers may keep the body but must revalidate before reusing it
+    headers = {"ETag": entry.etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), entry.etag):
+        return Response(status_code=304, headers=headers)
+    response = entry.response.to_response()
+    response.headers.update(headers)
+    return response
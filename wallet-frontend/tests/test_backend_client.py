@@ -0,0 +1,193 @@
+import asyncio
+import importlib.util
+import os
+import sys
+
+FRONTEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(FRONTEND_DIR)
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from backend_client import BackendClient
+
+class FakeBackend:
+    """Async handler for httpx.MockTransport that records requests."""
+
+    def __init__(self):
+        self.requests = []
+        self.fail_connect = 0
+        self.statuses = []
+        self.gate = None
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if self.fail_connect:
+            self.fail_connect -= 1
+            raise httpx.ConnectError("connection refused", request=request)
+        if self.gate is not None:
+            await self.gate.wait()
+        if "slow" in request.url.path:
+            raise httpx.ReadTimeout("timed out", request=request)
+        if request.url.params.get("format") == "ndjson":
+            return httpx.Response(
+                200,
+                headers={"content-type": "application/x-ndjson"},
+                content=iter_chunks([b'{"n": 1}\n', b'{"n": 2}\n'])
+            )
+        status = self.statuses.pop(0) if self.statuses else 200
+        return httpx.Response(status, json={"path": request.url.path, "timeout": request.extensions["timeout"]})
+
+async def iter_chunks(chunks):
+    for chunk in chunks:
+        yield chunk
+
+def make_client(fake, **kwargs):
+    return BackendClient("http://backend/api", transport=httpx.MockTransport(fake), backoff=0, **kwargs)
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_gets_are_coalesced():
+    fake = FakeBackend()
+    fake.gate = asyncio.Event()
+    client = make_client(fake)
+    waiters = [asyncio.ensure_future(client.get("wallet", "/wallet/rtc_a")) for _ in range(10)]
+    other = asyncio.ensure_future(client.get("wallet", "/wallet/rtc_b"))
+    await asyncio.sleep(0.01)
+    fake.gate.set()
+    responses = await asyncio.gather(*waiters, other)
+    assert len(fake.requests) == 2
+    assert {r.status_code for r in responses} == {200}
+    assert client._inflight == {}
+    # Once finished, the next GET goes to the backend again
+    await client.get("wallet", "/wallet/rtc_a")
+    assert len(fake.requests) == 3
+    await client.close()
+
+@pytest.mark.asyncio
+async def test_invalidate_stops_later_gets_joining_inflight_ones():
+    fake = FakeBackend()
+    fake.gate = asyncio.Event()
+    client = make_client(fake)
+    before = asyncio.ensure_future(client.get("wallet", "/wallet/rtc_a", params={"network": "testnet"}))
+    other = asyncio.ensure_future(client.get("wallet", "/wallet/rtc_b"))
+    await asyncio.sleep(0.01)
+    client.invalidate("/wallet/rtc_a")
+    after = asyncio.ensure_future(client.get("wallet", "/wallet/rtc_a", params={"network": "testnet"}))
+    joined = asyncio.ensure_future(client.get("wallet", "/wallet/rtc_b"))
+    await asyncio.sleep(0.01)
+    fake.gate.set()
+    await asyncio.gather(before, other, after, joined)
+    assert [request.url.path for request in fake.requests] == [
+        "/api/wallet/rtc_a", "/api/wallet/rtc_b", "/api/wallet/rtc_a"
+    ]
+    assert client._inflight == {}
+    await client.close()
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_shared_request():
+    fake = FakeBackend()
+    fake.gate = asyncio.Event()
+    client = make_client(fake)
+    first = asyncio.ensure_future(client.get("wallet", "/wallet/rtc_a"))
+    second = asyncio.ensure_future(client.get("wallet", "/wallet/rtc_a"))
+    await asyncio.sleep(0.01)
+    first.cancel()
+    fake.gate.set()
+    assert (await second).status_code == 200
+    await client.close()
+
+@pytest.mark.asyncio
+async def test_per_route_timeouts():
+    fake = FakeBackend()
+    client = make_client(fake, timeout=3.0, route_timeouts={"transfer": 15.0})
+    transfer = await client.request("POST", "transfer", "/transfer", json={})
+    wallet = await client.request("GET", "wallet", "/wallet/rtc_a")
+    assert httpx.Response(200, content=transfer.body).json()["timeout"]["read"] == 15.0
+    assert httpx.Response(200, content=wallet.body).json()["timeout"]["read"] == 3.0
+    await client.close()
+
+@pytest.mark.asyncio
+async def test_connection_failures_are_retried():
+    fake = FakeBackend()
+    fake.fail_connect = 2
+    client = make_client(fake, max_retries=2)
+    response = await client.request("POST", "transfer", "/transfer", json={})
+    assert response.status_code == 200
+    assert len(fake.requests) == 3
+    fake.fail_connect = 3
+    with pytest.raises(httpx.ConnectError):
+        await client.request("POST", "transfer", "/transfer", json={})
+    await client.close()
+
+@pytest.mark.asyncio
+async def test_only_gets_are_retried_on_gateway_errors():
+    fake = FakeBackend()
+    client = make_client(fake, max_retries=2)
+    fake.statuses = [503, 502]
+    assert (await client.get("wallet", "/wallet/rtc_a")).status_code == 200
+    assert len(fake.requests) == 3
+    fake.statuses = [503]
+    assert (await client.request("POST", "transfer", "/transfer", json={})).status_code == 503
+    assert len(fake.requests) == 4
+    await client.close()
+
+@pytest.mark.asyncio
+async def test_stream_passes_chunks_through():
+    fake = FakeBackend()
+    client = make_client(fake)
+    response = await client.stream("GET", "wallet", "/wallet/rtc_a", params={"format": "ndjson"})
+    assert response.headers["content-type"] == "application/x-ndjson"
+    chunks = [chunk async for chunk in response.body_iterator]
+    await response.background()
+    assert b"".join(chunks) == b'{"n": 1}\n{"n": 2}\n'
+    await client.close()
+
+@pytest.fixture
+def frontend(monkeypatch):
+    monkeypatch.chdir(FRONTEND_DIR)
+    # Loaded by path: the wallet backend's app module may already be imported as "app"
+    spec = importlib.util.spec_from_file_location("wallet_frontend_app", os.path.join(FRONTEND_DIR, "app.py"))
+    frontend_app = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(frontend_app)
+    fake = FakeBackend()
+    monkeypatch.setattr(frontend_app, "backend", make_client(fake))
+    return frontend_app, fake
+
+def test_frontend_passes_backend_status_through(frontend):
+    frontend_app, fake = frontend
+    client = TestClient(frontend_app.app)
+    fake.statuses = [404]
+    response = client.get("/api/wallet/trtc_missing_address")
+    assert response.status_code == 404
+    assert fake.requests[0].url.params["network"] == "testnet"
+    stream = client.get("/api/wallet/rtc_someone", params={"format": "ndjson"})
+    assert stream.text.splitlines() == ['{"n": 1}', '{"n": 2}']
+
+def test_frontend_maps_backend_failures(frontend):
+    frontend_app, fake = frontend
+    client = TestClient(frontend_app.app)
+    fake.fail_connect = 10
+    assert client.post("/api/wallet/create", json={"network": "testnet"}).status_code == 502
+    fake.fail_connect = 0
+    assert client.get("/api/wallet/rtc_slow").status_code == 504
+    fake.requests.clear()
+    response = client.post("/api/transfer", json={
+        "from_address": "rtc_a", "to_address": "trtc_b", "amount": 1, "private_key": "k"
+    })
+    assert response.status_code == 400
+    assert fake.requests == []
+
+def test_frontend_caches_wallet_reads_with_etags(frontend):
+    frontend_app, fake = frontend
+    client = TestClient(frontend_app.app)
+    first = client.get("/api/wallet/rtc_cached")
+    etag = first.headers["etag"]
+    second = client.get("/api/wallet/rtc_cached", headers={"If-None-Match": etag})
+    assert second.status_code == 304
+    assert second.content == b""
+    assert len(fake.requests) == 1
+    client.post("/api/transfer", json={
+        "from_address": "rtc_cached", "to_address": "rtc_other", "amount": 1, "private_key": "k"
+    })
+    client.get("/api/wallet/rtc_cached")
+    assert len(fake.requests) == 3
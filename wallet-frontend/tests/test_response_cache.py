@@ -0,0 +1,148 @@
+import asyncio
+import os
+import sys
+
+FRONTEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(FRONTEND_DIR)
+sys.path.append(os.path.dirname(FRONTEND_DIR))
+import pytest
+from prometheus_client import REGISTRY
+from starlette.requests import Request
+
+from backend_client import BackendResponse
+from common.responses import etag_matches
+from response_cache import ResponseCache, cache_key, conditional_response
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+class Backend:
+    def __init__(self):
+        self.calls = 0
+        self.status = 200
+        self.fail = False
+
+    async def fetch(self):
+        self.calls += 1
+        if self.fail:
+            raise ConnectionError("backend down")
+        return BackendResponse(self.status, {"content-type": "application/json"}, f'{{"v": {self.calls}}}'.encode())
+
+def make_request(if_none_match=None):
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+@pytest.mark.asyncio
+async def test_fresh_entries_are_served_from_cache():
+    clock, backend = Clock(), Backend()
+    cache = ResponseCache(ttl=5, stale_ttl=30, clock=clock)
+    first = await cache.get("wallet", "k", backend.fetch)
+    clock.now += 4
+    second = await cache.get("wallet", "k", backend.fetch)
+    assert backend.calls == 1
+    assert second.etag == first.etag
+    assert cache.hits == 1 and cache.lookups == 2
+
+@pytest.mark.asyncio
+async def test_stale_entries_are_served_while_refreshing():
+    clock, backend = Clock(), Backend()
+    cache = ResponseCache(ttl=5, stale_ttl=30, clock=clock)
+    await cache.get("wallet", "k", backend.fetch)
+    clock.now += 10
+    stale = await cache.get("wallet", "k", backend.fetch)
+    assert stale.response.body == b'{"v": 1}'
+    # A second stale read does not start another refresh
+    await cache.get("wallet", "k", backend.fetch)
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    assert backend.calls == 2
+    fresh = await cache.get("wallet", "k", backend.fetch)
+    assert fresh.response.body == b'{"v": 2}'
+    assert fresh.etag != stale.etag
+
+@pytest.mark.asyncio
+async def test_failed_refresh_keeps_stale_entry_until_expiry():
+    clock, backend = Clock(), Backend()
+    cache = ResponseCache(ttl=5, stale_ttl=30, clock=clock)
+    await cache.get("wallet", "k", backend.fetch)
+    backend.fail = True
+    clock.now += 10
+    await cache.get("wallet", "k", backend.fetch)
+    await asyncio.sleep(0)
+    assert (await cache.get("wallet", "k", backend.fetch)).response.body == b'{"v": 1}'
+    clock.now += 30
+    with pytest.raises(ConnectionError):
+        await cache.get("wallet", "k", backend.fetch)
+
+@pytest.mark.asyncio
+async def test_errors_are_not_cached():
+    backend = Backend()
+    backend.status = 404
+    cache = ResponseCache(clock=Clock())
+    entry = await cache.get("wallet", "k", backend.fetch)
+    assert entry.etag is None
+    await cache.get("wallet", "k", backend.fetch)
+    assert backend.calls == 2
+
+@pytest.mark.asyncio
+async def test_invalidate_and_lru_bound():
+    backend = Backend()
+    cache = ResponseCache(maxsize=2, clock=Clock())
+    for address in ("a", "b", "c"):
+        await cache.get("wallet", cache_key(f"/wallet/{address}", {"network": "testnet"}), backend.fetch)
+    assert list(cache.entries) == ["/wallet/b?network=testnet", "/wallet/c?network=testnet"]
+    cache.invalidate("/wallet/b")
+    assert list(cache.entries) == ["/wallet/c?network=testnet"]
+
+@pytest.mark.asyncio
+async def test_fetches_started_before_invalidate_are_not_stored():
+    clock, backend = Clock(), Backend()
+    cache = ResponseCache(ttl=5, stale_ttl=30, clock=clock)
+    key = cache_key("/wallet/a", {"network": "testnet"})
+    await cache.get("wallet", key, backend.fetch)
+    gate = asyncio.Event()
+
+    async def slow_fetch():
+        await gate.wait()
+        return await backend.fetch()
+
+    # A background refresh and a miss, both in flight when the transfer lands
+    clock.now += 10
+    await cache.get("wallet", key, slow_fetch)
+    other = cache_key("/wallet/a", {"network": "mainnet"})
+    miss = asyncio.ensure_future(cache.get("wallet", other, slow_fetch))
+    await asyncio.sleep(0)
+    cache.invalidate("/wallet/a")
+    gate.set()
+    assert (await miss).etag is None
+    await asyncio.sleep(0)
+    assert cache.entries == {}
+    assert cache.fetching == {} and cache.generations == {}
+    fresh = await cache.get("wallet", key, backend.fetch)
+    assert fresh.response.body == b'{"v": 4}'
+    assert key in cache.entries
+
+def test_cache_key_ignores_parameter_order():
+    assert cache_key("/w", {"b": 1, "a": 2}) == cache_key("/w", {"a": 2, "b": 1})
+
+@pytest.mark.asyncio
+async def test_conditional_response_and_metrics():
+    cache = ResponseCache(clock=Clock())
+    entry = await cache.get("etag-route", "k", Backend().fetch)
+    full = conditional_response(make_request(), entry)
+    assert full.status_code == 200
+    assert full.headers["etag"] == entry.etag
+    assert full.headers["cache-control"] == "no-cache"
+    assert conditional_response(make_request(entry.etag), entry).status_code == 304
+    assert conditional_response(make_request(f'"other", W/{entry.etag}'), entry).status_code == 304
+    assert conditional_response(make_request('"other"'), entry).status_code == 200
+    assert etag_matches("*", entry.etag)
+    await cache.get("etag-route", "k", Backend().fetch)
+    assert REGISTRY.get_sample_value(
+        "frontend_cache_lookups_total", {"route": "etag-route", "result": "hit"}
+    ) == 1
+    assert REGISTRY.get_sample_value("frontend_cache_hit_ratio") == 0.5